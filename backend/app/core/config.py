@@ -16,6 +16,45 @@ class Settings(BaseSettings):
 
     # Video processing
     target_fps: int = 15
+    probe_fps: float = 2.0  # rate while no face is present, no object detection; 0 = always target_fps
+    decode_gate: bool = True  # skip decoding non-reference frames that processing would drop
+
+    # Face landmarks
+    landmarker_backend: str = "mediapipe"  # mediapipe, or onnx (face mesh batched across sessions)
+    landmarker_pool_size: int = 0  # MediaPipe instances, one per stream, 0 = 2x CPU count
+    landmarker_acquire_timeout_sec: float = 10.0  # wait for a free instance when saturated
+    landmarker_roi_tracking: bool = True  # run on a crop around the previous face, full frame when lost
+    landmarker_roi_padding: float = 0.25  # crop margin per side, relative to the face size
+    landmarker_pose_matrix: bool = True  # head pose from the facial transformation matrix, else 2D geometry
+    landmarker_cadence: int = 1  # run the landmarker every N frames, optical flow in between
+    landmarker_flow_max_error: float = 1.0  # forward-backward flow error (px) that forces inference
+    landmarker_batch_size: int = 8  # onnx backend: face crops per mesh inference
+    landmarker_batch_window_ms: float = 2.0
+    landmarker_sessions: int = 1  # onnx backend: pooled mesh sessions, i.e. batches in flight
+
+    # Object detection
+    detector_sessions: int = 0  # pooled ONNX sessions, each with its own weights, 0 = auto
+    detector_thread_budget: int = 0  # intra-op threads shared by sessions, 0 = auto
+    detector_model: str = "yolov8n"  # variant in assets/models/manifest.json, or "auto"
+    detector_max_latency_ms: float = 0.0  # latency budget for "auto", 0 = none
+    detector_input_size: int = 0  # 0 uses the variant's input size
+    detector_input_sizes: list[int] = [320, 416, 480, 640]
+    detector_match_input: bool = True  # size the input to the frame, not a square
+    detector_io_binding: bool = True  # reuse bound input/output buffers
+    detector_provider: str = "auto"  # cpu, dnnl, openvino, xnnpack or auto (benchmark)
+    detector_model_cache: bool = True  # cache optimized graphs in assets/models/.cache
+    detector_fast_postprocess: bool = True  # decode only essential class scores
+    detector_batch_size: int = 8  # 1 disables cross-session batching
+    detector_batch_window_ms: float = 5.0
+    detector_face_roi: bool = False  # detect phones on a face-anchored crop
+    detector_roi_input_size: int = 320
+    detector_full_frame_interval: int = 15  # detector runs between full-frame scans
+    detector_cadence: int = 1  # run the detector every N frames, track in between
+    detector_gate: bool = False  # run the full detector only when a cheap pass sees a phone
+    detector_gate_model: str = ""  # gate model variant, "" runs the detector at gate size
+    detector_gate_input_size: int = 224
+    detector_gate_threshold: float = 0.15
+    detector_gate_safety_interval: int = 10  # ungated detector run every N runs
 
     model_config = SettingsConfigDict(
         env_file=".env",
@@ -1,13 +1,14 @@
 from __future__ import annotations
 
 import logging
-from typing import Annotated
+from typing import Annotated, Optional
 
 from fastapi import Depends, Request, WebSocket
 
 from app.services.connection_manager import ConnectionManager
-from app.services.face_landmarker import FaceLandmarker
+from app.services.face_landmarker_pool import FaceLandmarkerPool
 from app.services.object_detector import ObjectDetector
+from app.services.onnx_face_landmarker import OnnxFaceMeshModel
 
 logger = logging.getLogger(__name__)
 
@@ -20,12 +21,16 @@ def get_connection_manager_ws(websocket: WebSocket) -> ConnectionManager:
     return websocket.app.state.connection_manager
 
 
-def get_face_landmarker(request: Request) -> FaceLandmarker:
-    return request.app.state.face_landmarker
+def get_face_landmarker_pool(request: Request) -> FaceLandmarkerPool:
+    return request.app.state.face_landmarker_pool
 
 
-def get_face_landmarker_ws(websocket: WebSocket) -> FaceLandmarker:
-    return websocket.app.state.face_landmarker
+def get_face_landmarker_pool_ws(websocket: WebSocket) -> FaceLandmarkerPool:
+    return websocket.app.state.face_landmarker_pool
+
+
+def get_face_mesh_model(request: Request) -> Optional[OnnxFaceMeshModel]:
+    return getattr(request.app.state, "face_mesh_model", None)
 
 
 def get_object_detector(request: Request) -> ObjectDetector:
@@ -40,7 +45,14 @@ ConnectionManagerDep = Annotated[ConnectionManager, Depends(get_connection_manag
 ConnectionManagerWsDep = Annotated[
     ConnectionManager, Depends(get_connection_manager_ws)
 ]
-FaceLandmarkerDep = Annotated[FaceLandmarker, Depends(get_face_landmarker)]
-FaceLandmarkerDepWs = Annotated[FaceLandmarker, Depends(get_face_landmarker_ws)]
+FaceLandmarkerPoolDep = Annotated[
+    FaceLandmarkerPool, Depends(get_face_landmarker_pool)
+]
+FaceLandmarkerPoolDepWs = Annotated[
+    FaceLandmarkerPool, Depends(get_face_landmarker_pool_ws)
+]
+FaceMeshModelDep = Annotated[
+    Optional[OnnxFaceMeshModel], Depends(get_face_mesh_model)
+]
 ObjectDetectorDep = Annotated[ObjectDetector, Depends(get_object_detector)]
 ObjectDetectorDepWs = Annotated[ObjectDetector, Depends(get_object_detector_ws)]
@@ -3,12 +3,20 @@ from contextlib import asynccontextmanager
 
 from fastapi import FastAPI
 
+from app.core.config import settings
 from app.services.connection_manager import ConnectionManager
+from app.services.detection_batcher import BatchingObjectDetector
+from app.services.face_flow_tracker import FlowTrackingFaceLandmarker
 from app.services.face_landmarker import (
     MediapipeFaceLandmarker,
     create_face_landmarker,
 )
+from app.services.face_landmarker_pool import FaceLandmarkerPool
+from app.services.face_roi_tracker import RoiTrackingFaceLandmarker
+from app.services.model_catalog import MODEL_CACHE_DIR, resolve_model_variant
 from app.services.object_detector import YoloObjectDetector, create_object_detector
+from app.services.onnx_face_landmarker import OnnxFaceLandmarker, OnnxFaceMeshModel
+from app.services.phone_cascade import PhoneCascadeDetector
 
 logger = logging.getLogger(__name__)
 
@@ -26,11 +34,99 @@ async def lifespan(app: FastAPI):
     # Create connection manager
     app.state.connection_manager = ConnectionManager()
 
-    # Create face landmarker
-    app.state.face_landmarker = create_face_landmarker(MediapipeFaceLandmarker)
+    # ONNX face mesh shared by all sessions, batching their face crops
+    if settings.landmarker_backend == "onnx":
+        app.state.face_mesh_model = OnnxFaceMeshModel(
+            max_batch_size=settings.landmarker_batch_size,
+            max_wait_ms=settings.landmarker_batch_window_ms,
+            num_sessions=settings.landmarker_sessions,
+            cache_dir=MODEL_CACHE_DIR if settings.detector_model_cache else None,
+        )
+    elif settings.landmarker_backend != "mediapipe":
+        raise ValueError(f"Unknown landmarker backend: {settings.landmarker_backend}")
+
+    def face_landmarker_factory():
+        if settings.landmarker_backend == "onnx":
+            # Tracks its own rotated face region, no ROI wrapper needed
+            landmarker = create_face_landmarker(
+                OnnxFaceLandmarker, model=app.state.face_mesh_model
+            )
+        else:
+            landmarker = create_face_landmarker(
+                MediapipeFaceLandmarker,
+                output_transformation_matrix=settings.landmarker_pose_matrix,
+            )
+            if settings.landmarker_roi_tracking:
+                landmarker = RoiTrackingFaceLandmarker(
+                    landmarker, padding=settings.landmarker_roi_padding
+                )
+        if settings.landmarker_cadence > 1:
+            landmarker = FlowTrackingFaceLandmarker(
+                landmarker,
+                cadence=settings.landmarker_cadence,
+                max_fb_error=settings.landmarker_flow_max_error,
+            )
+        return landmarker
+
+    # Create face landmarker pool, one instance leased per video stream
+    app.state.face_landmarker_pool = FaceLandmarkerPool(
+        face_landmarker_factory,
+        max_size=settings.landmarker_pool_size or None,
+        acquire_timeout_sec=settings.landmarker_acquire_timeout_sec,
+    )
 
     # Create object detector
-    app.state.object_detector = create_object_detector(YoloObjectDetector)
+    model_variant, model_path = resolve_model_variant(
+        settings.detector_model, settings.detector_max_latency_ms
+    )
+    logger.info("Using object detection model variant %s", model_variant.name)
+    object_detector = create_object_detector(
+        YoloObjectDetector,
+        model_path=model_path,
+        input_size=settings.detector_input_size or model_variant.input_size,
+        input_sizes=settings.detector_input_sizes,
+        match_input=settings.detector_match_input,
+        io_binding=settings.detector_io_binding,
+        execution_provider=settings.detector_provider,
+        cache_dir=MODEL_CACHE_DIR if settings.detector_model_cache else None,
+        # Batched frames run on batcher workers, unbatched ones on ORT run_async
+        async_run=settings.detector_batch_size <= 1,
+        fast_postprocess=settings.detector_fast_postprocess,
+        num_sessions=settings.detector_sessions or None,
+        thread_budget=settings.detector_thread_budget or None,
+    )
+    if settings.detector_batch_size > 1 and isinstance(
+        object_detector, YoloObjectDetector
+    ):
+        object_detector = BatchingObjectDetector(
+            object_detector,
+            max_batch_size=settings.detector_batch_size,
+            max_wait_ms=settings.detector_batch_window_ms,
+        )
+    if settings.detector_gate:
+        gate_detector = None
+        if settings.detector_gate_model:
+            gate_variant, gate_model_path = resolve_model_variant(
+                settings.detector_gate_model
+            )
+            logger.info("Using phone gate model variant %s", gate_variant.name)
+            gate_detector = create_object_detector(
+                YoloObjectDetector,
+                model_path=gate_model_path,
+                input_size=settings.detector_gate_input_size,
+                async_run=True,
+                num_sessions=1,
+                thread_budget=settings.detector_thread_budget or None,
+                execution_provider=settings.detector_provider,
+                cache_dir=MODEL_CACHE_DIR if settings.detector_model_cache else None,
+            )
+        object_detector = PhoneCascadeDetector(
+            object_detector,
+            gate_detector,
+            gate_input_size=settings.detector_gate_input_size,
+            gate_threshold=settings.detector_gate_threshold,
+        )
+    app.state.object_detector = object_detector
 
     logger.info("Application started")
 
@@ -50,14 +146,23 @@ async def lifespan(app: FastAPI):
             finally:
                 app.state.connection_manager = None
 
-        # Close face landmarker
-        if getattr(app.state, "face_landmarker", None):
+        # Close face landmarker pool
+        if getattr(app.state, "face_landmarker_pool", None):
             try:
-                app.state.face_landmarker.close()
+                app.state.face_landmarker_pool.close()
             except Exception as e:
-                logger.error("Error closing FaceLandmarker: %s", e)
+                logger.error("Error closing FaceLandmarkerPool: %s", e)
             finally:
-                app.state.face_landmarker = None
+                app.state.face_landmarker_pool = None
+
+        # Close shared face mesh model once its landmarkers are closed
+        if getattr(app.state, "face_mesh_model", None):
+            try:
+                app.state.face_mesh_model.close()
+            except Exception as e:
+                logger.error("Error closing OnnxFaceMeshModel: %s", e)
+            finally:
+                app.state.face_mesh_model = None
 
         # Close object detector
         if getattr(app.state, "object_detector", None):
@@ -23,6 +23,8 @@ class InferenceData(BaseModel):
                         Coordinates are normalized (0-1 range).
         metrics: Optional dictionary of metrics calculated for the frame
                  (e.g., eye closure, head pose, etc.)
+        mode: "active" at the target rate, or "probing" at a low rate without
+              object detection while no face is present.
     """
 
     timestamp: str
@@ -30,3 +32,4 @@ class InferenceData(BaseModel):
     face_landmarks: Optional[list[float]] = None
     object_detections: Optional[list[ObjectDetection]] = None
     metrics: Optional[MetricsOutput] = None
+    mode: str = "active"
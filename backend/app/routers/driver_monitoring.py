@@ -22,13 +22,14 @@ from pydantic import BaseModel, Field
 from app.core.dependencies import (
     ConnectionManagerDep,
     ConnectionManagerWsDep,
-    FaceLandmarkerDep,
-    FaceLandmarkerDepWs,
+    FaceLandmarkerPoolDep,
+    FaceLandmarkerPoolDepWs,
     ObjectDetectorDep,
     ObjectDetectorDepWs,
 )
 from app.models.video_upload import VideoProcessingResponse
 from app.models.webrtc import MessageType
+from app.services.face_landmarker_pool import PoolExhaustedError
 from app.services.video_upload_processor import process_uploaded_video
 from app.services.webrtc_handler import (
     handle_answer,
@@ -79,7 +80,7 @@ async def connections(
 async def driver_monitoring(
     websocket: WebSocket,
     connection_manager: ConnectionManagerWsDep,
-    face_landmarker: FaceLandmarkerDepWs,
+    face_landmarker_pool: FaceLandmarkerPoolDepWs,
     object_detector: ObjectDetectorDepWs,
 ):
     """
@@ -119,7 +120,7 @@ async def driver_monitoring(
                     client_id,
                     message,
                     connection_manager,
-                    face_landmarker,
+                    face_landmarker_pool,
                     object_detector,
                 )
 
@@ -172,13 +173,13 @@ async def connections(
         413: {"description": "File exceeds size or duration limits"},
         422: {"description": "Video processing failed (no frames extracted)"},
         429: {"description": "Rate limit exceeded"},
-        503: {"description": "Processing timeout exceeded"},
+        503: {"description": "Processing timeout exceeded or capacity exhausted"},
     },
   response_model_exclude_none=True
 )
 async def process_video_upload(
     request: Request,
-    face_landmarker: FaceLandmarkerDep,
+    face_landmarker_pool: FaceLandmarkerPoolDep,
     object_detector: ObjectDetectorDep,
     video: UploadFile = File(...),
     target_fps: int = Query(15, ge=1, le=30),
@@ -232,7 +233,7 @@ async def process_video_upload(
                         max_duration_sec=MAX_DURATION_SEC,
                         group_interval_sec=group_interval_sec,
                         include_frames=include_frames,
-                        face_landmarker=face_landmarker,
+                        face_landmarker_pool=face_landmarker_pool,
                         object_detector=object_detector,
                     ),
                 ),
@@ -248,6 +249,11 @@ async def process_video_upload(
                 status_code=413,
                 detail="Video duration exceeds limit.",
             ) from exc
+        except PoolExhaustedError as exc:
+            raise HTTPException(
+                status_code=503,
+                detail="Video processing capacity exhausted.",
+            ) from exc
         except ValueError as exc:
             raise HTTPException(
                 status_code=400,
@@ -1,11 +1,13 @@
 from datetime import datetime, timezone
+from typing import Any, Optional
 
 from fastapi import APIRouter
 from pydantic import BaseModel
 
 from app.core.dependencies import (
     ConnectionManagerDep,
-    FaceLandmarkerDep,
+    FaceLandmarkerPoolDep,
+    FaceMeshModelDep,
     ObjectDetectorDep,
 )
 
@@ -28,6 +30,12 @@ class ReadinessResponse(BaseModel):
     status: str
 
 
+class ModelStatsResponse(BaseModel):
+    face_landmarker: dict[str, Any]
+    face_mesh: Optional[dict[str, Any]] = None  # ONNX landmarker backend only
+    object_detector: dict[str, Any]
+
+
 @router.get(
     "/",
     summary="Health check",
@@ -59,7 +67,25 @@ async def liveness():
 )
 async def readiness(
     connection_manager: ConnectionManagerDep,
-    face_landmarker: FaceLandmarkerDep,
+    face_landmarker_pool: FaceLandmarkerPoolDep,
     object_detector: ObjectDetectorDep,
 ):
     return {"status": "ready"}
+
+
+@router.get(
+    "/models",
+    summary="Model runtime stats",
+    description="Returns load times, inference pool utilization, saturation and wait times of the ML models.",
+    response_model=ModelStatsResponse,
+)
+async def model_stats(
+    face_landmarker_pool: FaceLandmarkerPoolDep,
+    face_mesh_model: FaceMeshModelDep,
+    object_detector: ObjectDetectorDep,
+):
+    return {
+        "face_landmarker": face_landmarker_pool.stats(),
+        "face_mesh": face_mesh_model.stats() if face_mesh_model else None,
+        "object_detector": object_detector.stats(),
+    }
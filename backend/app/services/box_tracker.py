@@ -0,0 +1,160 @@
+from __future__ import annotations
+
+from dataclasses import dataclass
+
+import numpy as np
+
+from app.services.object_detector import Detections
+from app.services.utils.box_utils import box_iou
+
+
+@dataclass
+class _Track:
+    box: np.ndarray  # current xyxy estimate
+    velocity: np.ndarray  # xyxy change per frame
+    detected_box: np.ndarray  # xyxy at the last matched detection
+    conf: float
+    class_id: int
+    frames_since_detection: int = 0
+    misses: int = 0
+
+
+class BoxTracker:
+    """
+    Lightweight IoU tracker with constant-velocity prediction.
+
+    Used to carry object detections through the frames between detector runs.
+    Each call to update() or predict() advances the tracker by one frame.
+    """
+
+    DEFAULT_IOU_THRESHOLD = 0.2
+    DEFAULT_MAX_MISSES = 1
+    DEFAULT_VELOCITY_ALPHA = 0.5
+
+    def __init__(
+        self,
+        iou_threshold: float = DEFAULT_IOU_THRESHOLD,
+        max_misses: int = DEFAULT_MAX_MISSES,
+        velocity_alpha: float = DEFAULT_VELOCITY_ALPHA,
+    ):
+        """
+        Args:
+            iou_threshold: Minimum IoU to associate a detection with a track (0-1).
+            max_misses: Detector runs a track survives without a match (0-inf).
+            velocity_alpha: EMA weight of the newest velocity measurement (0-1].
+        """
+
+        # Validate inputs
+        if iou_threshold < 0 or iou_threshold > 1:
+            raise ValueError("iou_threshold must be between (0, 1).")
+        if max_misses < 0:
+            raise ValueError("max_misses must be non-negative.")
+        if not (0.0 < velocity_alpha <= 1.0):
+            raise ValueError("velocity_alpha must be in the range (0, 1].")
+
+        self.iou_threshold = iou_threshold
+        self.max_misses = max_misses
+        self.velocity_alpha = velocity_alpha
+
+        self._tracks: list[_Track] = []
+
+    def update(self, detections: Detections) -> Detections:
+        """
+        Associate fresh detections with tracks.
+
+        Returns:
+            The detections unchanged.
+        """
+        for track in self._tracks:
+            track.box = track.box + track.velocity
+            track.frames_since_detection += 1
+
+        boxes = detections.boxes.astype(np.float64)
+        matched_tracks: set[int] = set()
+        matched_detections: set[int] = set()
+
+        for t_idx, d_idx in self._associate(detections.class_ids, boxes):
+            track = self._tracks[t_idx]
+            measured = (
+                boxes[d_idx] - track.detected_box
+            ) / track.frames_since_detection
+            track.velocity = (
+                self.velocity_alpha * measured
+                + (1 - self.velocity_alpha) * track.velocity
+            )
+            track.box = boxes[d_idx]
+            track.detected_box = boxes[d_idx]
+            track.conf = float(detections.confs[d_idx])
+            track.frames_since_detection = 0
+            track.misses = 0
+            matched_tracks.add(t_idx)
+            matched_detections.add(d_idx)
+
+        survivors = []
+        for t_idx, track in enumerate(self._tracks):
+            if t_idx not in matched_tracks:
+                track.misses += 1
+                if track.misses > self.max_misses:
+                    continue
+            survivors.append(track)
+
+        for d_idx in range(len(detections)):
+            if d_idx not in matched_detections:
+                survivors.append(
+                    _Track(
+                        box=boxes[d_idx],
+                        velocity=np.zeros(4),
+                        detected_box=boxes[d_idx],
+                        conf=float(detections.confs[d_idx]),
+                        class_id=int(detections.class_ids[d_idx]),
+                    )
+                )
+
+        self._tracks = survivors
+        return detections
+
+    def predict(self) -> Detections:
+        """
+        Advance tracks by one frame without a detector run.
+
+        Returns:
+            Predicted detections of tracks matched at the last detector run.
+        """
+        for track in self._tracks:
+            track.box = np.clip(track.box + track.velocity, 0.0, 1.0)
+            track.frames_since_detection += 1
+
+        visible = [track for track in self._tracks if track.misses == 0]
+        if not visible:
+            return Detections.empty()
+
+        return Detections(
+            np.array([track.box for track in visible]),
+            np.array([track.conf for track in visible], dtype=np.float32),
+            np.array([track.class_id for track in visible], dtype=np.intp),
+        )
+
+    def reset(self) -> None:
+        self._tracks = []
+
+    def _associate(
+        self, class_ids: np.ndarray, boxes: np.ndarray
+    ) -> list[tuple[int, int]]:
+        """Greedily match tracks and detections of the same class by IoU."""
+        if not self._tracks or not len(boxes):
+            return []
+
+        ious = np.stack([box_iou(track.box, boxes) for track in self._tracks])
+        for t_idx, track in enumerate(self._tracks):
+            ious[t_idx, class_ids != track.class_id] = 0.0
+
+        pairs = []
+        while True:
+            t_idx, d_idx = map(int, np.unravel_index(np.argmax(ious), ious.shape))
+            if ious[t_idx, d_idx] < self.iou_threshold or ious[t_idx, d_idx] <= 0:
+                break
+            pairs.append((t_idx, d_idx))
+            ious[t_idx, :] = -1.0
+            ious[:, d_idx] = -1.0
+
+        return pairs
@@ -0,0 +1,336 @@
+import logging
+import queue
+from typing import Any, Callable, Optional
+
+from aiortc import RTCRtpReceiver
+
+logger = logging.getLogger(__name__)
+
+# Frames this much early (in media time) still count as due
+DEFAULT_TOLERANCE_SEC = 0.01
+
+# H.264 NAL unit types of non-IDR coded slices and slice data partitions.
+# Access unit delimiters (9) carry no decoder state; any other NAL unit, such
+# as IDR slices (5), SPS (7) or PPS (8), keeps its access unit decoded.
+H264_SLICE_TYPES = range(1, 5)
+H264_PASSIVE_TYPES = (9,)
+
+# VP8 header field counts: quantizer deltas after y_ac_qi (y_dc, y2_dc, y2_ac,
+# uv_dc, uv_ac), segments, segment map tree probabilities and loop filter
+# deltas (4 reference frames, then 4 modes)
+VP8_QUANT_DELTAS = 5
+VP8_SEGMENTS = 4
+VP8_SEGMENT_TREE_PROBS = 3
+VP8_LF_DELTAS = 8
+
+
+def is_droppable_h264(data: bytes) -> bool:
+    """
+    Whether an H.264 access unit leaves no state behind for later frames.
+
+    Args:
+        data: Annex B access unit, as reassembled by aiortc.
+
+    Returns:
+        True when it holds only non-IDR slices with nal_ref_idc 0, besides
+        access unit delimiters. Parameter sets, SEI and other NAL units
+        keep the access unit decoded.
+    """
+    slices = 0
+    start = data.find(b"\x00\x00\x01")
+    while start != -1 and start + 3 < len(data):
+        header = data[start + 3]
+        nal_type = header & 0x1F
+        if nal_type in H264_SLICE_TYPES:
+            if header & 0x60:
+                return False
+            slices += 1
+        elif nal_type not in H264_PASSIVE_TYPES:
+            return False
+        start = data.find(b"\x00\x00\x01", start + 3)
+    return slices > 0
+
+
+class _BoolDecoder:
+    """VP8 boolean entropy decoder (RFC 6386, section 7), for header fields."""
+
+    def __init__(self, data: bytes):
+        self._data = data
+        self._pos = 2
+        self._value = int.from_bytes(data[:2].ljust(2, b"\x00"), "big")
+        self._range = 255
+        self._bit_count = 0
+
+    def read_bool(self, prob: int = 128) -> int:
+        split = 1 + (((self._range - 1) * prob) >> 8)
+        big_split = split << 8
+        if self._value >= big_split:
+            bit = 1
+            self._range -= split
+            self._value -= big_split
+        else:
+            bit = 0
+            self._range = split
+
+        while self._range < 128:
+            self._value <<= 1
+            self._range <<= 1
+            self._bit_count += 1
+            if self._bit_count == 8:
+                self._bit_count = 0
+                if self._pos < len(self._data):
+                    self._value |= self._data[self._pos]
+                self._pos += 1
+        return bit
+
+    def read_literal(self, bits: int) -> int:
+        value = 0
+        for _ in range(bits):
+            value = (value << 1) | self.read_bool()
+        return value
+
+    def skip_optional(self, bits: int, count: int = 1) -> None:
+        """Skip `count` flagged fields of `bits` bits plus a sign bit."""
+        for _ in range(count):
+            if self.read_bool():
+                self.read_literal(bits + 1)
+
+
+class Vp8ReferenceTracker:
+    """
+    Decides whether VP8 frames leave no state behind for later frames.
+
+    Frame headers (RFC 6386, sections 9.2-9.11 and 19.2) are decoded up to
+    their refresh flags. A droppable frame is an inter frame that updates no
+    reference buffer, no entropy probabilities and no segmentation, such as
+    the upper temporal layers of a layered stream. Loop filter deltas persist
+    across frames, but error-resilient encoders resend them with every frame.
+    The tracker therefore keeps the stream's deltas, and a frame that only
+    resends them is still droppable. It must see every frame of the stream.
+    """
+
+    def __init__(self):
+        # Reference frame and mode loop filter deltas, None when unknown
+        self._lf_deltas: Optional[list[int]] = [0] * VP8_LF_DELTAS
+
+    def is_droppable(self, data: bytes) -> bool:
+        """
+        Args:
+            data: VP8 frame, as reassembled by aiortc.
+
+        Returns:
+            True if decoding can skip the frame.
+        """
+        try:
+            droppable, lf_updates = self._parse(data)
+        except (IndexError, ValueError):
+            self._lf_deltas = None
+            return False
+
+        # Frames that are not droppable are always decoded and carry their
+        # delta updates into the stream state; droppable ones only resend it
+        if not droppable and self._lf_deltas is not None:
+            for i, value in lf_updates.items():
+                self._lf_deltas[i] = value
+        return droppable
+
+    def _parse(self, data: bytes) -> tuple[bool, dict[int, int]]:
+        """Return whether the frame is droppable and its loop filter delta updates."""
+        if len(data) < 3:
+            raise ValueError("VP8 frame is too short")
+
+        key_frame = not data[0] & 1
+        if key_frame:
+            # Key frames reset the deltas, the decoder state is known again
+            if len(data) < 10:
+                raise ValueError("VP8 key frame is too short")
+            self._lf_deltas = [0] * VP8_LF_DELTAS
+            header = _BoolDecoder(data[10:])
+            header.read_literal(2)  # color_space, clamping_type
+        else:
+            header = _BoolDecoder(data[3:])
+
+        segment_updates = False
+        if header.read_bool():  # segmentation_enabled
+            update_map = header.read_bool()
+            if header.read_bool():  # update_segment_feature_data
+                segment_updates = True
+                header.read_literal(1)  # segment_feature_mode
+                header.skip_optional(7, VP8_SEGMENTS)  # quantizer
+                header.skip_optional(6, VP8_SEGMENTS)  # loop filter level
+            if update_map:
+                segment_updates = True
+                for _ in range(VP8_SEGMENT_TREE_PROBS):
+                    if header.read_bool():
+                        header.read_literal(8)
+
+        header.read_literal(1 + 6 + 3)  # filter_type, loop_filter_level, sharpness
+        lf_updates: dict[int, int] = {}
+        if header.read_bool() and header.read_bool():  # loop filter delta update
+            for i in range(VP8_LF_DELTAS):
+                if header.read_bool():
+                    magnitude = header.read_literal(6)
+                    lf_updates[i] = -magnitude if header.read_bool() else magnitude
+
+        if key_frame:
+            return False, lf_updates
+
+        header.read_literal(2)  # log2_nbr_of_dct_partitions
+        header.read_literal(7)  # y_ac_qi
+        header.skip_optional(4, VP8_QUANT_DELTAS)
+
+        refresh_golden = header.read_bool()
+        refresh_alternate = header.read_bool()
+        copies = 0
+        if not refresh_golden:
+            copies |= header.read_literal(2)  # copy_buffer_to_golden
+        if not refresh_alternate:
+            copies |= header.read_literal(2)  # copy_buffer_to_alternate
+        header.read_literal(2)  # sign_bias_golden, sign_bias_alternate
+        refresh_entropy_probs = header.read_bool()
+        refresh_last = header.read_bool()
+
+        droppable = not (
+            refresh_golden
+            or refresh_alternate
+            or copies
+            or refresh_entropy_probs
+            or refresh_last
+            or segment_updates
+        ) and (
+            not lf_updates
+            or self._lf_deltas is not None
+            and all(self._lf_deltas[i] == v for i, v in lf_updates.items())
+        )
+        return droppable, lf_updates
+
+
+class DecodeGate:
+    """
+    Drops encoded video frames before decoding when processing would skip them.
+
+    Frames are due once per interval of media time. Frames that arrive before
+    then are dropped undecoded when no later frame references them. Reference
+    frames are always decoded. Only non-reference frames can be skipped, so
+    the saving depends on the sender. Streams with temporal layers (e.g.
+    scalabilityMode L1T2) or H.264 non-reference frames benefit. Streams
+    where every frame is a reference decode as before.
+    """
+
+    def __init__(
+        self,
+        interval_sec: float,
+        tolerance_sec: float = DEFAULT_TOLERANCE_SEC,
+    ):
+        """
+        Args:
+            interval_sec: Media time between processed frames (0-inf).
+            tolerance_sec: Frames this much early still count as due (0-inf).
+
+        Raises:
+            ValueError: If parameters are invalid.
+        """
+        if tolerance_sec < 0:
+            raise ValueError("tolerance_sec must be non-negative.")
+
+        self.interval_sec = interval_sec
+        self.tolerance_sec = tolerance_sec
+
+        self._last_due: Optional[int] = None
+        # Header checks see every frame, the VP8 one keeps stream state
+        self._checks: dict[str, Callable[[bytes], bool]] = {
+            "H264": is_droppable_h264,
+            "VP8": Vp8ReferenceTracker().is_droppable,
+        }
+        self.frames = 0
+        self.dropped = 0
+
+    @property
+    def interval_sec(self) -> float:
+        return self._interval_sec
+
+    @interval_sec.setter
+    def interval_sec(self, interval_sec: float) -> None:
+        if interval_sec < 0:
+            raise ValueError("interval_sec must be non-negative.")
+        self._interval_sec = interval_sec
+
+    def admit(self, codec_name: str, clock_rate: int, data: bytes, timestamp: int) -> bool:
+        """
+        Decide whether an encoded frame should be decoded.
+
+        Args:
+            codec_name: Codec of the frame, e.g. "VP8".
+            clock_rate: RTP clock rate of the codec.
+            data: Encoded frame.
+            timestamp: Unwrapped RTP timestamp of the frame.
+
+        Returns:
+            False if the frame can be dropped undecoded.
+        """
+        self.frames += 1
+
+        check = self._checks.get(codec_name)
+        try:
+            droppable = check is not None and check(data)
+        except Exception:
+            logger.debug("Could not parse %s frame header", codec_name, exc_info=True)
+            droppable = False
+
+        due_ticks = (self._interval_sec - self.tolerance_sec) * clock_rate
+        if (
+            self._last_due is None
+            or timestamp < self._last_due
+            or timestamp - self._last_due >= due_ticks
+        ):
+            self._last_due = timestamp
+            return True
+
+        self.dropped += int(droppable)
+        return not droppable
+
+    def reset(self) -> None:
+        """Make the next frame due, e.g. when processing restarts."""
+        self._last_due = None
+
+    def stats(self) -> dict[str, Any]:
+        """Return the number of frames seen and dropped before decoding."""
+        return {"frames": self.frames, "dropped": self.dropped}
+
+
+def install_decode_gate(
+    receiver: RTCRtpReceiver, interval_sec: float
+) -> Optional[DecodeGate]:
+    """
+    Gate the frames aiortc's receiver hands to its decoder thread.
+
+    aiortc has no hook between frame reassembly and decoding, so the
+    receiver's decoder queue is wrapped. The gate stays inactive if the
+    receiver lacks that queue, e.g. after an aiortc upgrade.
+
+    Args:
+        receiver: Receiver of the video track.
+        interval_sec: Media time between processed frames.
+
+    Returns:
+        The installed gate, or None if it could not be installed.
+    """
+    decoder_queue = getattr(receiver, "_RTCRtpReceiver__decoder_queue", None)
+    if not isinstance(decoder_queue, queue.Queue):
+        logger.warning("Decode gate unavailable for this aiortc version")
+        return None
+
+    gate = DecodeGate(interval_sec)
+    put = decoder_queue.put
+
+    def gated_put(task, *args, **kwargs) -> None:
+        # None stops the decoder thread, other tasks are (codec, frame)
+        if task is not None:
+            codec, frame = task
+            if not gate.admit(codec.name, codec.clockRate, frame.data, frame.timestamp):
+                return
+        put(task, *args, **kwargs)
+
+    # Wrap this queue instance only, other receivers keep the plain put
+    setattr(decoder_queue, "put", gated_put)
+    return gate
@@ -0,0 +1,170 @@
+import asyncio
+import logging
+from concurrent.futures import Future
+from typing import Any, Optional
+
+import numpy as np
+
+from app.services.object_detector import (
+    Detections,
+    ObjectDetector,
+    YoloObjectDetector,
+)
+from app.services.request_batcher import BatchRequest, RequestBatcher
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_MAX_BATCH_SIZE = 8
+DEFAULT_MAX_WAIT_MS = 5.0
+
+# Frame and its (normalize, conf_threshold, iou_threshold, input_size)
+_DetectionItem = tuple[np.ndarray, tuple[bool, float, float, Optional[int]]]
+
+
+class BatchingObjectDetector(ObjectDetector):
+    """
+    Batching front-end for a YOLO object detector.
+
+    Frames submitted concurrently by different sessions are collected into
+    batches by a RequestBatcher and run as a single [N, 3, H, W] inference per
+    parameter set and input geometry. Each caller blocks only on its own result.
+    One worker runs per pooled detector session, so batches run in parallel.
+    """
+
+    def __init__(
+        self,
+        detector: YoloObjectDetector,
+        max_batch_size: int = DEFAULT_MAX_BATCH_SIZE,
+        max_wait_ms: float = DEFAULT_MAX_WAIT_MS,
+        num_workers: Optional[int] = None,
+    ):
+        """
+        Args:
+            detector: Detector that runs the batched inference.
+            max_batch_size: Maximum number of frames per inference (1-inf).
+            max_wait_ms: Maximum time the first frame of a batch waits for others (0-inf).
+            num_workers: Number of batches in flight (default: detector sessions).
+
+        Raises:
+            ValueError: If parameters are invalid.
+        """
+        self._detector = detector
+        self._batcher: RequestBatcher[_DetectionItem] = RequestBatcher(
+            self._dispatch,
+            max_batch_size=max_batch_size,
+            max_wait_ms=max_wait_ms,
+            num_workers=(
+                num_workers if num_workers is not None else detector.num_sessions
+            ),
+            name="detection-batcher",
+            closed_message="Object detector has been closed",
+        )
+
+        logger.info(
+            "Detection batcher started (max_batch_size=%d, max_wait_ms=%.1f, workers=%d)",
+            max_batch_size,
+            max_wait_ms,
+            self._batcher.num_workers,
+        )
+
+    def detect(
+        self,
+        img: np.ndarray,
+        normalize: bool = True,
+        conf_threshold: float = 0.3,
+        iou_threshold: float = 0.5,
+        input_size: Optional[int] = None,
+    ) -> Detections:
+        """
+        Queue a frame for the next batch and wait for its detections.
+        """
+        return self._submit(
+            img, (normalize, conf_threshold, iou_threshold, input_size)
+        ).result()
+
+    async def detect_async(
+        self,
+        img: np.ndarray,
+        normalize: bool = True,
+        conf_threshold: float = 0.3,
+        iou_threshold: float = 0.5,
+        input_size: Optional[int] = None,
+    ) -> Detections:
+        """
+        Queue a frame for the next batch and await its detections.
+        The batch runs on the batcher workers, no caller thread is blocked.
+        """
+        return await asyncio.wrap_future(
+            self._submit(img, (normalize, conf_threshold, iou_threshold, input_size))
+        )
+
+    def close(self) -> None:
+        """
+        Stop the batching threads and close the underlying detector.
+        Safe to call multiple times.
+        """
+        if self._batcher.closed:
+            return
+        self._batcher.close()
+        self._detector.close()
+
+        if self._batcher.batches:
+            logger.info(
+                "Detection batcher closed (%d frames in %d batches, avg %.2f)",
+                self._batcher.requests,
+                self._batcher.batches,
+                self._batcher.avg_batch_size,
+            )
+
+    @property
+    def avg_batch_size(self) -> float:
+        return self._batcher.avg_batch_size
+
+    def stats(self) -> dict[str, Any]:
+        """
+        Return batching metrics merged with the detector's own metrics.
+        """
+        batch_stats = {
+            "batches": self._batcher.batches,
+            "avg_batch_size": self._batcher.avg_batch_size,
+            "queued_frames": self._batcher.queued,
+        }
+        return {**self._detector.stats(), **batch_stats}
+
+    def _submit(
+        self, img: np.ndarray, params: tuple[bool, float, float, Optional[int]]
+    ) -> Future:
+        return self._batcher.submit((img, params))
+
+    def _dispatch(self, batch: list[BatchRequest[_DetectionItem]]) -> None:
+        """Run one inference per distinct parameter set and input geometry."""
+        groups: dict[
+            tuple[tuple[bool, float, float, Optional[int]], tuple[int, int]],
+            list[BatchRequest[_DetectionItem]],
+        ] = {}
+        for request in batch:
+            img, params = request.item
+            try:
+                shape = self._detector.input_shape(img.shape[:2], params[3])
+            except Exception as e:
+                request.future.set_exception(e)
+                continue
+            groups.setdefault((params, shape), []).append(request)
+
+        for (params, _), requests in groups.items():
+            normalize, conf_threshold, iou_threshold, input_size = params
+            try:
+                results = self._detector.detect_batch(
+                    [r.item[0] for r in requests],
+                    normalize=normalize,
+                    conf_threshold=conf_threshold,
+                    iou_threshold=iou_threshold,
+                    input_size=input_size,
+                )
+            except Exception as e:
+                for request in requests:
+                    request.future.set_exception(e)
+                continue
+
+            for request, detections in zip(requests, results):
+                request.future.set_result(detections)
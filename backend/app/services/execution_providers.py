@@ -0,0 +1,198 @@
+import logging
+import math
+import statistics
+import time
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any, Optional, Sequence
+
+import numpy as np
+import onnxruntime as ort
+
+logger = logging.getLogger(__name__)
+
+CPU_PROVIDER = "CPUExecutionProvider"
+
+# Benchmarks the available candidates and picks the fastest
+AUTO_PROVIDER = "auto"
+
+# Short settings names of the CPU execution providers
+PROVIDER_ALIASES: dict[str, str] = {
+    "cpu": CPU_PROVIDER,
+    "dnnl": "DnnlExecutionProvider",
+    "openvino": "OpenVINOExecutionProvider",
+    "xnnpack": "XnnpackExecutionProvider",
+}
+
+DEFAULT_PROVIDER_CANDIDATES: tuple[str, ...] = tuple(PROVIDER_ALIASES)
+
+# Benchmark runs per candidate, after warmup
+BENCHMARK_WARMUP = 3
+BENCHMARK_ITERATIONS = 10
+
+
+@dataclass
+class ProviderBenchmark:
+    """Startup benchmark result for one execution provider."""
+
+    provider: str
+    latency_ms: Optional[float] = None
+    error: Optional[str] = None
+
+
+def resolve_provider(name: str) -> str:
+    """
+    Map a settings name ("cpu", "openvino", ...) to an ONNX Runtime provider name.
+
+    Raises:
+        ValueError: If the provider is unknown.
+    """
+    provider = PROVIDER_ALIASES.get(name.lower(), name)
+    if provider not in PROVIDER_ALIASES.values():
+        raise ValueError(f"Unknown execution provider: {name}")
+    return provider
+
+
+def provider_chain(provider: str) -> list[str]:
+    """Providers in priority order; operators a provider lacks fall back to CPU."""
+    return [provider] if provider == CPU_PROVIDER else [provider, CPU_PROVIDER]
+
+
+def provider_options(
+    provider: str, intra_op_num_threads: int, cache_dir: Optional[Path] = None
+) -> dict[str, Any]:
+    """Options for a CPU execution provider, matched to the session thread count."""
+    if provider == "OpenVINOExecutionProvider":
+        options: dict[str, Any] = {
+            "device_type": "CPU",
+            "num_of_threads": str(intra_op_num_threads),
+        }
+        if cache_dir is not None:
+            # OpenVINO caches its compiled blobs itself
+            options["cache_dir"] = str(cache_dir)
+        return options
+    if provider == "XnnpackExecutionProvider":
+        return {"intra_op_num_threads": str(intra_op_num_threads)}
+    return {}
+
+
+def select_provider(
+    model_path: Path,
+    name: str,
+    intra_op_num_threads: int,
+    input_size: int,
+    candidates: Sequence[str] = DEFAULT_PROVIDER_CANDIDATES,
+) -> tuple[str, list[ProviderBenchmark]]:
+    """
+    Resolve the execution provider setting, benchmarking candidates for "auto".
+
+    Args:
+        model_path: Path to the ONNX model file.
+        name: Provider name from settings, or "auto".
+        intra_op_num_threads: Threads per session, as the pool will run them.
+        input_size: Side of the synthetic benchmark frame for dynamic-shape models.
+        candidates: Providers considered by "auto".
+
+    Returns:
+        Tuple of (provider, benchmark results). Results are empty unless
+        "auto" had several installed candidates to compare.
+
+    Raises:
+        ValueError: If the provider is unknown.
+    """
+    available = set(ort.get_available_providers())
+
+    if name.lower() != AUTO_PROVIDER:
+        provider = resolve_provider(name)
+        if provider not in available:
+            logger.warning(
+                "Execution provider %s is not installed, using %s",
+                provider,
+                CPU_PROVIDER,
+            )
+            return CPU_PROVIDER, []
+        return provider, []
+
+    candidates = list(dict.fromkeys(resolve_provider(c) for c in candidates))
+    installed = [c for c in candidates if c in available]
+    if len(installed) <= 1:
+        provider = installed[0] if installed else CPU_PROVIDER
+        logger.info(
+            "Using execution provider %s, the only installed candidate", provider
+        )
+        return provider, []
+
+    results = []
+    for candidate in candidates:
+        if candidate not in available:
+            results.append(ProviderBenchmark(candidate, error="not installed"))
+            continue
+        results.append(
+            benchmark_provider(model_path, candidate, intra_op_num_threads, input_size)
+        )
+
+    measured = [r for r in results if r.latency_ms is not None]
+    if not measured:
+        logger.warning(
+            "No execution provider benchmark succeeded, using %s", CPU_PROVIDER
+        )
+        return CPU_PROVIDER, results
+
+    best = min(
+        measured,
+        key=lambda r: r.latency_ms if r.latency_ms is not None else math.inf,
+    )
+    logger.info(
+        "Selected execution provider %s (%.2f ms per frame): %s",
+        best.provider,
+        best.latency_ms,
+        ", ".join(
+            f"{r.provider} {r.latency_ms:.2f} ms"
+            if r.latency_ms is not None
+            else f"{r.provider} {r.error}"
+            for r in results
+        ),
+    )
+    return best.provider, results
+
+
+def benchmark_provider(
+    model_path: Path,
+    provider: str,
+    intra_op_num_threads: int,
+    input_size: int,
+) -> ProviderBenchmark:
+    """Return the median latency of one provider on a synthetic frame."""
+    try:
+        sess_opts = ort.SessionOptions()
+        sess_opts.graph_optimization_level = ort.GraphOptimizationLevel.ORT_ENABLE_ALL
+        sess_opts.intra_op_num_threads = intra_op_num_threads
+        session = ort.InferenceSession(
+            str(model_path),
+            sess_options=sess_opts,
+            providers=[
+                (p, provider_options(p, intra_op_num_threads))
+                for p in provider_chain(provider)
+            ],
+        )
+
+        model_input = session.get_inputs()[0]
+        # Symbolic axes: one frame of input_size x input_size
+        shape = [
+            dim if isinstance(dim, int) else (1 if axis == 0 else input_size)
+            for axis, dim in enumerate(model_input.shape)
+        ]
+        feed = {model_input.name: np.random.rand(*shape).astype(np.float32)}
+        for _ in range(BENCHMARK_WARMUP):
+            session.run(None, feed)
+
+        times = []
+        for _ in range(BENCHMARK_ITERATIONS):
+            start = time.perf_counter()
+            session.run(None, feed)
+            times.append((time.perf_counter() - start) * 1000)
+    except Exception as e:
+        logger.warning("Execution provider %s benchmark failed: %s", provider, e)
+        return ProviderBenchmark(provider, error=str(e).splitlines()[0])
+
+    return ProviderBenchmark(provider, latency_ms=statistics.median(times))
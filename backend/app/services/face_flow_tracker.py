@@ -0,0 +1,181 @@
+import logging
+from typing import Optional
+
+import cv2
+import numpy as np
+
+from app.services.face_landmarker import FaceLandmarker, FaceLandmarkResult
+from app.services.face_landmarks import ESSENTIAL_LANDMARKS
+from app.services.metrics.utils import ear, eye_gaze_ratio, head_pose_2d, mar
+from app.services.utils.image_utils import to_gray
+
+logger = logging.getLogger(__name__)
+
+# Landmarks propagated by optical flow: the rendered ones and those the metrics read
+TRACKED_LANDMARKS = np.array(
+    sorted(
+        {
+            *ESSENTIAL_LANDMARKS,
+            *ear.LEFT_EYE_INDICES,
+            *ear.RIGHT_EYE_INDICES,
+            mar.UPPER_LIP,
+            mar.LOWER_LIP,
+            mar.LEFT_MOUTH_CORNER,
+            mar.RIGHT_MOUTH_CORNER,
+            *eye_gaze_ratio.LEFT_EYE_CORNERS,
+            *eye_gaze_ratio.RIGHT_EYE_CORNERS,
+            *eye_gaze_ratio.LEFT_EYE_LIDS,
+            *eye_gaze_ratio.RIGHT_EYE_LIDS,
+            *eye_gaze_ratio.LEFT_IRIS,
+            *eye_gaze_ratio.RIGHT_IRIS,
+            head_pose_2d.NOSE_TIP,
+            head_pose_2d.CHIN,
+            head_pose_2d.FOREHEAD,
+            head_pose_2d.LEFT_FACE,
+            head_pose_2d.RIGHT_FACE,
+        }
+    ),
+    dtype=np.intp,
+)
+
+DEFAULT_CADENCE = 3
+
+# Forward-backward error in pixels above which a point counts as lost
+DEFAULT_MAX_FB_ERROR = 1.0
+
+# Fraction of tracked points that may be lost before a fresh inference
+MAX_LOST_RATIO = 0.1
+
+# Pyramidal Lucas-Kanade parameters
+LK_PARAMS = {
+    "winSize": (11, 11),
+    "maxLevel": 2,
+    "criteria": (cv2.TERM_CRITERIA_EPS | cv2.TERM_CRITERIA_COUNT, 10, 0.03),
+}
+
+
+class FlowTrackingFaceLandmarker(FaceLandmarker):
+    """
+    Face landmarker that runs inference on keyframes only.
+
+    Between keyframes, the tracked landmarks (TRACKED_LANDMARKS) are propagated
+    from the previous frame with pyramidal Lucas-Kanade optical flow, and the
+    remaining landmarks follow the similarity transform fitted to them. Each
+    point is tracked forward and back again; when too many points do not return
+    to where they started, the frame gets a fresh inference instead. The last
+    keyframe's transformation matrix is carried over.
+    """
+
+    def __init__(
+        self,
+        landmarker: FaceLandmarker,
+        cadence: int = DEFAULT_CADENCE,
+        max_fb_error: float = DEFAULT_MAX_FB_ERROR,
+    ):
+        """
+        Args:
+            landmarker: Landmarker run on keyframes.
+            cadence: Run inference every N frames, optical flow in between (1-inf).
+            max_fb_error: Forward-backward error in pixels above which a point
+                          counts as lost (0-inf).
+
+        Raises:
+            ValueError: If parameters are invalid.
+        """
+        if cadence < 1:
+            raise ValueError("cadence must be at least 1.")
+        if max_fb_error <= 0:
+            raise ValueError("max_fb_error must be positive.")
+
+        self._landmarker = landmarker
+        self.cadence = cadence
+        self.max_fb_error = max_fb_error
+
+        self._prev_gray: Optional[np.ndarray] = None
+        self._prev_result: Optional[FaceLandmarkResult] = None
+        self._propagated = 0
+
+    def detect(
+        self,
+        img: np.ndarray,
+        timestamp_ms: Optional[int] = None,
+    ) -> FaceLandmarkResult:
+        """
+        Detect face landmarks, propagating them between keyframes.
+
+        Args:
+            img: BGR image to detect landmarks in.
+            timestamp_ms: Media timestamp of the frame in its stream.
+
+        Returns:
+            See FaceLandmarker.detect().
+        """
+        gray = to_gray(img)
+
+        if self._propagated + 1 < self.cadence:
+            result = self._propagate(gray)
+            if result is not None:
+                self._propagated += 1
+                self._prev_gray, self._prev_result = gray, result
+                return result
+
+        result = self._landmarker.detect(img, timestamp_ms)
+        self._propagated = 0
+        self._prev_gray = gray
+        self._prev_result = result if len(result.landmarks) else None
+        return result
+
+    def reset(self) -> None:
+        """Drop the previous frame, so the next frame is a keyframe."""
+        self._prev_gray = None
+        self._prev_result = None
+        self._propagated = 0
+        self._landmarker.reset()
+
+    def close(self) -> None:
+        """
+        Release underlying resources.
+        Safe to call multiple times.
+        """
+        self._landmarker.close()
+
+    def _propagate(self, gray: np.ndarray) -> Optional[FaceLandmarkResult]:
+        """Track the previous landmarks into this frame, or None when lost."""
+        prev, prev_gray = self._prev_result, self._prev_gray
+        if prev is None or prev_gray is None or prev_gray.shape != gray.shape:
+            return None
+
+        h, w = gray.shape
+        scale = np.array([w, h], dtype=np.float32)
+        landmarks = prev.landmarks
+        tracked = TRACKED_LANDMARKS[TRACKED_LANDMARKS < len(landmarks)]
+        points = (landmarks[tracked] * scale).reshape(-1, 1, 2)
+
+        forward, status, _ = cv2.calcOpticalFlowPyrLK(
+            prev_gray, gray, points, None, **LK_PARAMS
+        )
+        backward, back_status, _ = cv2.calcOpticalFlowPyrLK(
+            gray, prev_gray, forward, None, **LK_PARAMS
+        )
+        fb_error = np.linalg.norm((points - backward).reshape(-1, 2), axis=1)
+        good = (status.ravel() == 1) & (back_status.ravel() == 1)
+        good &= fb_error <= self.max_fb_error
+
+        if good.sum() < (1 - MAX_LOST_RATIO) * len(tracked):
+            logger.debug(
+                "Optical flow lost %d of %d landmarks", (~good).sum(), len(tracked)
+            )
+            return None
+
+        # Untracked landmarks follow the face as a whole
+        src = points.reshape(-1, 2)[good]
+        dst = forward.reshape(-1, 2)[good]
+        transform, _ = cv2.estimateAffinePartial2D(src, dst)
+        if transform is None:
+            return None
+
+        pixels = landmarks * scale
+        moved = pixels @ transform[:, :2].T.astype(np.float32)
+        moved += transform[:, 2].astype(np.float32)
+        moved[tracked[good]] = dst
+        return FaceLandmarkResult(moved / scale, prev.transformation_matrix)
@@ -3,15 +3,17 @@ from __future__ import annotations
 import logging
 import threading
 import time
+from dataclasses import dataclass
 from pathlib import Path
-from typing import Protocol, Sequence, TypeVar
+from typing import Optional, Protocol, TypeAlias, TypeVar
 
-import cv2
 import mediapipe as mp
 import numpy as np
 from mediapipe.tasks import python
 from mediapipe.tasks.python import vision
 
+from app.services.utils.image_utils import to_rgb
+
 logger = logging.getLogger(__name__)
 
 # Path to the model file
@@ -20,8 +22,82 @@ MODEL_PATH = PROJECT_ROOT / "assets" / "models" / "face_landmarker.task"
 
 T = TypeVar("T")
 
+# Timeline gap inserted before a new stream, so no state carries across
+STREAM_GAP_MS = 1000
+
+
+# Contiguous (N, 2) float32 array of normalized (x, y) landmark coordinates
+FaceLandmarks: TypeAlias = np.ndarray
+
+
+def empty_landmarks() -> FaceLandmarks:
+    """Landmarks of a frame without a face."""
+    return np.empty((0, 2), dtype=np.float32)
+
+
+@dataclass
+class FaceLandmarkResult:
+    """
+    Face landmarks of one frame.
+
+    Attributes:
+        landmarks: (N, 2) array of normalized landmark coordinates, empty
+                   without a face.
+        transformation_matrix: 4x4 pose of the canonical face model in camera
+                               space, when the landmarker provides it.
+    """
+
+    landmarks: FaceLandmarks
+    transformation_matrix: Optional[np.ndarray] = None
+
+    @classmethod
+    def empty(cls) -> FaceLandmarkResult:
+        return cls(empty_landmarks())
+
+
+class VideoTimeline:
+    """
+    Maps media timestamps of successive streams onto one strictly increasing
+    timeline, as required by video-mode landmarkers.
+
+    Each stream keeps its own spacing between frames. A new stream, or a
+    timestamp that goes backwards within a stream (RTP wraparound, repeated
+    pts), is rebased to continue after the last timestamp.
+    """
 
-FaceLandmark2D = tuple[float, float]
+    def __init__(self):
+        self._last_ms: Optional[int] = None
+        self._offset_ms = 0
+        self._new_stream = True
+
+    def start_stream(self) -> None:
+        """Rebase the next timestamp onto the end of the timeline."""
+        self._new_stream = True
+
+    def to_timeline(self, timestamp_ms: Optional[int] = None) -> int:
+        """
+        Args:
+            timestamp_ms: Media timestamp of the frame (default: wall clock).
+
+        Returns:
+            Timeline timestamp in milliseconds, greater than the previous one.
+        """
+        if timestamp_ms is None:
+            timestamp_ms = int(time.time() * 1000)
+
+        if self._last_ms is None:
+            self._offset_ms = 0
+        elif self._new_stream:
+            self._offset_ms = self._last_ms + STREAM_GAP_MS - timestamp_ms
+        self._new_stream = False
+
+        timeline_ms = timestamp_ms + self._offset_ms
+        if self._last_ms is not None and timeline_ms <= self._last_ms:
+            self._offset_ms += self._last_ms + 1 - timeline_ms
+            timeline_ms = self._last_ms + 1
+
+        self._last_ms = timeline_ms
+        return timeline_ms
 
 
 class FaceLandmarker(Protocol):
@@ -32,7 +108,11 @@ class FaceLandmarker(Protocol):
     def detect(
         self,
         img: np.ndarray,
-    ) -> Sequence[FaceLandmark2D]: ...
+        timestamp_ms: Optional[int] = None,
+    ) -> FaceLandmarkResult: ...
+
+    def reset(self) -> None:
+        """Drop per-stream tracking state before the instance serves a new stream."""
 
     def close(self) -> None: ...
 
@@ -50,6 +130,7 @@ class MediapipeFaceLandmarker(FaceLandmarker):
         min_face_detection_confidence: float = 0.3,
         min_face_presence_confidence: float = 0.3,
         min_tracking_confidence: float = 0.5,
+        output_transformation_matrix: bool = False,
     ) -> None:
         """
         Initialize face landmark detector.
@@ -59,12 +140,15 @@ class MediapipeFaceLandmarker(FaceLandmarker):
             min_face_detection_confidence: Minimum confidence threshold for face detection.
             min_face_presence_confidence: Minimum confidence threshold for face presence.
             min_tracking_confidence: Minimum confidence threshold for face tracking.
+            output_transformation_matrix: Whether to compute the facial
+                                          transformation matrix (head pose).
 
         Raises:
             ValueError: If parameters are invalid.
             RuntimeError: If model loading fails.
         """
         self._lock = threading.Lock()
+        self._timeline = VideoTimeline()
 
         try:
             base_options = python.BaseOptions(model_asset_path=str(model_path))
@@ -76,6 +160,7 @@ class MediapipeFaceLandmarker(FaceLandmarker):
                 min_face_detection_confidence=min_face_detection_confidence,
                 min_face_presence_confidence=min_face_presence_confidence,
                 min_tracking_confidence=min_tracking_confidence,
+                output_facial_transformation_matrixes=output_transformation_matrix,
             )
 
             self._landmarker = vision.FaceLandmarker.create_from_options(options)
@@ -88,38 +173,50 @@ class MediapipeFaceLandmarker(FaceLandmarker):
     def detect(
         self,
         img: np.ndarray,
-    ) -> Sequence[FaceLandmark2D]:
+        timestamp_ms: Optional[int] = None,
+    ) -> FaceLandmarkResult:
         """
         Detect face landmarks in an image.
 
         Args:
             img: BGR image to detect landmarks in.
+            timestamp_ms: Media timestamp of the frame in its stream
+                          (default: wall clock).
 
         Returns:
-            List of detected face landmarks.
+            Landmarks of the first face, with its transformation matrix if enabled.
         """
-        rgb_frame = cv2.cvtColor(img, cv2.COLOR_BGR2RGB)
+        rgb_frame = to_rgb(img)
         mp_image = mp.Image(
             image_format=mp.ImageFormat.SRGB,
             data=rgb_frame,
         )
 
-        timestamp_ms = int(time.time() * 1000)
-
         with self._lock:
             raw_result = self._landmarker.detect_for_video(
                 mp_image,
-                timestamp_ms,
+                self._timeline.to_timeline(timestamp_ms),
             )
 
         if not raw_result.face_landmarks:
-            return []
+            return FaceLandmarkResult.empty()
 
         first_face = raw_result.face_landmarks[0]
 
-        face_landmarks: list[FaceLandmark2D] = [(lm.x, lm.y) for lm in first_face]
+        # Fill columns directly instead of building a tuple per landmark
+        face_landmarks = np.empty((len(first_face), 2), dtype=np.float32)
+        face_landmarks[:, 0] = [lm.x for lm in first_face]
+        face_landmarks[:, 1] = [lm.y for lm in first_face]
 
-        return face_landmarks
+        matrixes = raw_result.facial_transformation_matrixes
+        return FaceLandmarkResult(
+            face_landmarks, matrixes[0] if matrixes else None
+        )
+
+    def reset(self) -> None:
+        """Start a new stream on the video timeline."""
+        with self._lock:
+            self._timeline.start_stream()
 
     def close(self) -> None:
         """
@@ -135,27 +232,26 @@ class MediapipeFaceLandmarker(FaceLandmarker):
 
 
 def get_essential_landmarks(
-    face_landmarks: Sequence[FaceLandmark2D], indices: Sequence[int]
-) -> list[float]:
+    face_landmarks: FaceLandmarks, indices: np.ndarray
+) -> np.ndarray:
     """
-    Filter essential indices and flatten.
+    Filter essential indices and flatten to [x1, y1, x2, y2, ...].
+    Indices beyond the detected landmarks are zero-filled.
     """
-    fl_len = len(face_landmarks)
-    out = [0.0] * (len(indices) * 2)
-
-    for i, idx in enumerate(indices):
-        if idx < fl_len:
-            x, y = face_landmarks[idx]
-            out[2 * i] = x
-            out[2 * i + 1] = y
+    if len(indices) and indices.max() < len(face_landmarks):
+        return face_landmarks[indices].ravel()
 
-    return out
+    out = np.zeros((len(indices), 2), dtype=np.float32)
+    present = indices < len(face_landmarks)
+    out[present] = face_landmarks[indices[present]]
+    return out.ravel()
 
 
 def create_face_landmarker(
     implementation: type[FaceLandmarker],
+    **kwargs,
 ) -> FaceLandmarker:
     """
     Factory method to create a face landmark detector.
     """
-    return implementation()
+    return implementation(**kwargs)
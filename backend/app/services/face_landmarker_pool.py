@@ -0,0 +1,268 @@
+from __future__ import annotations
+
+import asyncio
+import logging
+import os
+import threading
+import time
+from contextlib import asynccontextmanager, contextmanager
+from typing import Any, AsyncIterator, Callable, Iterator, Optional
+
+from app.services.face_landmarker import FaceLandmarker
+
+logger = logging.getLogger(__name__)
+
+# Time a session waits for a landmarker when all instances are leased
+DEFAULT_ACQUIRE_TIMEOUT_SEC = 10.0
+
+
+class PoolExhaustedError(RuntimeError):
+    """Raised when no landmarker frees up within the acquire timeout."""
+
+
+def default_landmarker_pool_size() -> int:
+    """Maximum landmarker instances, i.e. concurrent streams: two per CPU core."""
+    return max(4, 2 * (os.cpu_count() or 1))
+
+
+class FaceLandmarkerPool:
+    """
+    Bounded pool of face landmarkers leased to video sessions.
+
+    Each session holds its own landmarker for the lifetime of its stream, so
+    video-mode tracking state is never shared between streams and sessions run
+    landmark detection in parallel. Instances are created on demand up to
+    max_size and reused by later sessions once idle. When all instances are
+    leased, new sessions wait up to acquire_timeout_sec for one to free up.
+    A session id holds at most one lease. A second acquire for the same id
+    waits for the first lease to be released, e.g. when a reconnecting client
+    overlaps its old stream.
+    """
+
+    def __init__(
+        self,
+        factory: Callable[[], FaceLandmarker],
+        max_size: Optional[int] = None,
+        acquire_timeout_sec: float = DEFAULT_ACQUIRE_TIMEOUT_SEC,
+        prewarm: int = 1,
+    ):
+        """
+        Args:
+            factory: Creates a new landmarker instance.
+            max_size: Maximum number of instances (default: twice the CPU count).
+            acquire_timeout_sec: Maximum wait for an instance when saturated (0-inf).
+            prewarm: Instances created up front, so model errors surface at
+                     startup and the first session does not pay the load time.
+
+        Raises:
+            ValueError: If parameters are invalid.
+        """
+        max_size = max_size or default_landmarker_pool_size()
+        if max_size < 1:
+            raise ValueError("max_size must be at least 1.")
+        if acquire_timeout_sec < 0:
+            raise ValueError("acquire_timeout_sec must be non-negative.")
+        if not 0 <= prewarm <= max_size:
+            raise ValueError("prewarm must be between 0 and max_size.")
+
+        self._factory = factory
+        self.max_size = max_size
+        self.acquire_timeout_sec = acquire_timeout_sec
+
+        self._cond = threading.Condition()
+        self._closed = False
+        self._instances: list[FaceLandmarker] = []
+        self._idle: list[FaceLandmarker] = []
+        self._leases: dict[str, FaceLandmarker] = {}
+        # Sessions whose new instance is being created outside the lock
+        self._creating_for: set[str] = set()
+
+        self._peak_leased = 0
+        self._acquisitions = 0
+        self._saturated_waits = 0
+        self._rejected = 0
+        self._wait_max = 0.0
+
+        for _ in range(prewarm):
+            landmarker = factory()
+            self._instances.append(landmarker)
+            self._idle.append(landmarker)
+
+        logger.info(
+            "Face landmarker pool ready (%d of max %d instances)",
+            len(self._instances),
+            max_size,
+        )
+
+    def acquire(self, session_id: str) -> FaceLandmarker:
+        """
+        Lease a landmarker to a session, blocking while the pool is saturated
+        or the session id still holds a lease.
+
+        Raises:
+            PoolExhaustedError: If the pool stays saturated for
+                                acquire_timeout_sec.
+            RuntimeError: If the pool is closed or the session id keeps its
+                          lease for acquire_timeout_sec.
+        """
+        start = time.perf_counter()
+        deadline = start + self.acquire_timeout_sec
+        waited = False
+
+        with self._cond:
+            while True:
+                if self._closed:
+                    raise RuntimeError("Face landmarker pool has been closed")
+
+                if session_id in self._leases or session_id in self._creating_for:
+                    # Never share an instance: wait for the other lease to end
+                    remaining = deadline - time.perf_counter()
+                    if remaining <= 0:
+                        raise RuntimeError(
+                            f"Session {session_id} already holds a face landmarker"
+                        )
+                    self._cond.wait(remaining)
+                    continue
+
+                if self._idle:
+                    # Most recently used first: its memory is still warm
+                    landmarker = self._idle.pop()
+                    landmarker.reset()
+                    return self._lease(session_id, landmarker, start)
+
+                if len(self._instances) + len(self._creating_for) < self.max_size:
+                    self._creating_for.add(session_id)
+                    break
+
+                if not waited:
+                    waited = True
+                    self._saturated_waits += 1
+                    logger.warning(
+                        "Face landmarker pool saturated (%d sessions), %s waits",
+                        len(self._leases),
+                        session_id,
+                    )
+
+                remaining = deadline - time.perf_counter()
+                if remaining <= 0:
+                    self._rejected += 1
+                    raise PoolExhaustedError("Face landmarker pool is saturated")
+                self._cond.wait(remaining)
+
+        # Model loading happens outside the lock so other sessions proceed
+        try:
+            landmarker = self._factory()
+        except Exception:
+            with self._cond:
+                self._creating_for.discard(session_id)
+                self._cond.notify_all()
+            raise
+
+        with self._cond:
+            self._creating_for.discard(session_id)
+            if self._closed:
+                landmarker.close()
+                raise RuntimeError("Face landmarker pool has been closed")
+            self._instances.append(landmarker)
+            logger.info(
+                "Face landmarker pool grew to %d instances", len(self._instances)
+            )
+            return self._lease(session_id, landmarker, start)
+
+    async def acquire_async(self, session_id: str) -> FaceLandmarker:
+        """
+        Lease a landmarker without blocking the event loop.
+
+        Raises:
+            PoolExhaustedError: See acquire().
+            RuntimeError: See acquire().
+        """
+        loop = asyncio.get_running_loop()
+        future = loop.run_in_executor(None, self.acquire, session_id)
+
+        def release_late_lease(f: asyncio.Future) -> None:
+            if not f.cancelled() and f.exception() is None:
+                self.release(session_id)
+
+        try:
+            return await asyncio.shield(future)
+        except asyncio.CancelledError:
+            # The executor thread may still lease an instance; hand it back
+            future.add_done_callback(release_late_lease)
+            raise
+
+    def release(self, session_id: str) -> None:
+        """
+        Return a session's landmarker to the idle instances.
+        Safe to call for sessions without a lease.
+        """
+        with self._cond:
+            landmarker = self._leases.pop(session_id, None)
+            if landmarker is None:
+                return
+            if self._closed:
+                return
+            self._idle.append(landmarker)
+            # Wake waiters for a free instance and for this session id
+            self._cond.notify_all()
+
+    @contextmanager
+    def lease(self, session_id: str) -> Iterator[FaceLandmarker]:
+        """Hold a landmarker for the duration of the block."""
+        landmarker = self.acquire(session_id)
+        try:
+            yield landmarker
+        finally:
+            self.release(session_id)
+
+    @asynccontextmanager
+    async def lease_async(self, session_id: str) -> AsyncIterator[FaceLandmarker]:
+        """Hold a landmarker for the duration of the async block."""
+        landmarker = await self.acquire_async(session_id)
+        try:
+            yield landmarker
+        finally:
+            self.release(session_id)
+
+    def stats(self) -> dict[str, Any]:
+        """Return pool occupancy and saturation metrics."""
+        with self._cond:
+            leased = len(self._leases)
+            return {
+                "instances": len(self._instances),
+                "max_instances": self.max_size,
+                "leased": leased,
+                "idle": len(self._idle),
+                "saturation": leased / self.max_size,
+                "peak_leased": self._peak_leased,
+                "acquisitions": self._acquisitions,
+                "saturated_waits": self._saturated_waits,
+                "rejected": self._rejected,
+                "max_wait_ms": self._wait_max * 1000,
+            }
+
+    def close(self) -> None:
+        """
+        Close all landmarker instances. Safe to call multiple times.
+        """
+        with self._cond:
+            if self._closed:
+                return
+            self._closed = True
+            instances, self._instances = self._instances, []
+            self._idle = []
+            self._leases = {}
+            self._cond.notify_all()
+
+        for landmarker in instances:
+            landmarker.close()
+
+    def _lease(
+        self, session_id: str, landmarker: FaceLandmarker, start: float
+    ) -> FaceLandmarker:
+        """Record a lease. Called with the condition held."""
+        self._leases[session_id] = landmarker
+        self._acquisitions += 1
+        self._peak_leased = max(self._peak_leased, len(self._leases))
+        self._wait_max = max(self._wait_max, time.perf_counter() - start)
+        return landmarker
@@ -2,6 +2,8 @@
 Facial landmark coordinates.
 """
 
+import numpy as np
+
 LEFT_EYE: list[int] = [
     33,
     246,
@@ -104,3 +106,6 @@ def combine_landmarks(*groups: list[int]) -> list[int]:
 ESSENTIAL_LANDMARKS: list[int] = combine_landmarks(
     LEFT_EYE, RIGHT_EYE, INNER_LIP, OUTER_LIP, NOSE
 )
+
+# Index array for fancy-indexing the essential landmarks out of (N, 2) arrays
+ESSENTIAL_LANDMARK_INDICES = np.asarray(ESSENTIAL_LANDMARKS, dtype=np.intp)
@@ -0,0 +1,140 @@
+import logging
+from typing import Optional
+
+import numpy as np
+
+from app.services.face_landmarker import (
+    FaceLandmarker,
+    FaceLandmarkResult,
+    FaceLandmarks,
+)
+from app.services.utils.image_utils import crop_image
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_ROI_PADDING = 0.25
+
+# Smallest crop side in pixels; smaller faces are cropped with more context
+DEFAULT_MIN_ROI_SIZE = 96
+
+# Crops covering more of the frame than this run on the full frame instead
+MAX_ROI_AREA_RATIO = 0.8
+
+
+class RoiTrackingFaceLandmarker(FaceLandmarker):
+    """
+    Face landmarker that runs on a crop around the previous frame's face.
+
+    While a face is tracked, only a padded square around its last landmarks is
+    converted and passed to the wrapped landmarker, and the normalized results
+    are remapped to full-frame coordinates. When the crop yields no face, the
+    same frame is retried on the full frame and tracking restarts from there.
+    Transformation matrices are passed through: their rotation barely depends
+    on where the face sits in the input, which is all head pose uses.
+    """
+
+    def __init__(
+        self,
+        landmarker: FaceLandmarker,
+        padding: float = DEFAULT_ROI_PADDING,
+        min_roi_size: int = DEFAULT_MIN_ROI_SIZE,
+    ):
+        """
+        Args:
+            landmarker: Landmarker run on the crop or the full frame.
+            padding: Margin added on each side of the face box, relative to
+                     the face size (0-inf).
+            min_roi_size: Smallest crop side in pixels.
+
+        Raises:
+            ValueError: If parameters are invalid.
+        """
+        if padding < 0:
+            raise ValueError("padding must be non-negative.")
+        if min_roi_size <= 0:
+            raise ValueError("min_roi_size must be positive.")
+
+        self._landmarker = landmarker
+        self.padding = padding
+        self.min_roi_size = min_roi_size
+
+        # (x0, y0, x1, y1) pixel box and the frame shape it belongs to
+        self._roi: Optional[tuple[int, int, int, int]] = None
+        self._roi_shape: Optional[tuple[int, int]] = None
+
+    def detect(
+        self,
+        img: np.ndarray,
+        timestamp_ms: Optional[int] = None,
+    ) -> FaceLandmarkResult:
+        """
+        Detect face landmarks, on the tracked face region when available.
+
+        Args:
+            img: BGR image to detect landmarks in.
+            timestamp_ms: Media timestamp of the frame in its stream.
+
+        Returns:
+            Landmarks normalized to the full frame, see FaceLandmarker.detect().
+        """
+        h, w = img.shape[:2]
+
+        if self._roi is not None and self._roi_shape == (h, w):
+            x0, y0, x1, y1 = self._roi
+            result = self._landmarker.detect(
+                crop_image(img, x0, y0, x1, y1), timestamp_ms
+            )
+            face_landmarks = result.landmarks
+            if len(face_landmarks):
+                # Crop-normalized to frame-normalized coordinates
+                face_landmarks *= np.array([(x1 - x0) / w, (y1 - y0) / h], np.float32)
+                face_landmarks += np.array([x0 / w, y0 / h], np.float32)
+                self._track(face_landmarks, w, h)
+                return result
+
+            logger.debug("Face lost in tracked region, retrying full frame")
+
+        result = self._landmarker.detect(img, timestamp_ms)
+        self._track(result.landmarks, w, h)
+        return result
+
+    def reset(self) -> None:
+        """Forget the tracked face, e.g. when a new stream starts."""
+        self._roi = None
+        self._roi_shape = None
+        self._landmarker.reset()
+
+    def close(self) -> None:
+        """
+        Release underlying resources.
+        Safe to call multiple times.
+        """
+        self._landmarker.close()
+
+    def _track(self, face_landmarks: FaceLandmarks, w: int, h: int) -> None:
+        """Derive the next frame's crop from the current landmarks."""
+        if not len(face_landmarks):
+            self._roi = None
+            return
+
+        (min_x, min_y), (max_x, max_y) = (
+            face_landmarks.min(axis=0).tolist(),
+            face_landmarks.max(axis=0).tolist(),
+        )
+        face_size = max((max_x - min_x) * w, (max_y - min_y) * h)
+        side = max(face_size * (1 + 2 * self.padding), self.min_roi_size)
+        cx = (min_x + max_x) / 2 * w
+        cy = (min_y + max_y) / 2 * h
+
+        x0 = max(0, int(cx - side / 2))
+        y0 = max(0, int(cy - side / 2))
+        x1 = min(w, int(cx + side / 2) + 1)
+        y1 = min(h, int(cy + side / 2) + 1)
+
+        roi_area = (x1 - x0) * (y1 - y0)
+        if x1 <= x0 or y1 <= y0 or roi_area > MAX_ROI_AREA_RATIO * w * h:
+            self._roi = None
+            return
+
+        self._roi = (x0, y0, x1, y1)
+        self._roi_shape = (h, w)
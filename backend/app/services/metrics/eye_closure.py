@@ -92,7 +92,7 @@ class EyeClosureMetric(BaseMetric):
 
     def update(self, context: FrameContext) -> EyeClosureMetricOutput:
         landmarks = context.face_landmarks
-        if not landmarks:
+        if landmarks is None or len(landmarks) == 0:
             return self._build_output(ear=None)
 
         # Computer EAR
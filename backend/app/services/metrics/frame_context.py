@@ -1,11 +1,14 @@
 from dataclasses import dataclass
-from typing import Optional, Sequence
+from typing import Optional
 
-from app.services.face_landmarker import FaceLandmark2D
-from app.services.object_detector import ObjectDetection
+import numpy as np
+
+from app.services.face_landmarker import FaceLandmarks
+from app.services.object_detector import Detections
 
 
 @dataclass(frozen=True)
 class FrameContext:
-    face_landmarks: Optional[Sequence[FaceLandmark2D]] = None
-    object_detections: Optional[Sequence[ObjectDetection]] = None
+    face_landmarks: Optional[FaceLandmarks] = None
+    face_transformation_matrix: Optional[np.ndarray] = None
+    object_detections: Optional[Detections] = None
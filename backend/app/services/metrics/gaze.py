@@ -85,7 +85,7 @@ class GazeMetric(BaseMetric):
 
     def update(self, context: FrameContext) -> GazeMetricOutput:
         landmarks = context.face_landmarks
-        if not landmarks:
+        if landmarks is None or len(landmarks) == 0:
             return self._build_output()
 
         if self._eyes_closed(landmarks):
@@ -116,17 +116,17 @@ class GazeMetric(BaseMetric):
             return self._build_output()
         else:
             left_on_h = in_range(
-                left_ratio[0] if left_ratio else None, self.horizontal_range
+                left_ratio[0] if left_ratio is not None else None, self.horizontal_range
             )
             left_on_v = in_range(
-                left_ratio[1] if left_ratio else None, self.vertical_range
+                left_ratio[1] if left_ratio is not None else None, self.vertical_range
             )
 
             right_on_h = in_range(
-                right_ratio[0] if right_ratio else None, self.horizontal_range
+                right_ratio[0] if right_ratio is not None else None, self.horizontal_range
             )
             right_on_v = in_range(
-                right_ratio[1] if right_ratio else None, self.vertical_range
+                right_ratio[1] if right_ratio is not None else None, self.vertical_range
             )
 
             horizontal_ok = all(
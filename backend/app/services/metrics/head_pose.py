@@ -5,6 +5,9 @@ from app.core.config import settings
 from app.services.metrics.base_metric import BaseMetric, MetricOutputBase
 from app.services.metrics.frame_context import FrameContext
 from app.services.metrics.utils.head_pose_2d import compute_head_pose_angles_2d
+from app.services.metrics.utils.head_pose_matrix import (
+    compute_head_pose_angles_matrix,
+)
 
 logger = logging.getLogger(__name__)
 
@@ -54,8 +57,9 @@ class HeadPoseMetric(BaseMetric):
     Head pose metric using yaw, pitch, and roll angles computed from 2D landmarks.
     Detects when head is turned away from forward-facing position.
 
-    This implementation uses only 2D (x, y) landmarks and calibrates
-    a neutral baseline so alerts are relative to the driver's posture
+    Angles come from the landmarker's facial transformation matrix when it
+    provides one, and from 2D (x, y) landmark geometry otherwise. A neutral
+    baseline is calibrated so alerts are relative to the driver's posture
     rather than the phone camera angle.
     """
 
@@ -126,10 +130,11 @@ class HeadPoseMetric(BaseMetric):
         self._baseline_sum_roll = 0.0
         self._baseline_count = 0
         self._missing_frames = 0
+        self._from_matrix: Optional[bool] = None
 
     def update(self, context: FrameContext) -> HeadPoseMetricOutput:
         landmarks = context.face_landmarks
-        if not landmarks:
+        if landmarks is None or len(landmarks) == 0:
             self._missing_frames += 1
             if self._missing_frames >= self.missing_reset_frames:
                 self.reset_baseline()
@@ -145,8 +150,18 @@ class HeadPoseMetric(BaseMetric):
 
         self._missing_frames = 0
 
+        # Both methods differ in scale, so a baseline only holds for one
+        matrix = context.face_transformation_matrix
+        from_matrix = matrix is not None
+        if from_matrix != self._from_matrix:
+            self.reset_baseline()
+            self._from_matrix = from_matrix
+
         try:
-            yaw, pitch, roll = compute_head_pose_angles_2d(landmarks)
+            if matrix is not None:
+                yaw, pitch, roll = compute_head_pose_angles_matrix(matrix)
+            else:
+                yaw, pitch, roll = compute_head_pose_angles_2d(landmarks)
         except (ValueError, IndexError, ZeroDivisionError) as e:
             logger.debug(f"Head pose computation failed: {e}")
             return self._build_output(
@@ -1,3 +1,5 @@
+import numpy as np
+
 from app.core.config import settings
 from app.services.metrics.base_metric import BaseMetric, MetricOutputBase
 from app.services.metrics.frame_context import FrameContext
@@ -57,11 +59,13 @@ class PhoneUsageMetric(BaseMetric):
         self._phone_usage_active = False
 
     def update(self, context: FrameContext) -> PhoneUsageMetricOutput:
-        obj_detections = context.object_detections or []
+        detections = context.object_detections
 
-        phone_detected = any(
-            d.conf >= self.conf and (d.class_id == PHONE_CLASS_ID)
-            for d in obj_detections
+        phone_detected = detections is not None and bool(
+            np.any(
+                (detections.confs >= self.conf)
+                & (detections.class_ids == PHONE_CLASS_ID)
+            )
         )
 
         if phone_detected:
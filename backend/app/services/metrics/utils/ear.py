@@ -1,18 +1,22 @@
-from typing import Sequence
-
-from app.services.face_landmarker import FaceLandmark2D
-from app.services.metrics.utils.geometry import euclidean_dist
+from app.services.face_landmarker import FaceLandmarks
+from app.services.metrics.utils.geometry import pairwise_dist
 
 LEFT_EYE_INDICES = [33, 160, 158, 133, 153, 144]
 RIGHT_EYE_INDICES = [362, 385, 387, 263, 373, 380]
 
 
-def compute_ear(landmarks: Sequence[FaceLandmark2D], indices: list[int]) -> float:
+def _ear_pairs(indices: list[int]) -> tuple[list[int], list[int]]:
+    """Point pairs (p2, p6), (p3, p5), (p1, p4) of six eye indices."""
+    p1, p2, p3, p4, p5, p6 = indices
+    return [p2, p3, p1], [p6, p5, p4]
+
+
+def compute_ear(landmarks: FaceLandmarks, indices: list[int]) -> float:
     """
     Compute eye aspect ratio (EAR) for a given set of landmarks.
 
     Args:
-        landmarks: List of landmarks as (x, y) tuples
+        landmarks: (N, 2) array of landmarks
         indices: Indices of landmarks to use for computing EAR
 
     Returns:
@@ -20,16 +24,13 @@ def compute_ear(landmarks: Sequence[FaceLandmark2D], indices: list[int]) -> floa
     """
     if len(landmarks) <= max(indices):
         return 0.0
-    p1, p2, p3 = landmarks[indices[0]], landmarks[indices[1]], landmarks[indices[2]]
-    p4, p5, p6 = landmarks[indices[3]], landmarks[indices[4]], landmarks[indices[5]]
-    A = euclidean_dist(p2, p6)
-    B = euclidean_dist(p3, p5)
-    C = euclidean_dist(p1, p4)
+    src, dst = _ear_pairs(indices)
+    A, B, C = pairwise_dist(landmarks[src], landmarks[dst]).tolist()
     return (A + B) / (2.0 * C) if C > 0 else 0.0
 
 
 def average_ear(
-    landmarks: Sequence[FaceLandmark2D],
+    landmarks: FaceLandmarks,
     left_eye_indices: list[int] = LEFT_EYE_INDICES,
     right_eye_indices: list[int] = RIGHT_EYE_INDICES,
 ) -> float:
@@ -37,13 +38,25 @@ def average_ear(
     Compute average EAR for a given set of landmarks.
 
     Args:
-        landmarks: List of landmarks as (x, y) tuples
+        landmarks: (N, 2) array of landmarks
         left_eye_indices: Indices of left eye landmarks.
         right_eye_indices: Indices of right eye landmarks
 
     Returns:
         Average EAR value between 0 and 1
     """
-    left_ear = compute_ear(landmarks, left_eye_indices)
-    right_ear = compute_ear(landmarks, right_eye_indices)
+    if len(landmarks) <= max(*left_eye_indices, *right_eye_indices):
+        return (
+            compute_ear(landmarks, left_eye_indices)
+            + compute_ear(landmarks, right_eye_indices)
+        ) / 2.0
+
+    # Both eyes in one gather
+    left_src, left_dst = _ear_pairs(left_eye_indices)
+    right_src, right_dst = _ear_pairs(right_eye_indices)
+    A1, B1, C1, A2, B2, C2 = pairwise_dist(
+        landmarks[left_src + right_src], landmarks[left_dst + right_dst]
+    ).tolist()
+    left_ear = (A1 + B1) / (2.0 * C1) if C1 > 0 else 0.0
+    right_ear = (A2 + B2) / (2.0 * C2) if C2 > 0 else 0.0
     return (left_ear + right_ear) / 2.0
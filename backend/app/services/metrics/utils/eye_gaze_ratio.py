@@ -1,7 +1,7 @@
 import logging
-from typing import Optional, Sequence
+from typing import Optional
 
-from app.services.metrics.utils.geometry import average_point
+from app.services.face_landmarker import FaceLandmarks
 
 logger = logging.getLogger(__name__)
 
@@ -15,7 +15,7 @@ RIGHT_IRIS = (473, 474, 475, 476, 477)
 
 
 def eye_gaze_ratio(
-    landmarks: Sequence[tuple[float, float]],
+    landmarks: FaceLandmarks,
     corners: tuple[int, int],
     lids: tuple[int, int],
     iris_indices: tuple[int, ...],
@@ -25,10 +25,10 @@ def eye_gaze_ratio(
     Compute the normalized gaze ratio for one eye based on landmarks.
 
     This function is a pure utility and does not depend on any metric class.
-    It expects landmarks as a sequence of (x, y) coordinates.
+    It expects landmarks as an (N, 2) array of (x, y) coordinates.
 
     Args:
-        landmarks: Sequence of (x, y) landmark coordinates.
+        landmarks: (N, 2) array of landmark coordinates.
         corners: Tuple of indices (left_corner, right_corner).
         lids: Tuple of indices (upper_lid, lower_lid).
         iris_indices: Indices of landmarks forming the iris.
@@ -42,22 +42,22 @@ def eye_gaze_ratio(
     if max(*corners, *lids, *iris_indices) >= len(landmarks):
         return None
 
-    left_corner, right_corner = corners
-    upper_lid, lower_lid = lids
+    # One gather for the eye box and iris points
+    points = landmarks[[*corners, *lids, *iris_indices]].tolist()
+    (left_x, _), (right_x, _), (_, upper_y), (_, lower_y) = points[:4]
+    iris_points = points[4:]
+    iris_x = sum(p[0] for p in iris_points) / len(iris_points)
+    iris_y = sum(p[1] for p in iris_points) / len(iris_points)
 
-    # Compute iris center using utility function
-    iris_points = [landmarks[i] for i in iris_indices]
-    iris_center = average_point(iris_points)
-
-    width = landmarks[right_corner][0] - landmarks[left_corner][0]
-    height = landmarks[lower_lid][1] - landmarks[upper_lid][1]
+    width = right_x - left_x
+    height = lower_y - upper_y
 
     if width == 0 or height == 0:
         logger.debug("Zero width/height in eye landmarks")
         return None
 
-    gaze_x = (iris_center[0] - landmarks[left_corner][0]) / width
-    gaze_y = (iris_center[1] - landmarks[upper_lid][1]) / height
+    gaze_x = (iris_x - left_x) / width
+    gaze_y = (iris_y - upper_y) / height
 
     if is_right_eye:
         gaze_x = 1.0 - gaze_x
@@ -66,7 +66,7 @@ def eye_gaze_ratio(
 
 
 def left_eye_gaze_ratio(
-    landmarks: Sequence[tuple[float, float]],
+    landmarks: FaceLandmarks,
     corners: tuple[int, int] = LEFT_EYE_CORNERS,
     lids: tuple[int, int] = LEFT_EYE_LIDS,
     iris_indices: tuple[int, ...] = LEFT_IRIS,
@@ -84,7 +84,7 @@ def left_eye_gaze_ratio(
 
 
 def right_eye_gaze_ratio(
-    landmarks: Sequence[tuple[float, float]],
+    landmarks: FaceLandmarks,
     corners: tuple[int, int] = RIGHT_EYE_CORNERS,
     lids: tuple[int, int] = RIGHT_EYE_LIDS,
     iris_indices: tuple[int, ...] = RIGHT_IRIS,
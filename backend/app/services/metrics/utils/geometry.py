@@ -1,39 +1,16 @@
-from math import hypot
-from typing import Sequence
+import numpy as np
 
 
-def euclidean_dist(a: tuple[float, float], b: tuple[float, float]) -> float:
+def pairwise_dist(a: np.ndarray, b: np.ndarray) -> np.ndarray:
     """
-    Compute Euclidean distance between two points.
+    Compute Euclidean distances between corresponding rows of two point arrays.
 
     Args:
-        a: First point as (x, y) tuple
-        b: Second point as (x, y) tuple
+        a: (..., 2) array of points
+        b: (..., 2) array of points
 
     Returns:
-        Euclidean distance between points
+        (...) array of distances
     """
-    return hypot(a[0] - b[0], a[1] - b[1])
-
-
-def average_point(points: Sequence[tuple[float, float]]) -> tuple[float, float]:
-    """
-    Compute the average (centroid) of a sequence of 2D points.
-
-    Args:
-        points: A sequence of (x, y) tuples.
-
-    Returns:
-        A tuple (x, y) representing the average point.
-
-    Raises:
-        ValueError: If the points sequence is empty.
-    """
-    if not points:
-        raise ValueError("points must not be empty")
-
-    sum_x = sum(p[0] for p in points)
-    sum_y = sum(p[1] for p in points)
-
-    n = len(points)
-    return sum_x / n, sum_y / n
+    d = a - b
+    return np.hypot(d[..., 0], d[..., 1])
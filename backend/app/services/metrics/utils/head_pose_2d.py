@@ -4,10 +4,8 @@ No 3D coordinates or camera calibration required.
 """
 
 import math
-from typing import Sequence
 
-from app.services.face_landmarker import FaceLandmark2D
-from app.services.metrics.utils.geometry import euclidean_dist
+from app.services.face_landmarker import FaceLandmarks
 
 # Key landmark indices for head pose estimation (MediaPipe 468 landmarks)
 NOSE_TIP = 4
@@ -24,13 +22,13 @@ LEFT_FACE = 234  # Left cheek
 RIGHT_FACE = 454  # Right cheek
 
 
-def compute_roll_angle(landmarks: Sequence[FaceLandmark2D]) -> float:
+def compute_roll_angle(landmarks: FaceLandmarks) -> float:
     """
     Compute roll (head tilt) angle from 2D landmarks.
     Uses the angle between eye corners.
 
     Args:
-        landmarks: List of (x, y) tuples for all landmarks
+        landmarks: (N, 2) array of all landmarks
 
     Returns:
         Roll angle in degrees (positive = clockwise tilt)
@@ -38,8 +36,7 @@ def compute_roll_angle(landmarks: Sequence[FaceLandmark2D]) -> float:
     if len(landmarks) <= max(LEFT_EYE_OUTER, RIGHT_EYE_OUTER):
         return 0.0
 
-    left_eye = landmarks[LEFT_EYE_OUTER]
-    right_eye = landmarks[RIGHT_EYE_OUTER]
+    left_eye, right_eye = landmarks[[LEFT_EYE_OUTER, RIGHT_EYE_OUTER]].tolist()
 
     # Compute angle of line between eyes
     dx = right_eye[0] - left_eye[0]
@@ -52,7 +49,7 @@ def compute_roll_angle(landmarks: Sequence[FaceLandmark2D]) -> float:
 
 
 def compute_yaw_angle(
-    landmarks: Sequence[FaceLandmark2D], yaw_scale: float = 60.0
+    landmarks: FaceLandmarks, yaw_scale: float = 60.0
 ) -> float:
     """
     Compute yaw (left/right turn) angle from 2D landmarks.
@@ -62,7 +59,7 @@ def compute_yaw_angle(
     When head turns right, left side of face is more visible (larger distance).
 
     Args:
-        landmarks: List of (x, y) tuples for all landmarks
+        landmarks: (N, 2) array of all landmarks
 
     Returns:
         Yaw angle in degrees (positive = turning right, negative = turning left)
@@ -70,13 +67,11 @@ def compute_yaw_angle(
     if len(landmarks) <= max(NOSE_TIP, LEFT_FACE, RIGHT_FACE):
         return 0.0
 
-    nose = landmarks[NOSE_TIP]
-    left_face = landmarks[LEFT_FACE]
-    right_face = landmarks[RIGHT_FACE]
+    nose, left_face, right_face = landmarks[[NOSE_TIP, LEFT_FACE, RIGHT_FACE]].tolist()
 
     # Distance from nose to left and right face edges
-    dist_left = euclidean_dist(nose, left_face)
-    dist_right = euclidean_dist(nose, right_face)
+    dist_left = math.dist(nose, left_face)
+    dist_right = math.dist(nose, right_face)
 
     # When facing forward, distances should be roughly equal
     # When turning, one side becomes larger
@@ -95,7 +90,7 @@ def compute_yaw_angle(
     return yaw
 
 
-def compute_pitch_angle(landmarks: Sequence[FaceLandmark2D]) -> float:
+def compute_pitch_angle(landmarks: FaceLandmarks) -> float:
     """
     Compute pitch (up/down tilt) angle from 2D landmarks.
     Uses the vertical position of nose relative to face center.
@@ -104,7 +99,7 @@ def compute_pitch_angle(landmarks: Sequence[FaceLandmark2D]) -> float:
     When looking down, nose moves up relative to face center.
 
     Args:
-        landmarks: List of (x, y) tuples for all landmarks
+        landmarks: (N, 2) array of all landmarks
 
     Returns:
         Pitch angle in degrees (positive = looking up, negative = looking down)
@@ -113,13 +108,11 @@ def compute_pitch_angle(landmarks: Sequence[FaceLandmark2D]) -> float:
         return 0.0
 
     # landmarks needed
-    nose = landmarks[NOSE_TIP]
-    chin = landmarks[CHIN]
-    forehead = landmarks[FOREHEAD]
+    nose_y, chin_y, forehead_y = landmarks[[NOSE_TIP, CHIN, FOREHEAD], 1].tolist()
 
     # Face center (vertical midpoint)
-    face_center_y = (chin[1] + forehead[1]) / 2.0
-    face_height = abs(chin[1] - forehead[1])
+    face_center_y = (chin_y + forehead_y) / 2.0
+    face_height = abs(chin_y - forehead_y)
 
     if face_height == 0:
         return 0.0
@@ -127,7 +120,7 @@ def compute_pitch_angle(landmarks: Sequence[FaceLandmark2D]) -> float:
     # Normalized offset: how far is nose from face center?
     # Positive = nose below center (looking up)
     # Negative = nose above center (looking down)
-    offset = (nose[1] - face_center_y) / face_height
+    offset = (nose_y - face_center_y) / face_height
 
     # Convert to approximate angle (empirically calibrated)
     # Approximated value of the offset
@@ -139,7 +132,7 @@ def compute_pitch_angle(landmarks: Sequence[FaceLandmark2D]) -> float:
 
 
 def compute_head_pose_angles_2d(
-    landmarks: Sequence[FaceLandmark2D],
+    landmarks: FaceLandmarks,
 ) -> tuple[float, float, float]:
     """
     Compute head pose angles (yaw, pitch, roll) from 2D landmarks only.
@@ -148,7 +141,7 @@ def compute_head_pose_angles_2d(
     positions. No 3D coordinates or camera calibration required.
 
     Args:
-        landmarks: List of (x, y) tuples for all 468 MediaPipe landmarks
+        landmarks: (N, 2) array of all 468 MediaPipe landmarks
 
     Returns:
         Tuple of (yaw, pitch, roll) in degrees
@@ -0,0 +1,51 @@
+"""
+Head pose from MediaPipe's facial transformation matrix.
+
+The matrix maps the canonical face model into camera space (x right, y up,
+z towards the viewer). Its rotation is decomposed as R = Rz(roll) Ry(yaw) Rx(pitch)
+and the angles are returned in the sign convention of head_pose_2d.
+"""
+
+import math
+
+import numpy as np
+
+
+def compute_head_pose_angles_matrix(
+    matrix: np.ndarray,
+) -> tuple[float, float, float]:
+    """
+    Compute head pose angles (yaw, pitch, roll) from a facial transformation matrix.
+
+    Args:
+        matrix: 4x4 (or 3x3) transformation matrix of the face
+
+    Returns:
+        Tuple of (yaw, pitch, roll) in degrees
+
+    Note:
+        - Yaw: positive = turning right, negative = turning left
+        - Pitch: positive = looking up, negative = looking down
+        - Roll: positive = clockwise tilt, negative = counterclockwise tilt
+
+    Raises:
+        ValueError: If the matrix has no rotation.
+    """
+    (r00, r01, r02), (r10, r11, r12), (r20, r21, r22) = np.asarray(matrix)[
+        :3, :3
+    ].tolist()
+
+    # Remove any uniform scale
+    scale = math.sqrt(r00 * r00 + r10 * r10 + r20 * r20)
+    if scale == 0:
+        raise ValueError("matrix has no rotation")
+    r00, r10, r20 = r00 / scale, r10 / scale, r20 / scale
+    r21, r22 = r21 / scale, r22 / scale
+
+    yaw = math.degrees(math.asin(max(-1.0, min(1.0, -r20))))
+    pitch = math.degrees(math.atan2(r21, r22))
+    roll = math.degrees(math.atan2(r10, r00))
+
+    # Camera space angles are counterclockwise about axes pointing right, up
+    # and at the viewer, while the 2D convention follows the image
+    return (-yaw, -pitch, -roll)
@@ -1,9 +1,9 @@
 from __future__ import annotations
 
-from typing import Optional, Sequence
+from typing import Optional
 
-from app.services.face_landmarker import FaceLandmark2D
-from app.services.metrics.utils.geometry import euclidean_dist
+from app.services.face_landmarker import FaceLandmarks
+from app.services.metrics.utils.geometry import pairwise_dist
 
 UPPER_LIP = 13
 LOWER_LIP = 14
@@ -17,8 +17,12 @@ MOUTH_LANDMARK_INDICES: tuple[int, int, int, int] = (
     RIGHT_MOUTH_CORNER,
 )
 
+# Vertical (lips) and horizontal (corners) point pairs
+_MAR_FROM = [UPPER_LIP, LEFT_MOUTH_CORNER]
+_MAR_TO = [LOWER_LIP, RIGHT_MOUTH_CORNER]
 
-def compute_mar(landmarks: Sequence[FaceLandmark2D]) -> Optional[float]:
+
+def compute_mar(landmarks: FaceLandmarks) -> Optional[float]:
     """
     Compute the Mouth Aspect Ratio (MAR).
 
@@ -37,7 +41,7 @@ def compute_mar(landmarks: Sequence[FaceLandmark2D]) -> Optional[float]:
         - Commonly used for detecting yawning, speaking, or mouth activity.
 
     Args:
-        landmarks: A sequence of 2D face landmarks.
+        landmarks: (N, 2) array of face landmarks.
 
     Returns:
         The MAR value or None if required landmarks are missing or invalid.
@@ -45,17 +49,10 @@ def compute_mar(landmarks: Sequence[FaceLandmark2D]) -> Optional[float]:
     if len(landmarks) <= max(MOUTH_LANDMARK_INDICES):
         return None
 
-    top = landmarks[UPPER_LIP]
-    bottom = landmarks[LOWER_LIP]
-    left = landmarks[LEFT_MOUTH_CORNER]
-    right = landmarks[RIGHT_MOUTH_CORNER]
-
-    if any(len(p) < 2 for p in (top, bottom, left, right)):
-        return None
-
-    horizontal = euclidean_dist(left, right)
+    vertical, horizontal = pairwise_dist(
+        landmarks[_MAR_FROM], landmarks[_MAR_TO]
+    ).tolist()
     if horizontal <= 1e-9:
         return None
 
-    vertical = euclidean_dist(top, bottom)
     return vertical / horizontal
@@ -76,7 +76,7 @@ class YawnMetric(BaseMetric):
 
     def update(self, context: FrameContext) -> YawnMetricOutput:
         landmarks = context.face_landmarks
-        if not landmarks:
+        if landmarks is None or len(landmarks) == 0:
             return self._build_output(mar=None)
 
         try:
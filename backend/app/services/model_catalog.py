@@ -0,0 +1,140 @@
+import json
+import logging
+import math
+from pathlib import Path
+from typing import Literal, Optional
+
+from pydantic import BaseModel
+
+logger = logging.getLogger(__name__)
+
+PROJECT_ROOT = Path(__file__).resolve().parents[2]
+MODELS_DIR = PROJECT_ROOT / "assets" / "models"
+MANIFEST_PATH = MODELS_DIR / "manifest.json"
+
+# ONNX Runtime optimized graphs, keyed per model, runtime version and CPU
+MODEL_CACHE_DIR = MODELS_DIR / ".cache"
+
+# Variant used when no manifest has been exported
+DEFAULT_MODEL_VARIANT = "yolov8n"
+
+# Selects the most accurate variant within the latency budget
+AUTO_VARIANT = "auto"
+
+# Accuracy metric that ranks variants for automatic selection
+RANKING_METRIC = "phone_recall"
+
+
+class ModelVariant(BaseModel):
+    """
+    One exported detector model and its measured performance.
+    """
+
+    name: str
+    file: str
+    base_model: str
+    input_size: int = 640
+    quantization: Literal["none", "dynamic", "static"] = "none"
+    phone_only: bool = False
+    latency_ms: Optional[float] = None
+    accuracy: dict[str, float] = {}
+
+
+class ModelManifest(BaseModel):
+    """
+    Catalogue of exported detector variants.
+    """
+
+    variants: list[ModelVariant] = []
+
+    def get(self, name: str) -> Optional[ModelVariant]:
+        return next((v for v in self.variants if v.name == name), None)
+
+    def upsert(self, variant: ModelVariant) -> None:
+        self.variants = [v for v in self.variants if v.name != variant.name]
+        self.variants.append(variant)
+
+
+def load_manifest(path: Path = MANIFEST_PATH) -> ModelManifest:
+    """Load the variant manifest, or an empty one if none has been exported."""
+    if not path.exists():
+        return ModelManifest()
+    return ModelManifest.model_validate_json(path.read_text(encoding="utf-8"))
+
+
+def save_manifest(manifest: ModelManifest, path: Path = MANIFEST_PATH) -> None:
+    path.write_text(
+        json.dumps(manifest.model_dump(), indent=2) + "\n", encoding="utf-8"
+    )
+
+
+def resolve_model_variant(
+    name: str,
+    max_latency_ms: float = 0.0,
+    models_dir: Path = MODELS_DIR,
+) -> tuple[ModelVariant, Path]:
+    """
+    Resolve a variant name from settings to a manifest entry and model path.
+
+    Args:
+        name: Variant name, a model file stem in models_dir, or "auto".
+        max_latency_ms: Latency budget for "auto" selection, 0 for no budget.
+        models_dir: Folder holding the exported models and manifest.
+
+    Returns:
+        Tuple of (variant, model path).
+
+    Raises:
+        ValueError: If the variant cannot be found.
+    """
+    manifest = load_manifest(models_dir / MANIFEST_PATH.name)
+
+    if name == AUTO_VARIANT:
+        variant = _select_variant(manifest, max_latency_ms)
+        if variant is None:
+            logger.warning(
+                "No measured model variant fits %.1f ms, using %s",
+                max_latency_ms,
+                DEFAULT_MODEL_VARIANT,
+            )
+            name = DEFAULT_MODEL_VARIANT
+        else:
+            logger.info(
+                "Selected model variant %s (%.1f ms, %s %.3f)",
+                variant.name,
+                variant.latency_ms,
+                RANKING_METRIC,
+                variant.accuracy[RANKING_METRIC],
+            )
+            return variant, models_dir / variant.file
+
+    variant = manifest.get(name)
+    if variant is None:
+        # Plain model file that was not exported through the variant pipeline
+        variant = ModelVariant(name=name, file=f"{name}.onnx", base_model=name)
+        if not (models_dir / variant.file).exists():
+            raise ValueError(f"Unknown model variant: {name}")
+
+    return variant, models_dir / variant.file
+
+
+def _select_variant(
+    manifest: ModelManifest, max_latency_ms: float
+) -> Optional[ModelVariant]:
+    """Pick the most accurate measured variant, then the fastest among equals."""
+    candidates = [
+        v
+        for v in manifest.variants
+        if v.latency_ms is not None
+        and RANKING_METRIC in v.accuracy
+        and (max_latency_ms <= 0 or v.latency_ms <= max_latency_ms)
+    ]
+    if not candidates:
+        return None
+    return max(
+        candidates,
+        key=lambda v: (
+            v.accuracy[RANKING_METRIC],
+            -(v.latency_ms if v.latency_ms is not None else math.inf),
+        ),
+    )
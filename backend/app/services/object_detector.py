@@ -1,15 +1,27 @@
+import asyncio
 import logging
 import os
 import threading
+from functools import partial
 from pathlib import Path
-from typing import Protocol
+from typing import Any, Optional, Protocol, Sequence
 
-import cv2
 import numpy as np
 import onnxruntime as ort
 from pydantic import BaseModel
 
-from app.services.utils.image_utils import letterbox
+from app.services.execution_providers import (
+    CPU_PROVIDER,
+    provider_chain,
+    select_provider,
+)
+from app.services.onnx_session_pool import (
+    OnnxSessionPool,
+    default_pool_size,
+    default_thread_budget,
+)
+from app.services.utils.box_utils import non_max_suppression, xywh_to_xyxy
+from app.services.utils.image_utils import LetterboxPreprocessor
 
 logger = logging.getLogger(__name__)
 
@@ -20,6 +32,18 @@ MODEL_PATH = PROJECT_ROOT / "assets" / "models" / "yolov8n.onnx"
 # Essential classes to filter out from object detections
 ESSENTIAL_CLASSES: list[int] = [67]  # cell phone
 
+# Number of box coordinates preceding the class scores in YOLOv8 output rows
+NUM_BOX_COORDS = 4
+
+# Model metadata key listing the class ids of a pruned head's score rows
+OUTPUT_CLASSES_METADATA_KEY = "output_classes"
+
+# Largest YOLOv8 stride; model input sides must be multiples of it
+MODEL_STRIDE = 32
+
+# Long-side input sizes a dynamic-shape model is run at
+DEFAULT_INPUT_SIZES: tuple[int, ...] = (320, 416, 480, 640)
+
 
 class ObjectDetection(BaseModel):
     """
@@ -31,6 +55,60 @@ class ObjectDetection(BaseModel):
     class_id: int
 
 
+class Detections:
+    """
+    Compact batch of object detections in one image.
+
+    Parallel arrays of xyxy boxes (N x 4), confidences (N) and class ids (N).
+    Used on the hot path; converted to ObjectDetection only at the API boundary.
+    """
+
+    __slots__ = ("boxes", "confs", "class_ids")
+
+    def __init__(self, boxes: np.ndarray, confs: np.ndarray, class_ids: np.ndarray):
+        self.boxes = boxes
+        self.confs = confs
+        self.class_ids = class_ids
+
+    @classmethod
+    def empty(cls) -> "Detections":
+        return cls(
+            np.empty((0, 4), dtype=np.float32),
+            np.empty(0, dtype=np.float32),
+            np.empty(0, dtype=np.intp),
+        )
+
+    @classmethod
+    def from_models(cls, detections: Sequence[ObjectDetection]) -> "Detections":
+        if not detections:
+            return cls.empty()
+        return cls(
+            np.array([d.bbox for d in detections], dtype=np.float32),
+            np.array([d.conf for d in detections], dtype=np.float32),
+            np.array([d.class_id for d in detections], dtype=np.intp),
+        )
+
+    def __len__(self) -> int:
+        return len(self.confs)
+
+    def __getitem__(self, index: Any) -> "Detections":
+        """Select detections by index array, slice or boolean mask."""
+        return Detections(self.boxes[index], self.confs[index], self.class_ids[index])
+
+    def __repr__(self) -> str:
+        return f"Detections(n={len(self)}, class_ids={self.class_ids.tolist()})"
+
+    def to_models(self) -> list[ObjectDetection]:
+        """Convert to ObjectDetection models for API responses."""
+        # Values come from typed arrays, so validation is skipped
+        return [
+            ObjectDetection.model_construct(bbox=bbox, conf=conf, class_id=class_id)
+            for bbox, conf, class_id in zip(
+                self.boxes.tolist(), self.confs.tolist(), self.class_ids.tolist()
+            )
+        ]
+
+
 class ObjectDetector(Protocol):
     """
     Abstraction for object detection.
@@ -42,7 +120,19 @@ class ObjectDetector(Protocol):
         normalize: bool = True,
         conf_threshold: float = 0.4,
         iou_threshold: float = 0.5,
-    ) -> list[ObjectDetection]: ...
+        input_size: Optional[int] = None,
+    ) -> Detections: ...
+
+    async def detect_async(
+        self,
+        img: np.ndarray,
+        normalize: bool = True,
+        conf_threshold: float = 0.4,
+        iou_threshold: float = 0.5,
+        input_size: Optional[int] = None,
+    ) -> Detections: ...
+
+    def stats(self) -> dict[str, Any]: ...
 
     def close(self) -> None: ...
 
@@ -52,13 +142,49 @@ class YoloObjectDetector(ObjectDetector):
     YOLO-based implementation of object detector.
     """
 
-    def __init__(self, model_path: Path = MODEL_PATH, input_size: int = 640):
+    def __init__(
+        self,
+        model_path: Path = MODEL_PATH,
+        input_size: int = 640,
+        fast_postprocess: bool = True,
+        num_sessions: Optional[int] = None,
+        thread_budget: Optional[int] = None,
+        input_sizes: Sequence[int] = DEFAULT_INPUT_SIZES,
+        match_input: bool = True,
+        io_binding: bool = True,
+        async_run: bool = False,
+        cache_dir: Optional[Path] = None,
+        execution_provider: str = CPU_PROVIDER,
+    ):
         """
         Initialize object detector.
 
         Args:
             model_path: Path to the ONNX model file.
-            input_size: Input size for the model (default: 640).
+            input_size: Maximum input size for the model (default: 640).
+            fast_postprocess: Only decode the ESSENTIAL_CLASSES score rows of the
+                              model output instead of all classes (default: True).
+            num_sessions: Number of pooled ONNX sessions that can run in parallel
+                          (default: derived from the thread budget).
+            thread_budget: Total intra-op threads shared by the pooled sessions
+                           (default: half the CPU count).
+            input_sizes: Long-side sizes a dynamic-shape model may run at.
+            match_input: Pick the input geometry from the frame size: the smallest
+                         input size that does not downscale the frame, with the
+                         short side padded only up to the model stride. When
+                         disabled, frames are letterboxed to input_size squares.
+            io_binding: Bind the input tensor and a reusable output buffer with
+                        ONNX Runtime IOBinding instead of allocating outputs on
+                        every run (default: True).
+            async_run: Serve detect_async with ONNX Runtime's run_async, so no
+                       thread waits on the inference (default: False, awaiting
+                       a default-executor thread instead).
+            cache_dir: Folder caching the optimized model graph between
+                       restarts (default: None, optimize on every load).
+            execution_provider: ONNX Runtime CPU execution provider ("cpu",
+                                "dnnl", "openvino", "xnnpack"), or "auto" to
+                                benchmark the installed ones at startup and
+                                use the fastest (default: CPU).
 
         Raises:
             ValueError: If parameters are invalid.
@@ -79,29 +205,83 @@ class YoloObjectDetector(ObjectDetector):
             )
 
         self.input_size = input_size
+        self.input_sizes = sorted({s for s in input_sizes if 0 < s <= input_size})
+        self.match_input = match_input
+        self.io_binding = io_binding
+        self._fixed_shape: Optional[tuple[int, int]] = None
+        self._preprocessor = LetterboxPreprocessor()
+        self._postprocess_fn = (
+            self._postprocess_essential
+            if fast_postprocess and ESSENTIAL_CLASSES
+            else self._postprocess
+        )
 
         # Validate model path
         self._validate_model_path(model_path)
 
-        # Initialize ONNX session
+        # Initialize ONNX session pool
         try:
-            sess_opts = ort.SessionOptions()
-            sess_opts.graph_optimization_level = (
-                ort.GraphOptimizationLevel.ORT_ENABLE_ALL
+            thread_budget = thread_budget or default_thread_budget()
+            num_sessions = num_sessions or default_pool_size(thread_budget)
+            provider, self.provider_benchmarks = select_provider(
+                model_path,
+                execution_provider,
+                intra_op_num_threads=max(1, thread_budget // num_sessions),
+                input_size=input_size,
             )
-            sess_opts.intra_op_num_threads = max(1, (os.cpu_count() or 2) // 2)
-
-            self.session = ort.InferenceSession(
-                str(model_path),
-                sess_options=sess_opts,
-                providers=["CPUExecutionProvider"],
+            self._pool = OnnxSessionPool(
+                model_path,
+                size=num_sessions,
+                thread_budget=thread_budget,
+                providers=provider_chain(provider),
+                async_run=async_run,
+                cache_dir=cache_dir,
             )
+            self.async_run = async_run
+            self.session = self._pool.sessions[0]
 
             self.input_name = self.session.get_inputs()[0].name
+            self.output_name = self.session.get_outputs()[0].name
+
+            # IOBinding state: one binding per pooled session, output buffers
+            # per thread, and the per-image output shape of each input geometry
+            self._bindings: dict[int, ort.IOBinding] = {}
+            self._output_shapes: dict[tuple[int, ...], tuple[int, ...]] = {}
+            self._output_buffers = threading.local()
+
+            # run_async keeps the input alive until its callback, so async runs
+            # preprocess into buffers owned by the borrowed session
+            self._session_preprocessors: dict[int, LetterboxPreprocessor] = {}
+
+            # Heads pruned at export only output the score rows of these classes
+            self.output_classes = self._read_output_classes()
+            if self.output_classes is not None:
+                if not fast_postprocess:
+                    logger.info("Pruned model head, using essential postprocess")
+                self._postprocess_fn = partial(
+                    self._postprocess_essential, output_classes=self.output_classes
+                )
 
             # Validate model input shape
             self._validate_model_input()
 
+            # A fixed batch dimension of 1 means frames cannot be stacked
+            input_shape = self.session.get_inputs()[0].shape
+            batch_dim = input_shape[0]
+            self.supports_batching = not (isinstance(batch_dim, int) and batch_dim == 1)
+
+            # Per-call input sizes require dynamic height and width axes
+            self.supports_dynamic_input = not all(
+                isinstance(dim, int) for dim in input_shape[2:]
+            )
+            if not self.supports_dynamic_input:
+                self._fixed_shape = (int(input_shape[3]), int(input_shape[2]))
+                if self._fixed_shape != (input_size, input_size):
+                    logger.info(
+                        f"Model has a fixed input shape {self._fixed_shape}, "
+                        f"ignoring input_size {input_size}"
+                    )
+
             logger.info(f"Object Detector initialized with model: {model_path}")
 
         except Exception as e:
@@ -114,7 +294,8 @@ class YoloObjectDetector(ObjectDetector):
         normalize: bool = True,
         conf_threshold: float = 0.3,
         iou_threshold: float = 0.5,
-    ) -> list[ObjectDetection]:
+        input_size: Optional[int] = None,
+    ) -> Detections:
         """
         Detect objects in an image.
 
@@ -123,48 +304,331 @@ class YoloObjectDetector(ObjectDetector):
             normalize: Whether to normalize bounding boxes to 0-1 range.
             conf_threshold: Confidence threshold for object detection.
             iou_threshold: Intersection over union threshold for object detection.
+            input_size: Maximum model input size for this call, if the model
+                        supports dynamic input shapes (default: the detector's
+                        input_size).
+
+        Returns:
+            Detections of the image.
+        """
+        return self.detect_batch(
+            [img],
+            normalize=normalize,
+            conf_threshold=conf_threshold,
+            iou_threshold=iou_threshold,
+            input_size=input_size,
+        )[0]
+
+    def detect_batch(
+        self,
+        imgs: Sequence[np.ndarray],
+        normalize: bool = True,
+        conf_threshold: float = 0.3,
+        iou_threshold: float = 0.5,
+        input_size: Optional[int] = None,
+    ) -> list[Detections]:
+        """
+        Detect objects in several images with a single inference call.
+
+        Args:
+            imgs: BGR images to detect objects in.
+            normalize: Whether to normalize bounding boxes to 0-1 range.
+            conf_threshold: Confidence threshold for object detection.
+            iou_threshold: Intersection over union threshold for object detection.
+            input_size: Maximum model input size for this call, if the model
+                        supports dynamic input shapes (default: the detector's
+                        input_size).
 
         Returns:
-            List of detected objects.
+            Detections of each image, in input order.
         """
         if self._closed or self.session is None:
             raise RuntimeError("Object detector has been closed")
 
+        if not imgs:
+            return []
+
         try:
-            orig_shape = img.shape[:2]
+            # Frames batched together share one geometry large enough for all
+            shapes = [self.input_shape(img.shape[:2], input_size) for img in imgs]
+            shape = (max(w for w, _ in shapes), max(h for _, h in shapes))
 
-            img_lb, ratio, pad = letterbox(img, self.input_size)
+            tensor, transforms = self._preprocess(imgs, shape)
 
-            tensor = self._preprocess(img_lb)
+            output = self._infer(tensor)
+            if output is None:
+                logger.warning("Model returned empty output")
+                return [Detections.empty() for _ in imgs]
+
+            results = [
+                self._postprocess_fn(
+                    output[i : i + 1],
+                    img.shape[:2],
+                    ratio,
+                    pad,
+                    conf_threshold,
+                    iou_threshold,
+                    normalize,
+                )
+                for i, (img, (ratio, pad)) in enumerate(zip(imgs, transforms))
+            ]
 
-            with self._lock:
-                outputs = self.session.run(None, {self.input_name: tensor})
+            logger.debug(
+                f"Detected {sum(len(r) for r in results)} objects in {len(imgs)} images"
+            )
+            return results
 
-            # Validate outputs
-            if not outputs or len(outputs) == 0:
-                logger.warning("Model returned empty output")
-                return []
-
-            output = outputs[0]
-            assert isinstance(output, np.ndarray)
-
-            results = self._postprocess(
-                output,
-                orig_shape,
-                ratio,
-                pad,
-                conf_threshold,
-                iou_threshold,
-                normalize,
+        except Exception as e:
+            logger.error(f"Detection failed: {e}", exc_info=True)
+            raise RuntimeError(f"Inference failed: {e}") from e
+
+    async def detect_async(
+        self,
+        img: np.ndarray,
+        normalize: bool = True,
+        conf_threshold: float = 0.3,
+        iou_threshold: float = 0.5,
+        input_size: Optional[int] = None,
+    ) -> Detections:
+        """
+        Detect objects in an image without holding a thread during inference.
+
+        The frame is preprocessed on a default-executor thread and run with
+        ONNX Runtime's run_async, so only the submission runs on the event loop.
+        The completion callback postprocesses on an ORT worker thread and
+        resolves the awaited future.
+
+        Args:
+            See detect().
+
+        Returns:
+            Detections of the image.
+        """
+        if not self.async_run:
+            return await asyncio.get_running_loop().run_in_executor(
+                None,
+                partial(
+                    self.detect,
+                    img,
+                    normalize=normalize,
+                    conf_threshold=conf_threshold,
+                    iou_threshold=iou_threshold,
+                    input_size=input_size,
+                ),
             )
 
-            logger.debug(f"Detected {len(results)} objects")
-            return results
+        if self._closed or self.session is None:
+            raise RuntimeError("Object detector has been closed")
+
+        loop = asyncio.get_running_loop()
+        future: asyncio.Future[Detections] = loop.create_future()
+        session = await self._pool.acquire_async()
+
+        def release_session(_: Any = None) -> None:
+            self._pool.release(session)
+
+        prepare = loop.run_in_executor(
+            None, self._preprocess_for_session, session, img, input_size
+        )
+        try:
+            tensor, (ratio, pad) = await asyncio.shield(prepare)
+        except asyncio.CancelledError:
+            # The executor may still be writing the session's input buffer
+            prepare.add_done_callback(release_session)
+            raise
+        except Exception as e:
+            release_session()
+            logger.error(f"Detection failed: {e}", exc_info=True)
+            raise RuntimeError(f"Inference failed: {e}") from e
+
+        try:
+
+            def on_done(outputs: list[np.ndarray], _: Any, error: str) -> None:
+                try:
+                    if error:
+                        raise RuntimeError(error)
+                    result = self._postprocess_fn(
+                        outputs[0],
+                        img.shape[:2],
+                        ratio,
+                        pad,
+                        conf_threshold,
+                        iou_threshold,
+                        normalize,
+                    )
+                except Exception as e:
+                    logger.error(f"Detection failed: {e}")
+                    loop.call_soon_threadsafe(
+                        _set_future_exception,
+                        future,
+                        RuntimeError(f"Inference failed: {e}"),
+                    )
+                else:
+                    loop.call_soon_threadsafe(_set_future_result, future, result)
+                finally:
+                    self._pool.release(session)
+
+            session.run_async(
+                [self.output_name], {self.input_name: tensor}, on_done, None
+            )
 
         except Exception as e:
+            self._pool.release(session)
             logger.error(f"Detection failed: {e}", exc_info=True)
             raise RuntimeError(f"Inference failed: {e}") from e
 
+        return await future
+
+    def _preprocess_for_session(
+        self,
+        session: ort.InferenceSession,
+        img: np.ndarray,
+        input_size: Optional[int],
+    ) -> tuple[np.ndarray, tuple[float, tuple[int, int]]]:
+        """
+        Preprocess a frame into the input buffer owned by a borrowed session.
+        """
+        preprocessor = self._session_preprocessors.get(id(session))
+        if preprocessor is None:
+            preprocessor = self._session_preprocessors[id(session)] = (
+                LetterboxPreprocessor()
+            )
+        tensor, [transform] = preprocessor(
+            [img], self.input_shape(img.shape[:2], input_size)
+        )
+        return tensor, transform
+
+    def input_shape(
+        self, img_shape: tuple[int, int], input_size: Optional[int] = None
+    ) -> tuple[int, int]:
+        """
+        Return the (width, height) model input geometry for an image.
+
+        Args:
+            img_shape: Image (height, width).
+            input_size: Maximum input size (default: the detector's input_size).
+        """
+        if self._fixed_shape is not None:
+            return self._fixed_shape
+
+        max_size = input_size or self.input_size
+        if not self.match_input:
+            return max_size, max_size
+
+        h, w = img_shape
+        long_side = max(h, w, 1)
+
+        # Smallest configured size that does not downscale the frame
+        side = min(
+            (s for s in self.input_sizes if long_side <= s < max_size),
+            default=max_size,
+        )
+
+        # Pad the short side only up to the next stride multiple
+        scale = side / long_side
+        return (
+            min(side, _round_up_to_stride(w * scale)),
+            min(side, _round_up_to_stride(h * scale)),
+        )
+
+    def _infer(self, tensor: np.ndarray) -> np.ndarray | None:
+        """
+        Run the model on a [N, 3, H, W] tensor and return the raw [N, ...] output.
+        Models exported with a fixed batch of 1 are run one frame at a time.
+        """
+        with self._pool.acquire() as session:
+            if self.io_binding:
+                return self._run_bound(session, tensor)
+
+            if self.supports_batching or len(tensor) == 1:
+                outputs = session.run(None, {self.input_name: tensor})
+            else:
+                outputs = [
+                    np.concatenate(
+                        [
+                            session.run(None, {self.input_name: tensor[i : i + 1]})[0]
+                            for i in range(len(tensor))
+                        ]
+                    )
+                ]
+
+        # Validate outputs
+        if not outputs or len(outputs) == 0:
+            return None
+
+        output = outputs[0]
+        assert isinstance(output, np.ndarray)
+        return output
+
+    def _run_bound(
+        self, session: ort.InferenceSession, tensor: np.ndarray
+    ) -> np.ndarray:
+        """
+        Run the model with IOBinding, writing into a reusable output buffer.
+
+        The input tensor is bound in place. The returned view into the output
+        buffer is valid until the next call from the same thread.
+        """
+        binding = self._bindings.get(id(session))
+        if binding is None:
+            binding = self._bindings[id(session)] = session.io_binding()
+
+        geometry = tensor.shape[1:]
+        output_shape = self._output_shapes.get(geometry)
+        if output_shape is None:
+            output_shape = self._discover_output_shape(session, binding, tensor[:1])
+
+        output = self._output_buffer(output_shape, len(tensor))
+        step = len(tensor) if self.supports_batching else 1
+        for i in range(0, len(tensor), step):
+            binding.bind_ortvalue_input(
+                self.input_name, ort.OrtValue.ortvalue_from_numpy(tensor[i : i + step])
+            )
+            binding.bind_ortvalue_output(
+                self.output_name, ort.OrtValue.ortvalue_from_numpy(output[i : i + step])
+            )
+            session.run_with_iobinding(binding)
+
+        return output
+
+    def _discover_output_shape(
+        self,
+        session: ort.InferenceSession,
+        binding: ort.IOBinding,
+        tensor: np.ndarray,
+    ) -> tuple[int, ...]:
+        """Run once with an ORT-allocated output to learn the per-image output shape."""
+        binding.bind_ortvalue_input(
+            self.input_name, ort.OrtValue.ortvalue_from_numpy(tensor)
+        )
+        binding.bind_output(self.output_name)
+        session.run_with_iobinding(binding)
+
+        output_shape = tuple(binding.get_outputs()[0].shape()[1:])
+        binding.clear_binding_outputs()
+
+        self._output_shapes[tuple(tensor.shape[1:])] = output_shape
+        logger.debug(f"Output shape {output_shape} for input {tensor.shape[1:]}")
+        return output_shape
+
+    def _output_buffer(
+        self, output_shape: tuple[int, ...], batch_size: int
+    ) -> np.ndarray:
+        """Return this thread's output buffer with room for batch_size images."""
+        cache: dict[tuple[int, ...], np.ndarray] | None = getattr(
+            self._output_buffers, "buffers", None
+        )
+        if cache is None:
+            cache = self._output_buffers.buffers = {}
+
+        buffer = cache.get(output_shape)
+        if buffer is None or len(buffer) < batch_size:
+            buffer = cache[output_shape] = np.empty(
+                (batch_size, *output_shape), dtype=np.float32
+            )
+
+        return buffer[:batch_size]
+
     def close(self) -> None:
         """
         Release underlying resources.
@@ -174,20 +638,37 @@ class YoloObjectDetector(ObjectDetector):
             if self._closed:
                 return
             self._closed = True
+            self._pool.close()
+            self._bindings.clear()
+            self._session_preprocessors.clear()
             self.session = None
             self.input_name = None
 
-    @staticmethod
-    def _preprocess(img: np.ndarray) -> np.ndarray:
+    @property
+    def num_sessions(self) -> int:
+        return self._pool.size
+
+    def stats(self) -> dict[str, Any]:
+        """
+        Return session pool utilization and wait time metrics, and the
+        execution provider benchmark when the provider was picked at startup.
+        """
+        stats = self._pool.stats()
+        if self.provider_benchmarks:
+            stats["provider_benchmark_ms"] = {
+                r.provider: r.latency_ms if r.latency_ms is not None else r.error
+                for r in self.provider_benchmarks
+            }
+        return stats
+
+    def _preprocess(
+        self, imgs: Sequence[np.ndarray], shape: tuple[int, int]
+    ) -> tuple[np.ndarray, list[tuple[float, tuple[int, int]]]]:
         """
-        Preprocess a BGR image for ONNX YOLOv8 inference.
+        Preprocess BGR images into a reusable [N, 3, H, W] tensor for ONNX YOLOv8 inference.
         """
         try:
-            img = img[:, :, ::-1]  # BGR -> RGB
-            img = img.transpose(2, 0, 1)  # HWC -> CHW
-            # Normalize to [0, 1]
-            img = np.ascontiguousarray(img, dtype=np.float32) / 255.0
-            return img[None]  # Add batch dimension
+            return self._preprocessor(imgs, shape)
         except Exception as e:
             logger.error(f"Preprocessing failed: {e}")
             raise ValueError(f"Failed to preprocess image: {e}") from e
@@ -201,9 +682,9 @@ class YoloObjectDetector(ObjectDetector):
         conf_thres: float,
         iou_thres: float,
         normalize: bool = False,
-    ) -> list[ObjectDetection]:
+    ) -> Detections:
         """
-        Post process raw YOLOv8 ONNX output to a list of ObjectDetection.
+        Post process raw YOLOv8 ONNX output to Detections.
         """
         try:
             output = np.squeeze(output).T
@@ -221,42 +702,122 @@ class YoloObjectDetector(ObjectDetector):
                 )
             )
             if boxes.size == 0:
-                return []
+                return Detections.empty()
 
             # Convert xywh -> xyxy
-            boxes = YoloObjectDetector._xywh_to_xyxy(boxes)
-
-            # Undo letterbox
-            boxes /= ratio
-            boxes[:, [0, 2]] -= pad[0]
-            boxes[:, [1, 3]] -= pad[1]
-
-            # Clip / normalize
-            h, w = orig_shape
-            if normalize:
-                boxes[:, [0, 2]] /= w
-                boxes[:, [1, 3]] /= h
-            else:
-                boxes[:, [0, 2]] = boxes[:, [0, 2]].clip(0, w)
-                boxes[:, [1, 3]] = boxes[:, [1, 3]].clip(0, h)
+            boxes = xywh_to_xyxy(boxes)
+
+            # Apply class-aware NMS in model space
+            keep_idxs = non_max_suppression(boxes, confidences, iou_thres, class_ids)
+            boxes = boxes[keep_idxs]
+            confidences = confidences[keep_idxs]
+            class_ids = class_ids[keep_idxs]
 
-            # Apply class-aware NMS
-            keep_idxs = YoloObjectDetector._apply_nms(
-                boxes, confidences, class_ids, conf_thres, iou_thres
+            # Undo letterbox, clip / normalize
+            boxes = YoloObjectDetector._undo_letterbox(
+                boxes, orig_shape, ratio, pad, normalize
             )
+
+            # Wrap in a Detections batch
+            return YoloObjectDetector._to_detections(boxes, confidences, class_ids)
+
+        except Exception as e:
+            logger.error(f"Postprocessing failed: {e}")
+            raise RuntimeError(f"Failed to postprocess output: {e}") from e
+
+    @staticmethod
+    def _postprocess_essential(
+        output: np.ndarray,
+        orig_shape: tuple[int, int],
+        ratio: float,
+        pad: tuple[int, int],
+        conf_thres: float,
+        iou_thres: float,
+        normalize: bool = False,
+        output_classes: Optional[Sequence[int]] = None,
+    ) -> Detections:
+        """
+        Fast post process that only decodes the ESSENTIAL_CLASSES score rows.
+
+        Unlike _postprocess, an essential class is kept when its own score passes
+        the threshold, even if another (ignored) class scores higher on that anchor.
+        output_classes maps the score rows of a pruned head to class ids.
+        """
+        try:
+            output = output.reshape(output.shape[-2], output.shape[-1])
+
+            if output_classes is None:
+                classes = ESSENTIAL_CLASSES
+                rows = [NUM_BOX_COORDS + c for c in classes]
+            else:
+                classes = [c for c in ESSENTIAL_CLASSES if c in output_classes]
+                rows = [NUM_BOX_COORDS + output_classes.index(c) for c in classes]
+
+            if not classes:
+                return Detections.empty()
+
+            if len(classes) == 1:
+                # Single class: the score row is a view, no copy needed
+                scores = output[rows[0]]
+                candidates = np.flatnonzero(scores >= conf_thres)
+                confidences = scores[candidates]
+                class_ids = np.full(len(candidates), classes[0])
+            else:
+                scores = output[rows]
+                best = scores.argmax(axis=0)
+                best_scores = np.take_along_axis(scores, best[None], axis=0)[0]
+                candidates = np.flatnonzero(best_scores >= conf_thres)
+                confidences = best_scores[candidates]
+                class_ids = np.asarray(classes)[best[candidates]]
+
+            if candidates.size == 0:
+                return Detections.empty()
+
+            # Convert xywh -> xyxy for the surviving anchors only
+            boxes = xywh_to_xyxy(output[:NUM_BOX_COORDS, candidates].T)
+
+            # Apply class-aware NMS in model space
+            keep_idxs = non_max_suppression(boxes, confidences, iou_thres, class_ids)
             boxes = boxes[keep_idxs]
             confidences = confidences[keep_idxs]
             class_ids = class_ids[keep_idxs]
 
-            # Convert to ObjectDetection
-            return YoloObjectDetector._to_object_detections(
-                boxes, confidences, class_ids
+            # Undo letterbox, clip / normalize
+            boxes = YoloObjectDetector._undo_letterbox(
+                boxes, orig_shape, ratio, pad, normalize
             )
 
+            # Wrap in a Detections batch
+            return YoloObjectDetector._to_detections(boxes, confidences, class_ids)
+
         except Exception as e:
             logger.error(f"Postprocessing failed: {e}")
             raise RuntimeError(f"Failed to postprocess output: {e}") from e
 
+    @staticmethod
+    def _undo_letterbox(
+        boxes: np.ndarray,
+        orig_shape: tuple[int, int],
+        ratio: float,
+        pad: tuple[int, int],
+        normalize: bool,
+    ) -> np.ndarray:
+        """Map xyxy boxes from model input space back to the original image."""
+        boxes /= ratio
+        boxes[:, [0, 2]] -= pad[0] / ratio
+        boxes[:, [1, 3]] -= pad[1] / ratio
+
+        # Clip / normalize
+        h, w = orig_shape
+        if normalize:
+            boxes[:, [0, 2]] /= w
+            boxes[:, [1, 3]] /= h
+        else:
+            boxes[:, [0, 2]] = boxes[:, [0, 2]].clip(0, w)
+            boxes[:, [1, 3]] = boxes[:, [1, 3]].clip(0, h)
+
+        return boxes
+
     @staticmethod
     def _filter_confidence_and_classes(
         boxes: np.ndarray,
@@ -279,59 +840,9 @@ class YoloObjectDetector(ObjectDetector):
         return boxes, confidences, class_ids
 
     @staticmethod
-    def _xywh_to_xyxy(boxes: np.ndarray) -> np.ndarray:
-        """Convert bounding boxes from xywh to xyxy format."""
-        boxes_copy = boxes.copy()
-        boxes_copy[:, 0] = boxes[:, 0] - boxes[:, 2] / 2
-        boxes_copy[:, 1] = boxes[:, 1] - boxes[:, 3] / 2
-        boxes_copy[:, 2] = boxes[:, 0] + boxes[:, 2] / 2
-        boxes_copy[:, 3] = boxes[:, 1] + boxes[:, 3] / 2
-        return boxes_copy
-
-    @staticmethod
-    def _apply_nms(boxes, confidences, class_ids, conf_thres, iou_thres):
-        """Apply Non-Max Suppression (NMS) to boxes
-        to remove duplicate or overlapping bounding boxes for the same object."""
-        if len(boxes) == 0:
-            return np.array([], dtype=np.int32)
-
-        keep_idxs = []
-        unique_classes = np.unique(class_ids)
-
-        for cls in unique_classes:
-            cls_mask = class_ids == cls
-            cls_indices = np.flatnonzero(cls_mask)
-            cls_boxes = boxes[cls_mask]
-            cls_scores = confidences[cls_mask]
-
-            try:
-                keep = cv2.dnn.NMSBoxes(
-                    cls_boxes.tolist(),
-                    cls_scores.tolist(),
-                    conf_thres,
-                    iou_thres,
-                )
-
-                if len(keep) > 0:
-                    keep_flat = np.array(keep).flatten()
-                    keep_idxs.extend(cls_indices[keep_flat])
-            except Exception as e:
-                logger.warning(f"NMS failed for class {cls}: {e}")
-                continue
-
-        return np.array(keep_idxs, dtype=np.int32)
-
-    @staticmethod
-    def _to_object_detections(boxes, confidences, class_ids):
-        """Convert raw output to list of ObjectDetection."""
-        return [
-            ObjectDetection(
-                bbox=boxes[i].tolist(),
-                conf=float(confidences[i]),
-                class_id=int(class_ids[i]),
-            )
-            for i in range(len(boxes))
-        ]
+    def _to_detections(boxes, confidences, class_ids) -> Detections:
+        """Wrap filtered output arrays in a compact Detections batch."""
+        return Detections(boxes, confidences, class_ids.astype(np.intp, copy=False))
 
     @staticmethod
     def _validate_model_path(model_path: Path) -> None:
@@ -354,6 +865,14 @@ class YoloObjectDetector(ObjectDetector):
         if not os.access(model_path, os.R_OK):
             raise ValueError(f"Model file is not readable: {model_path}")
 
+    def _read_output_classes(self) -> Optional[list[int]]:
+        """Read the class ids of a pruned head from the model metadata."""
+        metadata = self.session.get_modelmeta().custom_metadata_map
+        value = metadata.get(OUTPUT_CLASSES_METADATA_KEY)
+        if not value:
+            return None
+        return [int(c) for c in value.split(",")]
+
     def _validate_model_input(self) -> None:
         """Validate model input shape and type."""
         if self._closed or self.session is None:
@@ -376,8 +895,25 @@ class YoloObjectDetector(ObjectDetector):
             logger.error(f"Failed to validate model input: {e}")
 
 
-def create_object_detector(implementation: type[ObjectDetector]) -> ObjectDetector:
+def _set_future_result(future: asyncio.Future, result: Any) -> None:
+    if not future.done():
+        future.set_result(result)
+
+
+def _set_future_exception(future: asyncio.Future, error: BaseException) -> None:
+    if not future.done():
+        future.set_exception(error)
+
+
+def _round_up_to_stride(value: float) -> int:
+    """Round a model input side up to the next multiple of MODEL_STRIDE."""
+    return max(MODEL_STRIDE, -(-round(value) // MODEL_STRIDE) * MODEL_STRIDE)
+
+
+def create_object_detector(
+    implementation: type[ObjectDetector], **kwargs
+) -> ObjectDetector:
     """
     Factory method to create a object detector.
     """
-    return implementation()
+    return implementation(**kwargs)
@@ -0,0 +1,513 @@
+import logging
+import math
+import threading
+from concurrent.futures import Future
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any, Optional
+
+import cv2
+import numpy as np
+
+from app.services.face_landmarker import FaceLandmarker, FaceLandmarkResult
+from app.services.model_catalog import MODELS_DIR
+from app.services.onnx_session_pool import OnnxSessionPool
+from app.services.request_batcher import BatchRequest, RequestBatcher
+from app.services.utils.box_utils import box_iou
+from app.services.utils.image_utils import letterbox
+
+logger = logging.getLogger(__name__)
+
+# Models exported from face_landmarker.task by scripts/export_face_mesh_onnx.py
+FACE_DETECTOR_MODEL_PATH = MODELS_DIR / "face_detector.onnx"
+FACE_MESH_MODEL_PATH = MODELS_DIR / "face_mesh.onnx"
+
+# Short-range BlazeFace: 128x128 input in [-1, 1], 896 anchors
+DETECTOR_INPUT_SIZE = 128
+DETECTOR_STRIDES = (8, 16, 16, 16)
+DETECTOR_NMS_IOU = 0.3
+
+# Face mesh: 256x256 crop in [0, 1], 478 (x, y, z) landmarks in crop pixels
+MESH_INPUT_SIZE = 256
+NUM_MESH_LANDMARKS = 478
+
+# Mesh crops are squares this much larger than the face, rotated to level the eyes
+ROI_SCALE = 1.5
+
+# Right and left eye: detection keypoints and mesh landmarks (outer corners)
+DETECTION_EYES = (0, 1)
+LANDMARK_EYES = (33, 263)
+
+DEFAULT_MAX_BATCH_SIZE = 8
+DEFAULT_MAX_WAIT_MS = 2.0
+
+# Time a session waits for its mesh result before giving up on the frame
+DEFAULT_MESH_TIMEOUT_SEC = 1.0
+
+
+def ssd_anchors(
+    input_size: int = DETECTOR_INPUT_SIZE,
+    strides: tuple[int, ...] = DETECTOR_STRIDES,
+) -> np.ndarray:
+    """
+    Anchor centers of the BlazeFace detector, normalized to its input.
+
+    Consecutive layers with the same stride share one feature map, with two
+    anchors per layer in each cell.
+
+    Returns:
+        (N, 2) float32 array of (x, y) anchor centers.
+    """
+    anchors = []
+    layer = 0
+    while layer < len(strides):
+        stride = strides[layer]
+        per_cell = 0
+        while layer < len(strides) and strides[layer] == stride:
+            per_cell += 2
+            layer += 1
+
+        cells = math.ceil(input_size / stride)
+        centers = (np.arange(cells, dtype=np.float32) + 0.5) / cells
+        xs, ys = np.meshgrid(centers, centers)
+        grid = np.stack([xs.ravel(), ys.ravel()], axis=1)
+        anchors.append(np.repeat(grid, per_cell, axis=0))
+
+    return np.concatenate(anchors)
+
+
+def sigmoid(x: np.ndarray) -> np.ndarray:
+    return 1.0 / (1.0 + np.exp(-np.clip(x, -100.0, 100.0)))
+
+
+@dataclass
+class FaceRoi:
+    """
+    Rotated square face region in image pixels.
+
+    Attributes:
+        center: (x, y) center of the region.
+        size: Side length of the region.
+        angle: Rotation in radians that levels the eyes, clockwise in the image.
+    """
+
+    center: tuple[float, float]
+    size: float
+    angle: float
+
+    @classmethod
+    def from_face(
+        cls,
+        box: tuple[float, float, float, float],
+        right_eye: np.ndarray,
+        left_eye: np.ndarray,
+    ) -> "FaceRoi":
+        """
+        Region around a face box, scaled by ROI_SCALE and rotated so the
+        eyes lie on a horizontal line.
+
+        Args:
+            box: (x1, y1, x2, y2) face box.
+            right_eye: (x, y) of the right eye, on the left of the image.
+            left_eye: (x, y) of the left eye.
+        """
+        x1, y1, x2, y2 = box
+        dx, dy = (left_eye - right_eye).tolist()
+        return cls(
+            center=((x1 + x2) / 2, (y1 + y2) / 2),
+            size=max(x2 - x1, y2 - y1) * ROI_SCALE,
+            angle=math.atan2(dy, dx),
+        )
+
+    @classmethod
+    def from_landmarks(cls, points: np.ndarray) -> "FaceRoi":
+        """Region for the next frame around (N, 2) landmarks in pixels."""
+        (x1, y1), (x2, y2) = points.min(axis=0).tolist(), points.max(axis=0).tolist()
+        return cls.from_face(
+            (x1, y1, x2, y2), points[LANDMARK_EYES[0]], points[LANDMARK_EYES[1]]
+        )
+
+    def warp_matrix(self, size: int) -> np.ndarray:
+        """2x3 affine transform from the image onto a size x size crop."""
+        cos, sin = math.cos(self.angle), math.sin(self.angle)
+        half = self.size / 2
+        cx, cy = self.center
+        # Corners of the region: top-left, top-right, bottom-left
+        src = np.array(
+            [
+                [cx - half * cos + half * sin, cy - half * sin - half * cos],
+                [cx + half * cos + half * sin, cy + half * sin - half * cos],
+                [cx - half * cos - half * sin, cy - half * sin + half * cos],
+            ],
+            dtype=np.float32,
+        )
+        dst = np.array([[0, 0], [size, 0], [0, size]], dtype=np.float32)
+        return cv2.getAffineTransform(src, dst)
+
+
+class OnnxFaceMeshModel:
+    """
+    ONNX Runtime face detection and face mesh models shared by all sessions.
+
+    Face crops submitted concurrently by different sessions are collected into
+    batches by a RequestBatcher and run as a single [N, 256, 256, 3] mesh
+    inference. One worker runs per pooled mesh session.
+    Face detection only runs when a session has no face to track, so
+    its calls run directly on a single session.
+    """
+
+    def __init__(
+        self,
+        detector_path: Path = FACE_DETECTOR_MODEL_PATH,
+        mesh_path: Path = FACE_MESH_MODEL_PATH,
+        max_batch_size: int = DEFAULT_MAX_BATCH_SIZE,
+        max_wait_ms: float = DEFAULT_MAX_WAIT_MS,
+        num_sessions: int = 1,
+        thread_budget: Optional[int] = None,
+        cache_dir: Optional[Path] = None,
+    ):
+        """
+        Args:
+            detector_path: Path to the face detection ONNX model.
+            mesh_path: Path to the face mesh ONNX model.
+            max_batch_size: Maximum number of crops per mesh inference (1-inf).
+            max_wait_ms: Maximum time the first crop of a batch waits for others (0-inf).
+            num_sessions: Number of pooled mesh sessions, i.e. batches in flight.
+            thread_budget: Total intra-op threads shared by the mesh sessions.
+            cache_dir: Folder for the optimized model cache, None to disable.
+
+        Raises:
+            ValueError: If parameters are invalid.
+            RuntimeError: If model loading fails.
+        """
+        if max_batch_size < 1:
+            raise ValueError("max_batch_size must be at least 1.")
+        if max_wait_ms < 0:
+            raise ValueError("max_wait_ms must be non-negative.")
+        if num_sessions < 1:
+            raise ValueError("num_sessions must be at least 1.")
+
+        try:
+            self._detector_pool = OnnxSessionPool(
+                detector_path, size=1, thread_budget=1, cache_dir=cache_dir
+            )
+            self._mesh_pool = OnnxSessionPool(
+                mesh_path,
+                size=num_sessions,
+                thread_budget=thread_budget,
+                cache_dir=cache_dir,
+            )
+        except Exception as exc:
+            logger.exception("ONNX face mesh initialization failed")
+            raise RuntimeError("Face mesh model initialization failed") from exc
+
+        mesh_input = self._mesh_pool.sessions[0].get_inputs()[0]
+        self._mesh_input = mesh_input.name
+        self._mesh_nchw = mesh_input.shape[-1] != 3
+        # Exported models have a symbolic batch dimension, others run per crop
+        self._mesh_batched = not isinstance(mesh_input.shape[0], int)
+        detector_input = self._detector_pool.sessions[0].get_inputs()[0]
+        self._detector_input = detector_input.name
+        self._detector_nchw = detector_input.shape[-1] != 3
+        self._anchors = ssd_anchors()
+
+        self._stats_lock = threading.Lock()
+        self._detections = 0
+
+        self._batcher: RequestBatcher[np.ndarray] = RequestBatcher(
+            self._dispatch,
+            max_batch_size=max_batch_size,
+            max_wait_ms=max_wait_ms,
+            num_workers=num_sessions,
+            name="face-mesh",
+            closed_message="Face mesh model has been closed",
+        )
+
+        logger.info(
+            "ONNX face mesh ready (max_batch_size=%d, max_wait_ms=%.1f, "
+            "workers=%d, batched input: %s)",
+            max_batch_size,
+            max_wait_ms,
+            self._batcher.num_workers,
+            self._mesh_batched,
+        )
+
+    def detect_face(
+        self, img: np.ndarray, min_confidence: float = 0.5
+    ) -> Optional[FaceRoi]:
+        """
+        Detect the most confident face in an image.
+
+        Overlapping detections are blended weighted by their scores.
+
+        Args:
+            img: BGR image to detect a face in.
+            min_confidence: Minimum detection score (0-1).
+
+        Returns:
+            Mesh region of the face, or None without a face.
+        """
+        h, w = img.shape[:2]
+        padded, scale, (pad_left, pad_top) = letterbox(
+            img, DETECTOR_INPUT_SIZE, color=(0, 0, 0)
+        )
+        tensor = padded[..., ::-1].astype(np.float32)
+        tensor *= 2.0 / 255.0
+        tensor -= 1.0
+        tensor = tensor.transpose(2, 0, 1) if self._detector_nchw else tensor
+
+        with self._detector_pool.acquire() as session:
+            outputs = session.run(None, {self._detector_input: tensor[None]})
+        regressors = outputs[0].reshape(-1, outputs[0].shape[-1])
+        scores = sigmoid(outputs[1].reshape(-1))
+
+        with self._stats_lock:
+            self._detections += 1
+
+        candidates = np.flatnonzero(scores >= min_confidence)
+        if not len(candidates):
+            return None
+
+        # Box centers, sizes and keypoints are offsets from the anchors, in input pixels
+        raw = regressors[candidates] / DETECTOR_INPUT_SIZE
+        anchors = self._anchors[candidates]
+        centers = raw[:, :2] + anchors
+        half_sizes = raw[:, 2:4] / 2
+        boxes = np.concatenate([centers - half_sizes, centers + half_sizes], axis=1)
+        keypoints = raw[:, 4:].reshape(len(candidates), -1, 2) + anchors[:, None]
+
+        best = int(scores[candidates].argmax())
+        cluster = box_iou(boxes[best], boxes) >= DETECTOR_NMS_IOU
+        weights = scores[candidates][cluster]
+        weights /= weights.sum()
+        box = weights @ boxes[cluster]
+        keypoints = np.tensordot(weights, keypoints[cluster], axes=1)
+
+        # Letterboxed input to image pixels
+        offset = np.array([pad_left, pad_top], dtype=np.float32)
+        box = (box.reshape(2, 2) * DETECTOR_INPUT_SIZE - offset) / scale
+        keypoints = (keypoints * DETECTOR_INPUT_SIZE - offset) / scale
+        (x1, y1), (x2, y2) = np.clip(box, 0, [w, h]).tolist()
+        return FaceRoi.from_face(
+            (x1, y1, x2, y2),
+            keypoints[DETECTION_EYES[0]],
+            keypoints[DETECTION_EYES[1]],
+        )
+
+    def submit(self, crop: np.ndarray) -> Future:
+        """
+        Queue a BGR mesh crop for the next batch.
+
+        Returns:
+            Future of the (478, 2) landmarks in crop pixels and the face
+            presence score.
+        """
+        return self._batcher.submit(crop)
+
+    def run_mesh(self, crops: list[np.ndarray]) -> tuple[np.ndarray, np.ndarray]:
+        """
+        Run the face mesh on BGR crops.
+
+        Args:
+            crops: MESH_INPUT_SIZE x MESH_INPUT_SIZE BGR crops.
+
+        Returns:
+            (N, 478, 2) landmarks in crop pixels and (N,) face presence scores.
+        """
+        batch = np.stack(crops)[..., ::-1].astype(np.float32)
+        batch *= 1.0 / 255.0
+        if self._mesh_nchw:
+            batch = batch.transpose(0, 3, 1, 2)
+        batch = np.ascontiguousarray(batch)
+
+        with self._mesh_pool.acquire() as session:
+            if self._mesh_batched:
+                outputs = [session.run(None, {self._mesh_input: batch})]
+            else:
+                outputs = [
+                    session.run(None, {self._mesh_input: batch[i : i + 1]})
+                    for i in range(len(batch))
+                ]
+
+        landmarks = np.concatenate(
+            [out[0].reshape(-1, NUM_MESH_LANDMARKS, 3) for out in outputs]
+        )
+        presence = np.concatenate([out[1].reshape(-1) for out in outputs])
+        return np.ascontiguousarray(landmarks[..., :2]), sigmoid(presence)
+
+    @property
+    def avg_batch_size(self) -> float:
+        return self._batcher.avg_batch_size
+
+    def stats(self) -> dict[str, Any]:
+        """Return batching metrics merged with the mesh session pool's metrics."""
+        with self._stats_lock:
+            detections = self._detections
+        batch_stats = {
+            "batches": self._batcher.batches,
+            "avg_batch_size": self._batcher.avg_batch_size,
+            "queued_crops": self._batcher.queued,
+            "face_detections": detections,
+        }
+        return {**self._mesh_pool.stats(), **batch_stats}
+
+    def close(self) -> None:
+        """
+        Stop the batching threads and release the sessions.
+        Safe to call multiple times.
+        """
+        if self._batcher.closed:
+            return
+        self._batcher.close()
+        self._mesh_pool.close()
+        self._detector_pool.close()
+
+        if self._batcher.batches:
+            logger.info(
+                "ONNX face mesh closed (%d crops in %d batches, avg %.2f)",
+                self._batcher.requests,
+                self._batcher.batches,
+                self._batcher.avg_batch_size,
+            )
+
+    def _dispatch(self, batch: list[BatchRequest[np.ndarray]]) -> None:
+        """Run one mesh inference for the batch and resolve its futures."""
+        try:
+            landmarks, presence = self.run_mesh([r.item for r in batch])
+        except Exception as e:
+            for request in batch:
+                request.future.set_exception(e)
+            return
+
+        for request, points, score in zip(batch, landmarks, presence):
+            request.future.set_result((points, float(score)))
+
+
+class OnnxFaceLandmarker(FaceLandmarker):
+    """
+    ONNX Runtime implementation of face landmark detection, one per session.
+
+    Like MediaPipe's video mode, the face detector only runs when no face is
+    tracked. Otherwise the mesh runs on a rotated crop around the previous
+    frame's landmarks. The crops of all sessions are batched by the shared
+    OnnxFaceMeshModel. Landmarks use MediaPipe's 478-point layout. No
+    transformation matrix is produced, so head pose uses 2D geometry.
+    """
+
+    def __init__(
+        self,
+        model: OnnxFaceMeshModel,
+        *,
+        min_face_detection_confidence: float = 0.3,
+        min_face_presence_confidence: float = 0.3,
+        mesh_timeout_sec: float = DEFAULT_MESH_TIMEOUT_SEC,
+    ):
+        """
+        Args:
+            model: Shared detection and mesh models.
+            min_face_detection_confidence: Minimum confidence threshold for face detection.
+            min_face_presence_confidence: Minimum confidence threshold for face presence.
+            mesh_timeout_sec: Maximum wait for a batched mesh result (0-inf).
+                              A frame whose result does not arrive in time
+                              has no landmarks.
+
+        Raises:
+            ValueError: If parameters are invalid.
+        """
+        if not 0 <= min_face_detection_confidence <= 1:
+            raise ValueError("min_face_detection_confidence must be between 0 and 1.")
+        if not 0 <= min_face_presence_confidence <= 1:
+            raise ValueError("min_face_presence_confidence must be between 0 and 1.")
+        if mesh_timeout_sec <= 0:
+            raise ValueError("mesh_timeout_sec must be positive.")
+
+        self._model = model
+        self.min_face_detection_confidence = min_face_detection_confidence
+        self.min_face_presence_confidence = min_face_presence_confidence
+        self.mesh_timeout_sec = mesh_timeout_sec
+
+        # Region for the next frame and the frame shape it belongs to
+        self._roi: Optional[FaceRoi] = None
+        self._roi_shape: Optional[tuple[int, int]] = None
+
+    def detect(
+        self,
+        img: np.ndarray,
+        timestamp_ms: Optional[int] = None,
+    ) -> FaceLandmarkResult:
+        """
+        Detect face landmarks in an image.
+
+        Args:
+            img: BGR image to detect landmarks in.
+            timestamp_ms: Media timestamp of the frame in its stream. Unused,
+                          tracking only depends on the previous frame.
+
+        Returns:
+            Landmarks of the first face, see FaceLandmarker.detect().
+        """
+        h, w = img.shape[:2]
+
+        points = None
+        try:
+            if self._roi is not None and self._roi_shape == (h, w):
+                points = self._landmarks(img, self._roi)
+                if points is None:
+                    logger.debug("Face lost in tracked region, detecting again")
+
+            if points is None:
+                roi = self._model.detect_face(img, self.min_face_detection_confidence)
+                points = self._landmarks(img, roi) if roi is not None else None
+        except TimeoutError:
+            logger.warning(
+                "Face mesh result not ready after %.1f s, skipping frame",
+                self.mesh_timeout_sec,
+            )
+
+        if points is None:
+            self._roi = None
+            return FaceLandmarkResult.empty()
+
+        self._roi = FaceRoi.from_landmarks(points)
+        self._roi_shape = (h, w)
+
+        points *= np.array([1 / w, 1 / h], dtype=np.float32)
+        return FaceLandmarkResult(points)
+
+    def reset(self) -> None:
+        """Forget the tracked face, e.g. when a new stream starts."""
+        self._roi = None
+        self._roi_shape = None
+
+    def close(self) -> None:
+        """
+        Release underlying resources.
+        The shared model is closed by its owner.
+        """
+
+    def _landmarks(self, img: np.ndarray, roi: FaceRoi) -> Optional[np.ndarray]:
+        """
+        Run the mesh on a region; landmarks in image pixels, or None without a face.
+
+        Raises:
+            TimeoutError: If the mesh result does not arrive within mesh_timeout_sec.
+        """
+        matrix = roi.warp_matrix(MESH_INPUT_SIZE)
+        crop = cv2.warpAffine(
+            img, matrix, (MESH_INPUT_SIZE, MESH_INPUT_SIZE), flags=cv2.INTER_LINEAR
+        )
+        future = self._model.submit(crop)
+        try:
+            points, presence = future.result(timeout=self.mesh_timeout_sec)
+        except TimeoutError:
+            # Keep a queued crop out of later batches
+            future.cancel()
+            raise
+        if presence < self.min_face_presence_confidence:
+            return None
+
+        # Crop pixels back to image pixels
+        inverse = cv2.invertAffineTransform(matrix).astype(np.float32)
+        points = points @ inverse[:, :2].T
+        points += inverse[:, 2]
+        return points
@@ -0,0 +1,131 @@
+import hashlib
+import logging
+import os
+import platform
+import shutil
+from pathlib import Path
+from typing import Optional, Sequence
+
+import onnxruntime as ort
+
+logger = logging.getLogger(__name__)
+
+# Initializers above this size are saved to a separate data file, which
+# ONNX Runtime maps into memory on load instead of parsing from the protobuf
+EXTERNAL_INITIALIZER_MIN_BYTES = 1024
+
+_HASH_CHUNK_BYTES = 1 << 20
+
+
+def file_sha256(path: Path) -> str:
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(_HASH_CHUNK_BYTES), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def cpu_signature() -> str:
+    """
+    Describe the CPU features that fully optimized graphs are specialized for.
+    """
+    try:
+        with open("/proc/cpuinfo", encoding="utf-8") as f:
+            for line in f:
+                if line.startswith("flags"):
+                    return hashlib.sha256(line.encode()).hexdigest()[:16]
+    except OSError:
+        pass
+    return f"{platform.machine()}-{platform.processor()}"
+
+
+class OptimizedModelCache:
+    """
+    On-disk cache of ONNX Runtime optimized model graphs.
+
+    Entries are keyed by the model content hash, the ONNX Runtime version, the
+    optimization options and the CPU, since fully optimized graphs contain
+    hardware-specific layouts. Weights are stored as external initializers so
+    later loads map them into memory. An entry is the pair {key}.onnx and
+    {key}.data; the model references its data file by that final name.
+    """
+
+    def __init__(self, cache_dir: Path):
+        self.cache_dir = Path(cache_dir)
+
+    def key(
+        self,
+        model_path: Path,
+        providers: Sequence[str],
+        graph_optimization_level: ort.GraphOptimizationLevel,
+    ) -> str:
+        parts = [
+            file_sha256(model_path),
+            ort.__version__,
+            str(graph_optimization_level),
+            ",".join(providers),
+            cpu_signature(),
+        ]
+        digest = hashlib.sha256("|".join(parts).encode()).hexdigest()[:24]
+        return f"{model_path.stem}-{digest}"
+
+    def _entry_paths(self, key: str) -> tuple[Path, Path]:
+        """Model and external initializer paths of a cache entry."""
+        return self.cache_dir / f"{key}.onnx", self.cache_dir / f"{key}.data"
+
+    def lookup(self, key: str) -> Optional[Path]:
+        """Return the cached optimized model for key, if any."""
+        path = self.cache_dir / f"{key}.onnx"
+        return path if path.exists() else None
+
+    def prepare_save(self, sess_opts: ort.SessionOptions, key: str) -> Path:
+        """
+        Configure session options to write the optimized model for key.
+
+        The entry is written to a staging folder per process, so concurrent
+        writers never share a file, under the file names it is published with.
+
+        Returns:
+            Staging folder to pass to commit() once the session is created,
+            or to discard() if session creation fails.
+        """
+        model_path, data_path = self._entry_paths(key)
+        staging_dir = self.cache_dir / f"{key}.{os.getpid()}.tmp"
+        staging_dir.mkdir(parents=True, exist_ok=True)
+
+        sess_opts.optimized_model_filepath = str(staging_dir / model_path.name)
+        sess_opts.add_session_config_entry(
+            "session.optimized_model_external_initializers_file_name",
+            data_path.name,
+        )
+        sess_opts.add_session_config_entry(
+            "session.optimized_model_external_initializers_min_size_in_bytes",
+            str(EXTERNAL_INITIALIZER_MIN_BYTES),
+        )
+        return staging_dir
+
+    def commit(self, key: str, staging_dir: Path) -> None:
+        """
+        Publish a saved optimized model, then remove its staging folder.
+        The data file goes first, so a published model always finds its data.
+        """
+        try:
+            for path in reversed(self._entry_paths(key)):
+                staged = staging_dir / path.name
+                if staged.exists():
+                    os.replace(staged, path)
+        finally:
+            self.discard(staging_dir)
+        logger.info("Saved optimized model to cache: %s", key)
+
+    def discard(self, staging_dir: Path) -> None:
+        """Remove a staging folder whose model was not published."""
+        shutil.rmtree(staging_dir, ignore_errors=True)
+
+    def evict(self, key: str) -> None:
+        """Remove a cache entry that failed to load."""
+        for path in self._entry_paths(key):
+            try:
+                path.unlink(missing_ok=True)
+            except OSError as e:
+                logger.warning("Failed to evict optimized model %s: %s", key, e)
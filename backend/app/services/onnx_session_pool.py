@@ -0,0 +1,398 @@
+import asyncio
+import logging
+import os
+import queue
+import threading
+import time
+from collections import deque
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Any, Iterator, Optional, Sequence
+
+import onnxruntime as ort
+
+from app.services.execution_providers import CPU_PROVIDER, provider_options
+from app.services.onnx_model_cache import OptimizedModelCache
+
+logger = logging.getLogger(__name__)
+
+# Time close() waits for borrowed sessions to be returned
+DEFAULT_CLOSE_TIMEOUT_SEC = 5.0
+
+_env_allocator_lock = threading.Lock()
+_env_allocator_registered = False
+
+
+def register_shared_cpu_allocator() -> None:
+    """
+    Register a process-wide CPU arena allocator with ONNX Runtime.
+
+    Sessions created with `session.use_env_allocators` draw their activation
+    buffers from this single arena instead of each growing their own. Weights
+    are not shared: every pooled session still loads its own copy.
+    """
+    global _env_allocator_registered
+    with _env_allocator_lock:
+        if _env_allocator_registered:
+            return
+        mem_info = ort.OrtMemoryInfo(
+            "Cpu", ort.OrtAllocatorType.ORT_ARENA_ALLOCATOR, 0, ort.OrtMemType.DEFAULT
+        )
+        ort.create_and_register_allocator(mem_info, ort.OrtArenaCfg(0, -1, -1, -1))
+        _env_allocator_registered = True
+
+
+def default_pool_size(thread_budget: int) -> int:
+    """Number of sessions for a thread budget: parallelism first, then threads."""
+    return max(1, min(4, thread_budget // 2))
+
+
+def default_thread_budget() -> int:
+    """CPU threads reserved for detector inference."""
+    return max(1, (os.cpu_count() or 2) // 2)
+
+
+class OnnxSessionPool:
+    """
+    Fixed-size pool of ONNX Runtime sessions for one model.
+
+    Callers borrow whichever session is free. The thread budget is split
+    across sessions so parallel runs do not oversubscribe the CPU. Each
+    session holds its own copy of the model weights.
+    """
+
+    def __init__(
+        self,
+        model_path: Path,
+        size: int = 1,
+        thread_budget: Optional[int] = None,
+        providers: Sequence[str] = (CPU_PROVIDER,),
+        async_run: bool = False,
+        cache_dir: Optional[Path] = None,
+    ):
+        """
+        Args:
+            model_path: Path to the ONNX model file.
+            size: Number of sessions in the pool (1-inf).
+            thread_budget: Total intra-op threads shared by all sessions.
+            providers: ONNX Runtime execution providers in priority order.
+            async_run: Prepare sessions for run_async. ONNX Runtime counts the
+                       calling thread in intra_op_num_threads, but async runs
+                       execute on the pool workers only, so one is added.
+            cache_dir: Folder for the optimized model cache, None to disable.
+                       Cached graphs skip optimization and memory-map weights.
+                       Only the CPU provider's graphs are serializable; other
+                       providers receive the folder for their own caches.
+
+        Raises:
+            ValueError: If parameters are invalid.
+        """
+        if size < 1:
+            raise ValueError("size must be at least 1.")
+
+        thread_budget = thread_budget or default_thread_budget()
+
+        self.size = size
+        self.providers = list(providers)
+        self.cache_dir = cache_dir
+        self.intra_op_num_threads = max(1, thread_budget // size) + int(async_run)
+
+        if size > 1:
+            register_shared_cpu_allocator()
+
+        load_start = time.perf_counter()
+        self._cache = (
+            OptimizedModelCache(cache_dir)
+            if cache_dir and self.providers == [CPU_PROVIDER]
+            else None
+        )
+        self._cache_key: Optional[str] = None
+        self.cache_status = "disabled"
+        if self._cache is not None:
+            self._cache_key = self._cache.key(
+                Path(model_path),
+                providers,
+                ort.GraphOptimizationLevel.ORT_ENABLE_ALL,
+            )
+
+        self.sessions: list[ort.InferenceSession] = [
+            self._create_session(model_path, providers) for _ in range(size)
+        ]
+        self.load_time_ms = (time.perf_counter() - load_start) * 1000
+
+        self._free: queue.Queue[Optional[ort.InferenceSession]] = queue.Queue()
+        for session in self.sessions:
+            self._free.put(session)
+
+        # Coroutines waiting in acquire_async() get sessions before the queue
+        self._async_lock = threading.Lock()
+        self._async_waiters: deque[asyncio.Future] = deque()
+
+        self._closed = False
+        self._stats_lock = threading.Lock()
+        self._started_at = time.perf_counter()
+        self._last_change = self._started_at
+        self._busy = 0
+        self._busy_time = 0.0
+        self._runs = 0
+        self._wait_total = 0.0
+        self._wait_max = 0.0
+
+        logger.info(
+            "ONNX session pool ready (%d sessions x %d threads on %s, "
+            "loaded in %.1f ms, optimized model cache: %s)",
+            size,
+            self.intra_op_num_threads,
+            self.providers[0],
+            self.load_time_ms,
+            self.cache_status,
+        )
+
+    @contextmanager
+    def acquire(self) -> Iterator[ort.InferenceSession]:
+        """
+        Borrow a free session, blocking until one is available.
+
+        Raises:
+            RuntimeError: If the pool has been closed.
+        """
+        start = time.perf_counter()
+        session = self._free.get()
+        if session is None or self._closed:
+            # Pass the session or shutdown sentinel on to close() and other waiters
+            self._free.put(session)
+            raise RuntimeError("Session pool has been closed")
+
+        self._checkout(start)
+        try:
+            yield session
+        finally:
+            self.release(session)
+
+    async def acquire_async(self) -> ort.InferenceSession:
+        """
+        Borrow a free session without blocking the event loop.
+        The session must be handed back with release().
+
+        Raises:
+            RuntimeError: If the pool has been closed.
+        """
+        start = time.perf_counter()
+        waiter: Optional[asyncio.Future] = None
+        with self._async_lock:
+            try:
+                session = self._free.get_nowait()
+            except queue.Empty:
+                waiter = asyncio.get_running_loop().create_future()
+                self._async_waiters.append(waiter)
+
+        if waiter is not None:
+            try:
+                session = await waiter
+            except asyncio.CancelledError:
+                # Cancelled after a session was already handed over
+                if waiter.done() and not waiter.cancelled() and waiter.result():
+                    self._hand_over(waiter.result())
+                raise
+
+        if session is None or self._closed:
+            self._free.put(session)
+            raise RuntimeError("Session pool has been closed")
+
+        self._checkout(start)
+        return session
+
+    def release(self, session: ort.InferenceSession) -> None:
+        """
+        Return a borrowed session to the pool. Safe to call from any thread.
+        """
+        with self._stats_lock:
+            self._set_busy(self._busy - 1)
+        self._hand_over(session)
+
+    def stats(self) -> dict[str, Any]:
+        """Return pool utilization and wait time metrics."""
+        with self._stats_lock:
+            self._set_busy(self._busy)
+            elapsed = self._last_change - self._started_at
+            return {
+                "sessions": self.size,
+                "intra_op_num_threads": self.intra_op_num_threads,
+                "execution_provider": self.providers[0],
+                "load_time_ms": self.load_time_ms,
+                "optimized_model_cache": self.cache_status,
+                "busy_sessions": self._busy,
+                "utilization": (
+                    self._busy_time / (elapsed * self.size) if elapsed > 0 else 0.0
+                ),
+                "runs": self._runs,
+                "avg_wait_ms": (
+                    self._wait_total / self._runs * 1000 if self._runs else 0.0
+                ),
+                "max_wait_ms": self._wait_max * 1000,
+            }
+
+    def close(self, timeout: float = DEFAULT_CLOSE_TIMEOUT_SEC) -> None:
+        """
+        Release all sessions. Safe to call multiple times.
+
+        Waits up to timeout seconds for borrowed sessions to be returned, so
+        sessions are destroyed here and not while the interpreter shuts down
+        with async run callbacks still in flight.
+        """
+        with self._async_lock:
+            if self._closed:
+                return
+            self._closed = True
+            waiters, self._async_waiters = self._async_waiters, deque()
+
+        for waiter in waiters:
+            waiter.get_loop().call_soon_threadsafe(self._resolve_waiter, waiter, None)
+
+        deadline = time.perf_counter() + timeout
+        reclaimed = 0
+        while reclaimed < self.size:
+            try:
+                session = self._free.get(
+                    timeout=max(0.0, deadline - time.perf_counter())
+                )
+            except queue.Empty:
+                logger.warning(
+                    "Closing session pool with %d sessions still busy",
+                    self.size - reclaimed,
+                )
+                break
+            if session is not None:
+                reclaimed += 1
+
+        self._free.put(None)
+        self.sessions = []
+
+    def _hand_over(self, session: Optional[ort.InferenceSession]) -> None:
+        """Give a free session to the oldest async waiter, or back to the queue."""
+        with self._async_lock:
+            while self._async_waiters and not self._closed:
+                waiter = self._async_waiters.popleft()
+                if not waiter.done():
+                    waiter.get_loop().call_soon_threadsafe(
+                        self._resolve_waiter, waiter, session
+                    )
+                    return
+            self._free.put(session)
+
+    def _resolve_waiter(
+        self, waiter: asyncio.Future, session: Optional[ort.InferenceSession]
+    ) -> None:
+        if waiter.done():
+            # Cancelled after the hand-over was scheduled
+            if session is not None:
+                self._hand_over(session)
+            return
+        waiter.set_result(session)
+
+    def _checkout(self, start: float) -> None:
+        """Record a borrowed session and the time spent waiting for it."""
+        waited = time.perf_counter() - start
+        with self._stats_lock:
+            self._set_busy(self._busy + 1)
+            self._runs += 1
+            self._wait_total += waited
+            self._wait_max = max(self._wait_max, waited)
+
+    def _set_busy(self, busy: int) -> None:
+        """Integrate busy time up to now, then set the busy session count."""
+        now = time.perf_counter()
+        self._busy_time += self._busy * (now - self._last_change)
+        self._last_change = now
+        self._busy = busy
+
+    def _create_session(
+        self, model_path: Path, providers: Sequence[str]
+    ) -> ort.InferenceSession:
+        """
+        Create one pooled session, from the optimized model cache when possible.
+        The first session created on a cache miss writes the cache entry.
+        """
+        if self._cache is not None and self._cache_key is not None:
+            cached_path = self._cache.lookup(self._cache_key)
+            if cached_path is not None:
+                try:
+                    session = self._new_session(
+                        cached_path,
+                        providers,
+                        ort.GraphOptimizationLevel.ORT_DISABLE_ALL,  # already optimized
+                    )
+                except Exception as e:
+                    logger.warning(
+                        "Discarding unreadable optimized model %s: %s",
+                        cached_path,
+                        e,
+                    )
+                    self._cache.evict(self._cache_key)
+                else:
+                    if self.cache_status == "disabled":
+                        self.cache_status = "hit"
+                    return session
+
+            sess_opts = self._session_options(
+                ort.GraphOptimizationLevel.ORT_ENABLE_ALL
+            )
+            try:
+                staging_dir = self._cache.prepare_save(sess_opts, self._cache_key)
+            except OSError as e:
+                logger.warning("Optimized model cache unavailable: %s", e)
+                self._cache = None
+            else:
+                try:
+                    session = ort.InferenceSession(
+                        str(model_path),
+                        sess_options=sess_opts,
+                        providers=self._provider_options(providers),
+                    )
+                except Exception:
+                    self._cache.discard(staging_dir)
+                    raise
+                try:
+                    self._cache.commit(self._cache_key, staging_dir)
+                except OSError as e:
+                    logger.warning("Failed to save optimized model: %s", e)
+                self.cache_status = "miss"
+                return session
+
+        return self._new_session(
+            model_path, providers, ort.GraphOptimizationLevel.ORT_ENABLE_ALL
+        )
+
+    def _new_session(
+        self,
+        model_path: Path,
+        providers: Sequence[str],
+        optimization_level: ort.GraphOptimizationLevel,
+    ) -> ort.InferenceSession:
+        return ort.InferenceSession(
+            str(model_path),
+            sess_options=self._session_options(optimization_level),
+            providers=self._provider_options(providers),
+        )
+
+    def _provider_options(
+        self, providers: Sequence[str]
+    ) -> list[tuple[str, dict[str, Any]]]:
+        return [
+            (p, provider_options(p, self.intra_op_num_threads, self.cache_dir))
+            for p in providers
+        ]
+
+    def _session_options(
+        self, optimization_level: ort.GraphOptimizationLevel
+    ) -> ort.SessionOptions:
+        sess_opts = ort.SessionOptions()
+        sess_opts.graph_optimization_level = optimization_level
+        sess_opts.intra_op_num_threads = self.intra_op_num_threads
+
+        if self.size > 1:
+            # Sessions run side by side: share one activation arena, don't busy-wait
+            sess_opts.add_session_config_entry("session.use_env_allocators", "1")
+            sess_opts.add_session_config_entry("session.intra_op.allow_spinning", "0")
+
+        return sess_opts
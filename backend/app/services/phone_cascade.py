@@ -0,0 +1,252 @@
+import logging
+import threading
+import time
+from typing import Any, Optional
+
+import numpy as np
+
+from app.services.object_detector import (
+    ESSENTIAL_CLASSES,
+    Detections,
+    ObjectDetector,
+)
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_GATE_INPUT_SIZE = 224
+DEFAULT_GATE_THRESHOLD = 0.15
+
+
+class PhoneCascadeDetector(ObjectDetector):
+    """
+    Two-stage object detector with a cheap phone presence gate.
+
+    The gate stage runs a low-resolution detector pass (the full detector at a
+    small input size, or a dedicated small model) and the full detector only
+    runs on frames where the gate sees an essential object above its threshold.
+    Callers bypass the gate with gate=False (safety samples, objects already in
+    view), which skips the gate stage. With gate_sample=True a bypassed frame
+    still runs the gate, so the phones it would have missed can be counted.
+    """
+
+    def __init__(
+        self,
+        detector: ObjectDetector,
+        gate_detector: Optional[ObjectDetector] = None,
+        gate_input_size: int = DEFAULT_GATE_INPUT_SIZE,
+        gate_threshold: float = DEFAULT_GATE_THRESHOLD,
+    ):
+        """
+        Args:
+            detector: Full detector of the second stage.
+            gate_detector: Detector of the first stage (default: detector, run
+                           at gate_input_size; needs a dynamic-shape model).
+            gate_input_size: Model input size of the gate stage (multiple of 32).
+            gate_threshold: Essential object confidence that opens the gate (0-1).
+
+        Raises:
+            ValueError: If parameters are invalid.
+        """
+        if gate_input_size <= 0:
+            raise ValueError("gate_input_size must be positive.")
+        if not 0.0 <= gate_threshold <= 1.0:
+            raise ValueError("gate_threshold must be between 0 and 1.")
+
+        self._detector = detector
+        self._gate_detector = gate_detector or detector
+        self.gate_input_size = gate_input_size
+        self.gate_threshold = gate_threshold
+
+        self._stats_lock = threading.Lock()
+        self._calls = 0
+        self._gate_runs = 0
+        self._gate_passes = 0
+        self._bypassed_runs = 0
+        self._bypassed_phones = 0
+        self._missed_phones = 0
+        self._gate_time = 0.0
+        self._detector_runs = 0
+        self._detector_time = 0.0
+
+        logger.info(
+            "Phone cascade enabled (gate %s at %d, threshold %.2f)",
+            "shared detector" if gate_detector is None else "model",
+            gate_input_size,
+            gate_threshold,
+        )
+
+    def detect(
+        self,
+        img: np.ndarray,
+        normalize: bool = True,
+        conf_threshold: float = 0.3,
+        iou_threshold: float = 0.5,
+        input_size: Optional[int] = None,
+        gate: bool = True,
+        gate_sample: bool = False,
+    ) -> Detections:
+        """
+        Detect objects in an image, skipping the full detector when the gate
+        sees no essential object.
+
+        Args:
+            See ObjectDetector.detect().
+            gate: Whether the gate may skip the full detector. When False the
+                  frame always reaches the full detector and the gate stage
+                  is skipped.
+            gate_sample: Run the gate on a bypassed frame anyway, to count
+                         the phones it would have missed.
+        """
+        gate_open, gate_time = None, None
+        if gate or gate_sample:
+            start = time.perf_counter()
+            gate_open = self._gate_open(
+                self._gate_detector.detect(img, **self._gate_kwargs())
+            )
+            gate_time = time.perf_counter() - start
+
+        if gate and not gate_open:
+            self._record(gate_time, gate_open, gate)
+            return Detections.empty()
+
+        start = time.perf_counter()
+        detections = self._detector.detect(
+            img,
+            normalize=normalize,
+            conf_threshold=conf_threshold,
+            iou_threshold=iou_threshold,
+            input_size=input_size,
+        )
+        self._record(
+            gate_time, gate_open, gate, time.perf_counter() - start, detections
+        )
+        return detections
+
+    async def detect_async(
+        self,
+        img: np.ndarray,
+        normalize: bool = True,
+        conf_threshold: float = 0.3,
+        iou_threshold: float = 0.5,
+        input_size: Optional[int] = None,
+        gate: bool = True,
+        gate_sample: bool = False,
+    ) -> Detections:
+        """
+        Detect objects in an image without blocking a thread on either stage.
+
+        Args:
+            See detect().
+        """
+        gate_open, gate_time = None, None
+        if gate or gate_sample:
+            start = time.perf_counter()
+            gate_open = self._gate_open(
+                await self._gate_detector.detect_async(img, **self._gate_kwargs())
+            )
+            gate_time = time.perf_counter() - start
+
+        if gate and not gate_open:
+            self._record(gate_time, gate_open, gate)
+            return Detections.empty()
+
+        start = time.perf_counter()
+        detections = await self._detector.detect_async(
+            img,
+            normalize=normalize,
+            conf_threshold=conf_threshold,
+            iou_threshold=iou_threshold,
+            input_size=input_size,
+        )
+        self._record(
+            gate_time, gate_open, gate, time.perf_counter() - start, detections
+        )
+        return detections
+
+    def stats(self) -> dict[str, Any]:
+        """
+        Return gate hit and miss rates and the estimated compute saved, merged
+        with the full detector's metrics.
+
+        Compute saved compares the time spent in both stages with running the
+        full detector on every frame, at the measured average run times.
+        Missed phones are counted on bypassed frames sampled with gate_sample.
+        """
+        with self._stats_lock:
+            runs = self._gate_runs
+            avg_gate_ms = self._gate_time / runs * 1000 if runs else 0.0
+            avg_detector_ms = (
+                self._detector_time / self._detector_runs * 1000
+                if self._detector_runs
+                else 0.0
+            )
+            baseline_ms = self._calls * avg_detector_ms
+            spent_ms = (self._gate_time + self._detector_time) * 1000
+            gate_stats = {
+                "gate_threshold": self.gate_threshold,
+                "gate_runs": runs,
+                "gate_hit_rate": self._gate_passes / runs if runs else 0.0,
+                "gate_miss_rate": (runs - self._gate_passes) / runs if runs else 0.0,
+                "gate_bypassed_runs": self._bypassed_runs,
+                "gate_missed_phone_rate": (
+                    self._missed_phones / self._bypassed_phones
+                    if self._bypassed_phones
+                    else 0.0
+                ),
+                "avg_gate_ms": avg_gate_ms,
+                "avg_detector_ms": avg_detector_ms,
+                "compute_saved_ms": baseline_ms - spent_ms,
+                "compute_saved_ratio": (
+                    (baseline_ms - spent_ms) / baseline_ms if baseline_ms else 0.0
+                ),
+            }
+        return {**self._detector.stats(), **gate_stats}
+
+    def close(self) -> None:
+        """
+        Close the gate detector, if dedicated, and the full detector.
+        """
+        if self._gate_detector is not self._detector:
+            self._gate_detector.close()
+        self._detector.close()
+
+    def _gate_kwargs(self) -> dict[str, Any]:
+        return {
+            "normalize": False,
+            "conf_threshold": self.gate_threshold,
+            "input_size": self.gate_input_size,
+        }
+
+    @staticmethod
+    def _gate_open(detections: Detections) -> bool:
+        return bool(np.isin(detections.class_ids, ESSENTIAL_CLASSES).any())
+
+    def _record(
+        self,
+        gate_time: Optional[float],
+        gate_open: Optional[bool],
+        gated: bool,
+        detector_time: Optional[float] = None,
+        detections: Optional[Detections] = None,
+    ) -> None:
+        """Record one detect call. gate_time is None when the gate did not run."""
+        with self._stats_lock:
+            self._calls += 1
+            if gate_time is not None:
+                self._gate_runs += 1
+                self._gate_time += gate_time
+                self._gate_passes += int(bool(gate_open))
+
+            if detector_time is not None:
+                self._detector_runs += 1
+                self._detector_time += detector_time
+
+            if not gated:
+                self._bypassed_runs += 1
+                if (
+                    gate_open is not None
+                    and detections is not None
+                    and np.isin(detections.class_ids, ESSENTIAL_CLASSES).any()
+                ):
+                    self._bypassed_phones += 1
+                    self._missed_phones += int(not gate_open)
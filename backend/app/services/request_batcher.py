@@ -0,0 +1,227 @@
+import logging
+import queue
+import threading
+import time
+from concurrent.futures import Future
+from dataclasses import dataclass, field
+from typing import Callable, Generic, Optional, TypeVar
+
+logger = logging.getLogger(__name__)
+
+T = TypeVar("T")
+
+
+@dataclass
+class BatchRequest(Generic[T]):
+    item: T
+    future: Future = field(default_factory=Future)
+
+
+class RequestBatcher(Generic[T]):
+    """
+    Collects requests submitted concurrently by different callers into batches.
+
+    A single collector thread forms the batches and hands each one to a free
+    worker. The first request of a batch waits at most `max_wait_ms` for others
+    (or until `max_batch_size` are queued). While every worker is busy, requests
+    keep queueing and the next batch takes all of them, so load never splits
+    into batches of one. Each caller waits only on its own future.
+    """
+
+    def __init__(
+        self,
+        run_batch: Callable[[list[BatchRequest[T]]], None],
+        max_batch_size: int,
+        max_wait_ms: float,
+        num_workers: int,
+        name: str,
+        closed_message: str,
+    ):
+        """
+        Args:
+            run_batch: Runs a batch and resolves the future of each request.
+                       Requests cancelled while queued are left out.
+            max_batch_size: Maximum number of requests per batch (1-inf).
+            max_wait_ms: Maximum time the first request of a batch waits for others (0-inf).
+            num_workers: Number of batches in flight (1-inf).
+            name: Prefix of the thread names.
+            closed_message: Error for requests submitted after close().
+
+        Raises:
+            ValueError: If parameters are invalid.
+        """
+        if max_batch_size < 1:
+            raise ValueError("max_batch_size must be at least 1.")
+        if max_wait_ms < 0:
+            raise ValueError("max_wait_ms must be non-negative.")
+        if num_workers < 1:
+            raise ValueError("num_workers must be at least 1.")
+
+        self._run_batch = run_batch
+        self.max_batch_size = max_batch_size
+        self.max_wait_sec = max_wait_ms / 1000.0
+        self.name = name
+        self._closed_message = closed_message
+
+        self._queue: queue.Queue[Optional[BatchRequest[T]]] = queue.Queue()
+        self._batch_queue: queue.Queue[Optional[list[BatchRequest[T]]]] = queue.Queue()
+        self._lock = threading.Lock()
+        self._closed = False
+
+        self._stats_lock = threading.Lock()
+        self._batches = 0
+        self._requests = 0
+
+        self._free_workers = threading.Semaphore(num_workers)
+        self._collector = threading.Thread(
+            target=self._run_collector, name=f"{name}-collector", daemon=True
+        )
+        self._workers = [
+            threading.Thread(target=self._run_worker, name=f"{name}-{i}", daemon=True)
+            for i in range(num_workers)
+        ]
+        for worker in self._workers:
+            worker.start()
+        self._collector.start()
+
+    @property
+    def closed(self) -> bool:
+        return self._closed
+
+    @property
+    def num_workers(self) -> int:
+        return len(self._workers)
+
+    @property
+    def batches(self) -> int:
+        return self._batches
+
+    @property
+    def requests(self) -> int:
+        return self._requests
+
+    @property
+    def avg_batch_size(self) -> float:
+        return self._requests / self._batches if self._batches else 0.0
+
+    @property
+    def queued(self) -> int:
+        return self._queue.qsize()
+
+    def submit(self, item: T) -> Future:
+        """
+        Queue an item for the next batch.
+
+        Raises:
+            RuntimeError: If the batcher has been closed.
+        """
+        request = BatchRequest(item)
+
+        with self._lock:
+            if self._closed:
+                raise RuntimeError(self._closed_message)
+            self._queue.put(request)
+
+        return request.future
+
+    def close(self) -> None:
+        """
+        Run the batches already collected, stop the threads and reject the
+        requests still queued. Safe to call multiple times.
+        """
+        with self._lock:
+            if self._closed:
+                return
+            self._closed = True
+            self._queue.put(None)
+
+        # The collector stops the workers once its last batch is handed over
+        self._collector.join()
+        for worker in self._workers:
+            worker.join()
+        self._fail_pending()
+
+    def _run_collector(self) -> None:
+        while True:
+            # Only start a batch once a worker can run it; meanwhile requests queue
+            self._free_workers.acquire()
+            first = self._queue.get()
+            if first is None:
+                break
+
+            batch, stop = self._collect(first)
+            self._batch_queue.put(batch)
+
+            if stop:
+                break
+
+        for _ in self._workers:
+            self._batch_queue.put(None)
+
+    def _run_worker(self) -> None:
+        while True:
+            batch = self._batch_queue.get()
+            if batch is None:
+                break
+            try:
+                self._dispatch(batch)
+            finally:
+                self._free_workers.release()
+
+    def _collect(self, first: BatchRequest[T]) -> tuple[list[BatchRequest[T]], bool]:
+        """
+        Collect requests until the batch is full or the wait window elapses.
+        Requests that queued while the workers were busy join without waiting.
+        """
+        batch = [first]
+        deadline = time.perf_counter() + self.max_wait_sec
+
+        while len(batch) < self.max_batch_size:
+            remaining = deadline - time.perf_counter()
+            try:
+                request = (
+                    self._queue.get(timeout=remaining)
+                    if remaining > 0
+                    else self._queue.get_nowait()
+                )
+            except queue.Empty:
+                break
+
+            if request is None:
+                return batch, True
+            batch.append(request)
+
+        return batch, False
+
+    def _dispatch(self, batch: list[BatchRequest[T]]) -> None:
+        """Run a batch, making sure every caller gets a result or an error."""
+        # Skip requests whose caller stopped waiting
+        requests = [r for r in batch if r.future.set_running_or_notify_cancel()]
+        if not requests:
+            return
+
+        try:
+            self._run_batch(requests)
+        except Exception:
+            logger.exception("%s batch failed", self.name)
+        finally:
+            for request in requests:
+                if not request.future.done():
+                    request.future.set_exception(
+                        RuntimeError(f"{self.name} batch failed unexpectedly")
+                    )
+
+        # Count the requests that ran, not the ones cancelled while queued
+        with self._stats_lock:
+            self._batches += 1
+            self._requests += len(requests)
+
+    def _fail_pending(self) -> None:
+        """Reject requests that were still queued when the workers stopped."""
+        while True:
+            try:
+                request = self._queue.get_nowait()
+            except queue.Empty:
+                return
+            if request is not None and request.future.set_running_or_notify_cancel():
+                request.future.set_exception(RuntimeError(self._closed_message))
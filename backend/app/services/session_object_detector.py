@@ -0,0 +1,312 @@
+from __future__ import annotations
+
+import logging
+from typing import Any, Optional
+
+import numpy as np
+
+from app.core.config import settings
+from app.services.box_tracker import BoxTracker
+from app.services.face_landmarker import FaceLandmarks
+from app.services.object_detector import Detections, ObjectDetector
+from app.services.phone_cascade import PhoneCascadeDetector
+from app.services.utils.image_utils import crop_image
+
+logger = logging.getLogger(__name__)
+
+# Face-anchored ROI expansion, in multiples of the face box width/height.
+# The region reaches down and out to cover hands held at the ear or chest.
+ROI_EXPAND_SIDE = 1.0
+ROI_EXPAND_TOP = 0.5
+ROI_EXPAND_BOTTOM = 1.5
+
+# Expansion of previous detections kept inside the ROI (fraction of their size)
+DETECTION_EXPAND = 0.25
+
+# Above this fraction of the frame area an ROI crop saves nothing
+MAX_ROI_AREA_RATIO = 0.6
+
+NormalizedBox = tuple[float, float, float, float]
+
+
+def landmarks_bbox(face_landmarks: FaceLandmarks) -> NormalizedBox:
+    """
+    Compute the normalized (x1, y1, x2, y2) bounding box of face landmarks.
+    """
+    x1, y1 = face_landmarks.min(axis=0).tolist()
+    x2, y2 = face_landmarks.max(axis=0).tolist()
+    return x1, y1, x2, y2
+
+
+def expand_box(
+    box: NormalizedBox, side: float, top: float, bottom: float
+) -> NormalizedBox:
+    """
+    Expand a normalized box by multiples of its size and clip it to the frame.
+    """
+    x1, y1, x2, y2 = box
+    bw, bh = x2 - x1, y2 - y1
+    return (
+        max(0.0, x1 - side * bw),
+        max(0.0, y1 - top * bh),
+        min(1.0, x2 + side * bw),
+        min(1.0, y2 + bottom * bh),
+    )
+
+
+def union_box(a: NormalizedBox, b: NormalizedBox) -> NormalizedBox:
+    return min(a[0], b[0]), min(a[1], b[1]), max(a[2], b[2]), max(a[3], b[3])
+
+
+class SessionObjectDetector:
+    """
+    Per-session object detection front-end over the shared object detector.
+
+    With face_roi enabled, detection runs on a crop anchored on the driver's face
+    (current landmarks or the last known face box) at a smaller input size, and
+    boxes are mapped back to full-frame normalized coordinates. A full-frame scan
+    runs every full_frame_interval detector runs so phones outside the region are
+    caught.
+
+    With a cadence above 1, the detector only runs every cadence-th frame and a
+    box tracker predicts detections for the frames in between, so downstream
+    metrics still receive per-frame input.
+
+    Over a PhoneCascadeDetector, the presence gate may skip the full detector
+    unless objects were seen on the last frame, and every gate_safety_interval-th
+    detector run is an ungated safety sample.
+    """
+
+    DEFAULT_MAX_FACE_MISSING_FRAMES = 5
+
+    def __init__(
+        self,
+        object_detector: ObjectDetector,
+        face_roi: bool = settings.detector_face_roi,
+        roi_input_size: int = settings.detector_roi_input_size,
+        full_frame_interval: int = settings.detector_full_frame_interval,
+        cadence: int = settings.detector_cadence,
+        max_face_missing_frames: int = DEFAULT_MAX_FACE_MISSING_FRAMES,
+        gate_safety_interval: int = settings.detector_gate_safety_interval,
+    ):
+        """
+        Args:
+            object_detector: Shared object detector.
+            face_roi: Whether to detect on a face-anchored region of interest.
+            roi_input_size: Model input size for ROI crops (multiple of 32).
+            full_frame_interval: Run a full-frame scan every N detector runs (1-inf).
+            cadence: Run the detector every N frames and track in between (1-inf).
+            max_face_missing_frames: Detector runs the last face box is reused for (0-inf).
+            gate_safety_interval: Bypass the phone presence gate every N detector
+                                  runs (1-inf).
+        """
+
+        # Validate inputs
+        if roi_input_size <= 0:
+            raise ValueError("roi_input_size must be positive.")
+        if full_frame_interval < 1:
+            raise ValueError("full_frame_interval must be at least 1.")
+        if cadence < 1:
+            raise ValueError("cadence must be at least 1.")
+        if max_face_missing_frames < 0:
+            raise ValueError("max_face_missing_frames must be non-negative.")
+        if gate_safety_interval < 1:
+            raise ValueError("gate_safety_interval must be at least 1.")
+
+        self.object_detector = object_detector
+        self.face_roi = face_roi
+        self.roi_input_size = roi_input_size
+        self.full_frame_interval = full_frame_interval
+        self.cadence = cadence
+        self.max_face_missing_frames = max_face_missing_frames
+        self.gate_safety_interval = gate_safety_interval
+        self._gated = isinstance(object_detector, PhoneCascadeDetector)
+
+        self._tracker = BoxTracker() if cadence > 1 else None
+
+        self._frame_index = 0
+        self._detector_runs = 0
+        self._face_box: Optional[NormalizedBox] = None
+        self._face_missing_frames = 0
+        self._last_detections = Detections.empty()
+
+        self.roi_frames = 0
+        self.full_frames = 0
+        self.tracked_frames = 0
+
+    def detect(
+        self,
+        img: np.ndarray,
+        face_landmarks: Optional[FaceLandmarks] = None,
+    ) -> Detections:
+        """
+        Detect objects in a frame.
+
+        Args:
+            img: BGR frame.
+            face_landmarks: Normalized face landmarks of this frame, if any.
+
+        Returns:
+            Detections of the frame with normalized bounding boxes.
+        """
+        if self._next_frame_is_tracked():
+            return self._predict()
+
+        roi = self._next_region(face_landmarks)
+        crop, offset, kwargs = self._detector_input(img, roi)
+        return self._finish(
+            img.shape[:2], offset, self.object_detector.detect(crop, **kwargs)
+        )
+
+    async def detect_async(
+        self,
+        img: np.ndarray,
+        face_landmarks: Optional[FaceLandmarks] = None,
+    ) -> Detections:
+        """
+        Detect objects in a frame without blocking a thread on the detector.
+
+        Args:
+            See detect().
+
+        Returns:
+            Detections of the frame with normalized bounding boxes.
+        """
+        if self._next_frame_is_tracked():
+            return self._predict()
+
+        roi = self._next_region(face_landmarks)
+        crop, offset, kwargs = self._detector_input(img, roi)
+        return self._finish(
+            img.shape[:2],
+            offset,
+            await self.object_detector.detect_async(crop, **kwargs),
+        )
+
+    def reset(self) -> None:
+        self._frame_index = 0
+        self._detector_runs = 0
+        if self._tracker is not None:
+            self._tracker.reset()
+        self._face_box = None
+        self._face_missing_frames = 0
+        self._last_detections = Detections.empty()
+
+    def _next_frame_is_tracked(self) -> bool:
+        """Advance one frame and return whether the tracker bridges it."""
+        self._frame_index += 1
+        return self._tracker is not None and bool(
+            (self._frame_index - 1) % self.cadence
+        )
+
+    def _predict(self) -> Detections:
+        """Bridge a frame between detector runs with tracker predictions."""
+        assert self._tracker is not None
+        detections = self._tracker.predict()
+        self.tracked_frames += 1
+        self._last_detections = detections
+        return detections
+
+    def _next_region(
+        self, face_landmarks: Optional[FaceLandmarks]
+    ) -> Optional[NormalizedBox]:
+        """Start a detector run and return its ROI, or None for the full frame."""
+        self._detector_runs += 1
+        return self._next_roi(face_landmarks) if self.face_roi else None
+
+    def _detector_input(
+        self, img: np.ndarray, roi: Optional[NormalizedBox]
+    ) -> tuple[np.ndarray, Optional[tuple[int, int]], dict[str, Any]]:
+        """
+        Return the detector input image, its pixel offset in the frame (None for
+        the full frame) and the detector arguments.
+        """
+        kwargs: dict[str, Any] = {}
+        if self._gated:
+            # Keep the full detector on while objects are in view. Safety
+            # samples still run the gate, to count the phones it misses.
+            safety_sample = self._detector_runs % self.gate_safety_interval == 0
+            kwargs["gate"] = not (len(self._last_detections) or safety_sample)
+            kwargs["gate_sample"] = safety_sample
+
+        if roi is None:
+            self.full_frames += 1
+            return img, None, {**kwargs, "normalize": True}
+
+        self.roi_frames += 1
+        h, w = img.shape[:2]
+        x1, y1 = int(roi[0] * w), int(roi[1] * h)
+        x2, y2 = max(x1 + 1, int(roi[2] * w)), max(y1 + 1, int(roi[3] * h))
+        return (
+            crop_image(img, x1, y1, x2, y2),
+            (x1, y1),
+            {**kwargs, "normalize": False, "input_size": self.roi_input_size},
+        )
+
+    def _finish(
+        self,
+        img_shape: tuple[int, int],
+        offset: Optional[tuple[int, int]],
+        detections: Detections,
+    ) -> Detections:
+        """Map ROI detections to the full frame and update the tracker."""
+        if offset is not None:
+            detections = self._map_roi_detections(detections, img_shape, offset)
+
+        if self._tracker is not None:
+            detections = self._tracker.update(detections)
+
+        self._last_detections = detections
+        return detections
+
+    def _next_roi(
+        self, face_landmarks: Optional[FaceLandmarks]
+    ) -> Optional[NormalizedBox]:
+        """Return the normalized ROI for this frame, or None for a full-frame scan."""
+        if face_landmarks is not None and len(face_landmarks):
+            self._face_box = landmarks_bbox(face_landmarks)
+            self._face_missing_frames = 0
+        elif self._face_box is not None:
+            self._face_missing_frames += 1
+            if self._face_missing_frames > self.max_face_missing_frames:
+                self._face_box = None
+
+        if self._face_box is None:
+            return None
+
+        # Periodic full-frame scan
+        if self._detector_runs % self.full_frame_interval == 0:
+            return None
+
+        roi = expand_box(
+            self._face_box, ROI_EXPAND_SIDE, ROI_EXPAND_TOP, ROI_EXPAND_BOTTOM
+        )
+
+        # Keep tracking objects that drifted out of the face region
+        for x1, y1, x2, y2 in self._last_detections.boxes.tolist():
+            roi = union_box(
+                roi,
+                expand_box(
+                    (x1, y1, x2, y2),
+                    DETECTION_EXPAND,
+                    DETECTION_EXPAND,
+                    DETECTION_EXPAND,
+                ),
+            )
+
+        if (roi[2] - roi[0]) * (roi[3] - roi[1]) > MAX_ROI_AREA_RATIO:
+            return None
+
+        return roi
+
+    @staticmethod
+    def _map_roi_detections(
+        detections: Detections,
+        img_shape: tuple[int, int],
+        offset: tuple[int, int],
+    ) -> Detections:
+        """Map pixel boxes of an ROI crop to full-frame normalized coordinates."""
+        h, w = img_shape
+        x1, y1 = offset
+        boxes = (detections.boxes + (x1, y1, x1, y1)) / (w, h, w, h)
+        return Detections(boxes, detections.confs, detections.class_ids)
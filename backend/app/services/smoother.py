@@ -2,6 +2,8 @@ from __future__ import annotations
 
 from typing import Optional, Sequence
 
+import numpy as np
+
 
 class _BaseSmoother:
     """
@@ -62,29 +64,29 @@ class ScalarSmoother(_BaseSmoother):
 
 class SequenceSmoother(_BaseSmoother):
     """
-    EMA smoother for fixed-length numeric sequences.
+    EMA smoother for fixed-length numeric sequences, computed on float64 arrays.
     """
 
     def __init__(self, alpha: float = 0.3, max_missing: int = 5):
         super().__init__(alpha, max_missing)
-        self._last_value: Optional[list[float]] = None
+        self._last_value: Optional[np.ndarray] = None
 
-    def update(self, new_value: Optional[Sequence[float]]) -> Optional[list[float]]:
+    def update(
+        self, new_value: Optional[Sequence[float] | np.ndarray]
+    ) -> Optional[np.ndarray]:
         if new_value is None:
             self._last_value = self._handle_missing(self._last_value)
             return self._last_value
 
         self._missing_count = 0
-        new_list = list(map(float, new_value))
+        new_array = np.array(new_value, dtype=np.float64)
 
-        if self._last_value is None or len(self._last_value) != len(new_list):
-            self._last_value = new_list
-            return new_list
+        if self._last_value is None or len(self._last_value) != len(new_array):
+            self._last_value = new_array
+            return new_array
 
-        smoothed = [
-            self.alpha * curr + (1 - self.alpha) * prev
-            for curr, prev in zip(new_list, self._last_value)
-        ]
+        # Returned arrays are not updated in place later
+        smoothed = self.alpha * new_array + (1 - self.alpha) * self._last_value
 
         self._last_value = smoothed
         return smoothed
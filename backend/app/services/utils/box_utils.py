@@ -0,0 +1,85 @@
+from typing import Optional
+
+import numpy as np
+
+
+def xywh_to_xyxy(boxes: np.ndarray) -> np.ndarray:
+    """
+    Convert bounding boxes from center xywh to corner xyxy format.
+
+    Args:
+        boxes: Array of shape (N, 4) as (cx, cy, w, h).
+
+    Returns:
+        New array of shape (N, 4) as (x1, y1, x2, y2).
+    """
+    half = boxes[:, 2:4] / 2
+    return np.concatenate((boxes[:, 0:2] - half, boxes[:, 0:2] + half), axis=1)
+
+
+def box_iou(box: np.ndarray, boxes: np.ndarray) -> np.ndarray:
+    """
+    Compute the intersection over union of one box against many.
+
+    Args:
+        box: Array of shape (4,) as (x1, y1, x2, y2).
+        boxes: Array of shape (N, 4) as (x1, y1, x2, y2).
+
+    Returns:
+        Array of shape (N,) with IoU values in the 0-1 range.
+    """
+    ix1 = np.maximum(box[0], boxes[:, 0])
+    iy1 = np.maximum(box[1], boxes[:, 1])
+    ix2 = np.minimum(box[2], boxes[:, 2])
+    iy2 = np.minimum(box[3], boxes[:, 3])
+
+    inter = np.clip(ix2 - ix1, 0, None) * np.clip(iy2 - iy1, 0, None)
+    area = (box[2] - box[0]) * (box[3] - box[1])
+    areas = (boxes[:, 2] - boxes[:, 0]) * (boxes[:, 3] - boxes[:, 1])
+    union = area + areas - inter
+
+    return np.divide(inter, union, out=np.zeros_like(inter), where=union > 0)
+
+
+def non_max_suppression(
+    boxes: np.ndarray,
+    scores: np.ndarray,
+    iou_threshold: float,
+    class_ids: Optional[np.ndarray] = None,
+) -> np.ndarray:
+    """
+    Greedy Non-Max Suppression (NMS) on xyxy boxes.
+
+    When class_ids is given, boxes are only suppressed by boxes of the same class
+    by offsetting each class into its own disjoint coordinate range.
+
+    Args:
+        boxes: Array of shape (N, 4) as (x1, y1, x2, y2).
+        scores: Array of shape (N,) with box confidences.
+        iou_threshold: Boxes overlapping a kept box above this IoU are dropped.
+        class_ids: Optional array of shape (N,) with class ids.
+
+    Returns:
+        Indices of kept boxes, sorted by descending score.
+    """
+    if len(boxes) == 0:
+        return np.empty(0, dtype=np.intp)
+
+    if class_ids is not None and len(np.unique(class_ids)) > 1:
+        offset = boxes.max() + 1
+        boxes = boxes + (class_ids * offset)[:, None]
+
+    order = np.argsort(scores)[::-1]
+    keep = np.empty(len(order), dtype=np.intp)
+    count = 0
+
+    while order.size:
+        i = order[0]
+        keep[count] = i
+        count += 1
+        if order.size == 1:
+            break
+        ious = box_iou(boxes[i], boxes[order[1:]])
+        order = order[1:][ious <= iou_threshold]
+
+    return keep[:count]
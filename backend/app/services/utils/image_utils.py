@@ -1,11 +1,41 @@
+import threading
+from typing import Any, Optional, Sequence
+
 import cv2
 import numpy as np
 
+LETTERBOX_COLOR: tuple[int, int, int] = (114, 114, 114)
+_INV_255 = np.float32(1.0 / 255.0)
+
+
+def letterbox_geometry(
+    w: int, h: int, new_w: int, new_h: int
+) -> tuple[float, tuple[int, int], tuple[int, int]]:
+    """
+    Compute the letterbox transform of a w x h image into a new_w x new_h canvas.
+
+    Returns:
+        scale: Scaling factor applied to original image.
+        size: Tuple of (width, height) of the resized image.
+        pad: Tuple of (pad_left, pad_top) applied to width and height.
+    """
+    # Compute scaling factor to fit image inside the canvas while preserving aspect ratio
+    scale = min(new_w / w, new_h / h)
+
+    # Compute new width and height after scaling
+    nw, nh = int(w * scale), int(h * scale)
+
+    # Padding is split evenly, any odd pixel goes to the right/bottom
+    pad_left = (new_w - nw) // 2
+    pad_top = (new_h - nh) // 2
+
+    return scale, (nw, nh), (pad_left, pad_top)
+
 
 def letterbox(
     img: np.ndarray,
     new_size: int,
-    color: tuple[int, int, int] = (114, 114, 114),
+    color: tuple[int, int, int] = LETTERBOX_COLOR,
 ) -> tuple[np.ndarray, float, tuple[int, int]]:
     """
     Resize image with unchanged aspect ratio using padding (letterboxing).
@@ -20,36 +50,272 @@ def letterbox(
         scale: Scaling factor applied to original image.
         pad: Tuple of (pad_left, pad_top) applied to width and height.
     """
+    if isinstance(img, FrameImage):
+        return img.letterboxed((new_size, new_size), color)
+
+    canvas = np.empty((new_size, new_size, img.shape[2]), dtype=img.dtype)
+    scale, pad = letterbox_into(img, canvas, color)
+    return canvas, scale, pad
+
+
+def letterbox_into(
+    img: np.ndarray,
+    canvas: np.ndarray,
+    color: tuple[int, int, int] = LETTERBOX_COLOR,
+) -> tuple[float, tuple[int, int]]:
+    """
+    Letterbox an image into a preallocated canvas without intermediate copies.
+
+    The image is resized straight into the canvas ROI and only the border
+    strips around it are painted with the padding color.
 
-    # Original image height and width
+    Args:
+        img: Input image as a NumPy array (H x W x C, BGR format).
+        canvas: Destination array (H' x W' x C) that defines the output geometry.
+        color: Padding color as RGB tuple. Default is gray (114,114,114).
+
+    Returns:
+        scale: Scaling factor applied to original image.
+        pad: Tuple of (pad_left, pad_top) applied to width and height.
+    """
     h, w = img.shape[:2]
+    new_h, new_w = canvas.shape[:2]
 
-    # Compute scaling factor to fit image inside new_size while preserving aspect ratio
-    scale = min(new_size / w, new_size / h)
+    scale, (nw, nh), (pad_left, pad_top) = letterbox_geometry(w, h, new_w, new_h)
 
-    # Compute new width and height after scaling
-    nw, nh = int(w * scale), int(h * scale)
+    # Paint the padding strips
+    canvas[:pad_top] = color
+    canvas[pad_top + nh :] = color
+    canvas[pad_top : pad_top + nh, :pad_left] = color
+    canvas[pad_top : pad_top + nh, pad_left + nw :] = color
+
+    # Resize directly into the ROI
+    roi = canvas[pad_top : pad_top + nh, pad_left : pad_left + nw]
+    if (nw, nh) == (w, h):
+        np.copyto(roi, img)
+    else:
+        resized = cv2.resize(img, (nw, nh), dst=roi, interpolation=cv2.INTER_LINEAR)
+        if resized is not roi:
+            np.copyto(roi, resized)
+
+    return scale, (pad_left, pad_top)
+
+
+def bgr_to_chw_float(img: np.ndarray, out: np.ndarray) -> np.ndarray:
+    """
+    Convert a BGR uint8 image (H x W x 3) into a normalized RGB CHW float32 array.
 
-    # Resize image to new width and height
-    resized = cv2.resize(img, (nw, nh), interpolation=cv2.INTER_LINEAR)
-
-    # Compute padding to make final image exactly new_size x new_size
-    pad_w = new_size - nw  # total width padding
-    pad_h = new_size - nh  # total height padding
-    pad_left = pad_w // 2  # pad on left side
-    pad_top = pad_h // 2  # pad on top side
-
-    # Apply padding using copyMakeBorder
-    # Arguments: image, top, bottom, left, right, border type, color
-    padded = cv2.copyMakeBorder(
-        resized,
-        pad_top,
-        pad_h - pad_top,
-        pad_left,
-        pad_w - pad_left,
-        cv2.BORDER_CONSTANT,
-        value=color,
+    Channel swap, transpose and scaling to [0, 1] happen in a single pass
+    that writes into `out`.
+    """
+    np.multiply(
+        img[:, :, ::-1].transpose(2, 0, 1),
+        _INV_255,
+        out=out,
+        dtype=np.float32,
+        casting="unsafe",
     )
+    return out
+
+
+class LetterboxPreprocessor:
+    """
+    Letterbox and tensor conversion into reusable buffers.
+
+    Buffers are kept per thread and per input geometry, so steady-state
+    preprocessing performs no frame-sized allocations.
+    """
+
+    def __init__(self, color: tuple[int, int, int] = LETTERBOX_COLOR):
+        self.color = color
+        self._local = threading.local()
+
+    def __call__(
+        self, imgs: Sequence[np.ndarray], size: tuple[int, int]
+    ) -> tuple[np.ndarray, list[tuple[float, tuple[int, int]]]]:
+        """
+        Letterbox and convert images into a [N, 3, H, W] float32 tensor.
+
+        Args:
+            imgs: BGR images to preprocess. FrameImages that were already
+                  letterboxed to this size are not letterboxed again.
+            size: Tuple of (width, height) of the model input.
+
+        Returns:
+            tensor: View into the reusable input tensor. Valid until the next
+                    call from the same thread.
+            transforms: Tuple of (scale, pad) for each image.
+        """
+        canvas, tensor = self._buffers(size, len(imgs))
+
+        transforms = []
+        for i, img in enumerate(imgs):
+            # Reuse, but don't fill, the frame cache: a cached canvas costs a
+            # frame-sized allocation where the reusable canvas costs none
+            cached = (
+                img.cached_letterbox(size, self.color)
+                if isinstance(img, FrameImage)
+                else None
+            )
+            if cached is not None:
+                letterboxed, scale, pad = cached
+                transforms.append((scale, pad))
+                bgr_to_chw_float(letterboxed, tensor[i])
+                continue
+            transforms.append(letterbox_into(img, canvas, self.color))
+            bgr_to_chw_float(canvas, tensor[i])
+
+        return tensor[: len(imgs)], transforms
+
+    def _buffers(
+        self, size: tuple[int, int], batch_size: int
+    ) -> tuple[np.ndarray, np.ndarray]:
+        """Return the canvas and a tensor with room for at least batch_size images."""
+        cache: dict[tuple[int, int], tuple[np.ndarray, np.ndarray]] | None = getattr(
+            self._local, "buffers", None
+        )
+        if cache is None:
+            cache = self._local.buffers = {}
+
+        w, h = size
+        buffers = cache.get(size)
+        if buffers is None or len(buffers[1]) < batch_size:
+            canvas = np.empty((h, w, 3), dtype=np.uint8)
+            tensor = np.empty((batch_size, 3, h, w), dtype=np.float32)
+            buffers = cache[size] = (canvas, tensor)
+
+        return buffers
+
+
+class FrameImage(np.ndarray):
+    """
+    BGR frame that computes each view derived from it at most once.
+
+    Stages receive it as a plain (H, W, 3) uint8 array. They ask for derived
+    views through to_rgb(), to_gray(), crop_image() and the letterbox
+    preprocessor. The first stage that needs a view computes it, and later
+    stages reuse it. Crops reuse the views their frame has already computed.
+    Frames are treated as immutable once created. Concurrent stages may race
+    to compute the same view, which at worst computes it twice.
+    """
+
+    def __new__(cls, bgr: np.ndarray) -> "FrameImage":
+        if isinstance(bgr, FrameImage):
+            return bgr
+        return np.asarray(bgr).view(cls)
+
+    def __array_finalize__(self, obj) -> None:
+        # Slices and arithmetic results start with their own empty cache
+        self._views: dict[Any, Any] = {}
+        self._parent: Optional[FrameImage] = None
+        self._origin = (0, 0)
+
+    @classmethod
+    def from_video_frame(
+        cls,
+        frame,
+        width: Optional[int] = None,
+        height: Optional[int] = None,
+        interpolation: Optional[str] = None,
+    ) -> "FrameImage":
+        """
+        Decode a PyAV video frame to BGR, scaling in the same libswscale pass.
+
+        Args:
+            frame: Decoded av.VideoFrame.
+            width: Output width (default: frame width).
+            height: Output height (default: frame height).
+            interpolation: libswscale scaling algorithm, e.g. "AREA"
+                           (default: bilinear).
+        """
+        return cls(
+            frame.to_ndarray(
+                width=width,
+                height=height,
+                format="bgr24",
+                interpolation=interpolation,
+            )
+        )
+
+    def rgb(self) -> np.ndarray:
+        """Contiguous RGB copy of the frame."""
+        rgb = self._views.get("rgb")
+        if rgb is None:
+            rgb = self._parent_view("rgb")
+            if rgb is None:
+                rgb = cv2.cvtColor(self, cv2.COLOR_BGR2RGB)
+            self._views["rgb"] = rgb
+        return rgb
+
+    def gray(self) -> np.ndarray:
+        """Grayscale copy of the frame."""
+        gray = self._views.get("gray")
+        if gray is None:
+            gray = self._parent_view("gray")
+            if gray is None:
+                gray = cv2.cvtColor(self, cv2.COLOR_BGR2GRAY)
+            self._views["gray"] = gray
+        return gray
+
+    def crop(self, x0: int, y0: int, x1: int, y1: int) -> "FrameImage":
+        """Pixel region [x0, x1) x [y0, y1) of the frame, without copying."""
+        region = FrameImage(np.asarray(self)[y0:y1, x0:x1])
+        region._parent = self
+        region._origin = (x0, y0)
+        return region
+
+    def letterboxed(
+        self, size: tuple[int, int], color: tuple[int, int, int] = LETTERBOX_COLOR
+    ) -> tuple[np.ndarray, float, tuple[int, int]]:
+        """
+        Letterbox the frame into a size canvas, see letterbox_into().
+
+        Returns:
+            canvas: Letterboxed BGR image, shared by all callers.
+            scale: Scaling factor applied to the frame.
+            pad: Tuple of (pad_left, pad_top) applied to width and height.
+        """
+        cached = self.cached_letterbox(size, color)
+        if cached is None:
+            w, h = size
+            canvas = np.empty((h, w, 3), dtype=np.uint8)
+            scale, pad = letterbox_into(np.asarray(self), canvas, color)
+            cached = self._views[("letterbox", size, color)] = (canvas, scale, pad)
+        return cached
+
+    def cached_letterbox(
+        self, size: tuple[int, int], color: tuple[int, int, int] = LETTERBOX_COLOR
+    ) -> Optional[tuple[np.ndarray, float, tuple[int, int]]]:
+        """The result of an earlier letterboxed() call, or None."""
+        return self._views.get(("letterbox", size, color))
+
+    def _parent_view(self, name: str) -> Optional[np.ndarray]:
+        """The region of a view the parent frame already has, or None."""
+        if self._parent is None:
+            return None
+        view = self._parent._views.get(name)
+        if view is None:
+            return None
+        (x0, y0), (h, w) = self._origin, self.shape[:2]
+        return np.ascontiguousarray(view[y0 : y0 + h, x0 : x0 + w])
+
+
+def to_rgb(img: np.ndarray) -> np.ndarray:
+    """RGB version of a BGR image, shared through the frame cache when possible."""
+    if isinstance(img, FrameImage):
+        return img.rgb()
+    return cv2.cvtColor(img, cv2.COLOR_BGR2RGB)
+
+
+def to_gray(img: np.ndarray) -> np.ndarray:
+    """Grayscale version of a BGR image, shared through the frame cache when possible."""
+    if isinstance(img, FrameImage):
+        return img.gray()
+    return cv2.cvtColor(img, cv2.COLOR_BGR2GRAY)
+
 
-    # Return padded image, scaling factor, and top-left padding
-    return padded, scale, (pad_left, pad_top)
+def crop_image(img: np.ndarray, x0: int, y0: int, x1: int, y1: int) -> np.ndarray:
+    """Pixel region [x0, x1) x [y0, y1) of an image, keeping the frame cache."""
+    if isinstance(img, FrameImage):
+        return img.crop(x0, y0, x1, y1)
+    return img[y0:y1, x0:x1]
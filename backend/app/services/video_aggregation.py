@@ -1,8 +1,13 @@
 from dataclasses import dataclass, field
 from typing import Any
 
+import numpy as np
+
 from app.models.video_upload import Resolution, VideoFrameAggregate, VideoFrameGroup
-from app.services.object_detector import ObjectDetection
+from app.services.object_detector import Detections, ObjectDetection
+
+# Best detection per unique box: (conf, bbox, class_id)
+DetectionEntry = tuple[float, list[float], int]
 
 
 @dataclass
@@ -12,12 +17,20 @@ class BucketAccumulator:
     end_sec: float
     frame_count: int = 0
     resolution: Resolution | None = None
-    landmarks_sum: list[float] | None = None
+    landmarks_sum: np.ndarray | None = None
     landmarks_count: int = 0
-    detections: dict[str, ObjectDetection] = field(default_factory=dict)
+    detections: dict[str, DetectionEntry] = field(default_factory=dict)
     metrics: list[dict[str, Any]] = field(default_factory=list)
     thumbnail_base64: str | None = None
 
+    def add_landmarks(self, landmarks: np.ndarray) -> None:
+        """Add a frame's flat landmark array to the bucket's running sum."""
+        if self.landmarks_sum is None or len(self.landmarks_sum) != len(landmarks):
+            self.landmarks_sum = np.zeros(len(landmarks))
+            self.landmarks_count = 0
+        self.landmarks_sum += landmarks
+        self.landmarks_count += 1
+
 
 def _is_int(value: Any) -> bool:
     return isinstance(value, int) and not isinstance(value, bool)
@@ -104,24 +117,29 @@ def aggregate_metrics(metrics_list: list[dict[str, Any]]) -> dict[str, Any] | No
 
 
 def update_detections(
-    unique: dict[str, ObjectDetection], detections: list[ObjectDetection]
+    unique: dict[str, DetectionEntry], detections: Detections
 ) -> None:
-    for detection in detections:
-        bbox_key = ",".join(f"{value:.3f}" for value in detection.bbox)
-        key = f"{detection.class_id}:{bbox_key}"
+    for bbox, conf, class_id in zip(
+        detections.boxes.tolist(),
+        detections.confs.tolist(),
+        detections.class_ids.tolist(),
+    ):
+        bbox_key = ",".join(f"{value:.3f}" for value in bbox)
+        key = f"{class_id}:{bbox_key}"
         existing = unique.get(key)
-        if not existing or detection.conf > existing.conf:
-            unique[key] = detection
+        if not existing or conf > existing[0]:
+            unique[key] = (conf, bbox, class_id)
 
 
 def finalize_bucket(bucket: BucketAccumulator) -> VideoFrameGroup:
     face_landmarks = None
-    if bucket.landmarks_sum and bucket.landmarks_count:
-        face_landmarks = [
-            value / bucket.landmarks_count for value in bucket.landmarks_sum
-        ]
+    if bucket.landmarks_sum is not None and bucket.landmarks_count:
+        face_landmarks = (bucket.landmarks_sum / bucket.landmarks_count).tolist()
 
-    object_detections = list(bucket.detections.values()) or None
+    object_detections = [
+        ObjectDetection.model_construct(bbox=bbox, conf=conf, class_id=class_id)
+        for conf, bbox, class_id in bucket.detections.values()
+    ] or None
     metrics = aggregate_metrics(bucket.metrics)
 
     aggregate = VideoFrameAggregate(
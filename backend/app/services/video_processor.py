@@ -6,28 +6,43 @@ import os
 import time
 from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime, timezone
+from typing import Optional
 
 import cv2
+import numpy as np
+from aiortc import RTCRtpReceiver
 from aiortc.mediastreams import MediaStreamError
 
 from app.core.config import settings
 from app.models.inference import InferenceData, Resolution
 from app.services.connection_manager import ConnectionManager
+from app.services.decode_gate import DEFAULT_TOLERANCE_SEC, install_decode_gate
 from app.services.face_landmarker import (
     FaceLandmarker,
+    FaceLandmarkResult,
+    FaceLandmarks,
     get_essential_landmarks,
 )
-from app.services.face_landmarks import ESSENTIAL_LANDMARKS
+from app.services.face_landmarker_pool import FaceLandmarkerPool
+from app.services.face_landmarks import ESSENTIAL_LANDMARK_INDICES
 from app.services.metrics.frame_context import FrameContext
 from app.services.metrics.metric_manager import MetricManager
-from app.services.object_detector import ObjectDetector
+from app.services.object_detector import Detections, ObjectDetector
+from app.services.session_object_detector import SessionObjectDetector
 from app.services.smoother import SequenceSmoother
+from app.services.utils.image_utils import FrameImage
 
 logger = logging.getLogger(__name__)
 
 TARGET_FPS = max(1, settings.target_fps)
 TARGET_INTERVAL_SEC = 1 / TARGET_FPS
+# Low-rate probing while no face is present
+PROBE_INTERVAL_SEC = (
+    max(TARGET_INTERVAL_SEC, 1 / settings.probe_fps) if settings.probe_fps > 0 else None
+)
 MAX_WIDTH = 480
+# libswscale scaling while decoding: faster than bilinear, without its aliasing
+DECODE_INTERPOLATION = "AREA"
 RENDER_LANDMARKS_FULL = False  # Option to render all landmarks or only essential ones
 MAX_DATA_CHANNEL_BUFFER = 1_000_000  # bytes
 
@@ -36,68 +51,183 @@ executor = ThreadPoolExecutor(max_workers=min(os.cpu_count() or 4, 4))
 atexit.register(executor.shutdown, wait=True)
 
 
-def process_video_frame(
+async def process_video_frame(
     timestamp: str,
     img_bgr,
+    media_timestamp_ms: Optional[int],
     face_landmarker: FaceLandmarker,
-    object_detector: ObjectDetector,
+    session_detector: SessionObjectDetector,
     metric_manager: MetricManager,
     smoother: SequenceSmoother,
-) -> InferenceData:
+    anchor_landmarks: Optional[FaceLandmarks] = None,
+    probing: bool = False,
+) -> tuple[InferenceData, FaceLandmarks]:
     """
     Process a single video frame.
+
+    Object detection is awaited without holding an executor thread and overlaps
+    landmark detection, so it is anchored on the previous frame's landmarks.
+    Landmarks are tracked on the frame's media timestamp in its stream.
+    Probe frames skip object detection but still run the full face landmarker,
+    which is the presence check: probing only lowers the rate of that work.
+    All stages share the views derived from the frame, see FrameImage.
+    Landmarks and metrics run on the executor, off the event loop.
+
+    Returns:
+        Inference data and the face landmarks of this frame.
     """
 
     h, w = img_bgr.shape[:2]
 
-    # Resize if needed
-    if w > MAX_WIDTH:
-        scale = MAX_WIDTH / w
-        w, h = int(w * scale), int(h * scale)
-        img_bgr = cv2.resize(img_bgr, (w, h))
+    # Resize if needed; live frames are already scaled while decoding
+    size = processing_size(w, h)
+    if size != (w, h):
+        w, h = size
+        img_bgr = cv2.resize(img_bgr, size)
+    img_bgr = FrameImage(img_bgr)
+
+    # Detect objects while landmarks are detected on the executor
+    detection = (
+        None
+        if probing
+        else asyncio.ensure_future(
+            session_detector.detect_async(img_bgr, anchor_landmarks)
+        )
+    )
 
     # Detect landmarks
-    face_landmarks = face_landmarker.detect(img_bgr)
-    essential_landmarks = get_essential_landmarks(face_landmarks, ESSENTIAL_LANDMARKS)
-    smoothed_landmarks = smoother.update(essential_landmarks)
-
-    # Detect objects
-    object_detections = object_detector.detect(img_bgr, normalize=True)
+    loop = asyncio.get_running_loop()
+    try:
+        landmark_result, smoothed_landmarks = await loop.run_in_executor(
+            executor,
+            functools.partial(
+                detect_landmarks,
+                img_bgr,
+                face_landmarker,
+                smoother,
+                media_timestamp_ms,
+            ),
+        )
+    except BaseException:
+        if detection is not None:
+            detection.cancel()
+        raise
+
+    object_detections = await detection if detection is not None else Detections.empty()
 
     # Update metrics
+    inference = await loop.run_in_executor(
+        executor,
+        functools.partial(
+            update_metrics,
+            timestamp,
+            (w, h),
+            landmark_result,
+            smoothed_landmarks,
+            object_detections,
+            metric_manager,
+            probing,
+        ),
+    )
+    return inference, landmark_result.landmarks
+
+
+def detect_landmarks(
+    img_bgr,
+    face_landmarker: FaceLandmarker,
+    smoother: SequenceSmoother,
+    media_timestamp_ms: Optional[int] = None,
+) -> tuple[FaceLandmarkResult, Optional[np.ndarray]]:
+    """
+    Detect face landmarks and smooth the essential ones.
+    """
+    result = face_landmarker.detect(img_bgr, media_timestamp_ms)
+    essential_landmarks = get_essential_landmarks(
+        result.landmarks, ESSENTIAL_LANDMARK_INDICES
+    )
+    return result, smoother.update(essential_landmarks)
+
+
+def update_metrics(
+    timestamp: str,
+    size: tuple[int, int],
+    landmark_result: FaceLandmarkResult,
+    smoothed_landmarks: Optional[np.ndarray],
+    object_detections: Detections,
+    metric_manager: MetricManager,
+    probing: bool,
+) -> InferenceData:
+    """
+    Update the session metrics with a frame's results and build its inference data.
+    """
     frame_context = FrameContext(
-        face_landmarks=face_landmarks, object_detections=object_detections
+        face_landmarks=landmark_result.landmarks,
+        face_transformation_matrix=landmark_result.transformation_matrix,
+        object_detections=object_detections,
     )
     metrics = metric_manager.update(frame_context)
 
+    w, h = size
     return InferenceData(
         timestamp=timestamp,
         resolution=Resolution(width=w, height=h),
         metrics=metrics,
-        face_landmarks=smoothed_landmarks,
-        object_detections=object_detections,
+        face_landmarks=(
+            smoothed_landmarks.tolist() if smoothed_landmarks is not None else None
+        ),
+        object_detections=object_detections.to_models(),
+        mode="probing" if probing else "active",
     )
 
 
+def processing_size(w: int, h: int) -> tuple[int, int]:
+    """Frame size for processing: at most MAX_WIDTH wide, same aspect ratio."""
+    if w <= MAX_WIDTH:
+        return w, h
+    scale = MAX_WIDTH / w
+    return int(w * scale), int(h * scale)
+
+
+def frame_timestamp_ms(frame) -> Optional[int]:
+    """Media timestamp of a received video frame, from its pts and time base."""
+    if frame.pts is None or frame.time_base is None:
+        return None
+    return int(frame.pts * frame.time_base * 1000)
+
+
 async def process_video_frames(
     client_id: str,
     track,
-    face_landmarker,
+    face_landmarker_pool: FaceLandmarkerPool,
     object_detector: ObjectDetector,
     connection_manager: ConnectionManager,
     stop_processing: asyncio.Event,
+    receiver: Optional[RTCRtpReceiver] = None,
 ) -> None:
     """
     Receive video frames from a WebRTC track, perform processing,
     and stream results back over the data channel.
+    The session leases its own face landmarker for the stream's lifetime.
+    With the track's receiver, frames that processing would skip are dropped
+    before decoding where the codec allows it.
     """
     frame_count = 0
     processed_frames = 0
+    probe_frames = 0
+    probing = False
     dropped_messages = 0
     start_time = time.perf_counter()
     last_process_time = 0.0
     metric_manager = MetricManager()
     smoother = SequenceSmoother(alpha=0.8, max_missing=5)
+    session_detector = SessionObjectDetector(object_detector)
+    face_landmarks: Optional[FaceLandmarks] = None
+    face_landmarker: Optional[FaceLandmarker] = None
+    decode_gate = (
+        install_decode_gate(receiver, TARGET_INTERVAL_SEC)
+        if receiver is not None and settings.decode_gate
+        else None
+    )
 
     data_channel_retries = 0
     MAX_DATA_CHANNEL_RETRIES = 10
@@ -132,6 +262,12 @@ async def process_video_frames(
                 pass
 
     try:
+        try:
+            face_landmarker = await face_landmarker_pool.acquire_async(client_id)
+        except RuntimeError as e:
+            logger.warning("No face landmarker for %s: %s", client_id, e)
+            return
+
         reader_task = asyncio.create_task(_read_frames())
         while True:
             if stop_processing.is_set():
@@ -149,7 +285,13 @@ async def process_video_frames(
                     continue
 
                 now = time.perf_counter()
-                if now - last_process_time < TARGET_INTERVAL_SEC:
+                interval = (
+                    PROBE_INTERVAL_SEC
+                    if probing and PROBE_INTERVAL_SEC is not None
+                    else TARGET_INTERVAL_SEC
+                )
+                # Arrival jitter must not skip frames the decode gate let through
+                if now - last_process_time < interval - DEFAULT_TOLERANCE_SEC:
                     continue
                 last_process_time = now
 
@@ -160,8 +302,15 @@ async def process_video_frames(
                 if connection_manager.processing_reset.get(client_id, False):
                     metric_manager = MetricManager()
                     smoother = SequenceSmoother(alpha=0.8, max_missing=5)
+                    session_detector.reset()
+                    face_landmarks = None
                     frame_count = 0
                     processed_frames = 0
+                    probe_frames = 0
+                    probing = False
+                    if decode_gate is not None:
+                        decode_gate.interval_sec = TARGET_INTERVAL_SEC
+                        decode_gate.reset()
                     start_time = time.perf_counter()
                     last_process_time = time.perf_counter()
                     connection_manager.processing_reset[client_id] = False
@@ -201,37 +350,45 @@ async def process_video_frames(
                 if connection_manager.consume_head_pose_recalibration(client_id):
                     metric_manager.reset_head_pose_baseline()
 
-                # Convert frame to numpy array
-                img = frame.to_ndarray(format="bgr24")
-                h, w = img.shape[:2]
+                # Convert and scale to the processing size in one swscale pass,
+                # so high-resolution senders cost no more than low-resolution ones
+                img = FrameImage.from_video_frame(
+                    frame,
+                    *processing_size(frame.width, frame.height),
+                    interpolation=DECODE_INTERPOLATION,
+                )
 
                 # Log first frame info
                 if frame_count == 1:
                     logger.info(
-                        "Client %s: Receiving %dx%d video",
+                        "Client %s: Receiving %dx%d video, processing at %dx%d",
                         client_id,
-                        w,
-                        h,
+                        frame.width,
+                        frame.height,
+                        img.shape[1],
+                        img.shape[0],
                     )
 
                 # Process frame
                 timestamp = datetime.now(timezone.utc).isoformat()
-                result = await asyncio.get_running_loop().run_in_executor(
-                    executor,
-                    functools.partial(
-                        process_video_frame,
-                        timestamp,
-                        img,
-                        face_landmarker,
-                        object_detector,
-                        metric_manager,
-                        smoother,
-                    ),
+                result, face_landmarks = await process_video_frame(
+                    timestamp,
+                    img,
+                    frame_timestamp_ms(frame),
+                    face_landmarker,
+                    session_detector,
+                    metric_manager,
+                    smoother,
+                    face_landmarks,
+                    probing,
                 )
 
                 # Send result
+                message = await asyncio.get_running_loop().run_in_executor(
+                    executor, result.model_dump_json
+                )
                 try:
-                    channel.send(result.model_dump_json())
+                    channel.send(message)
                 except Exception as e:
                     logger.info(
                         "Data channel send failed for %s: %s",
@@ -243,16 +400,40 @@ async def process_video_frames(
 
                 # Update counters
                 processed_frames += 1
+                probe_frames += int(probing)
+
+                # Probe at a low rate while no face is present
+                face_missing = bool(
+                    result.metrics and result.metrics.get("face_missing")
+                )
+                if PROBE_INTERVAL_SEC is not None and face_missing != probing:
+                    probing = face_missing
+                    if decode_gate is not None:
+                        decode_gate.interval_sec = (
+                            PROBE_INTERVAL_SEC if probing else TARGET_INTERVAL_SEC
+                        )
+                    if probing:
+                        logger.info(
+                            "Client %s: No face, probing at %.1f fps",
+                            client_id,
+                            1 / PROBE_INTERVAL_SEC,
+                        )
+                    else:
+                        logger.info("Client %s: Face found, full rate", client_id)
 
                 # Log FPS every 100 frames
                 if processed_frames % 100 == 0:
                     elapsed_sec = time.perf_counter() - start_time
                     fps = processed_frames / elapsed_sec if elapsed_sec > 0 else 0
                     logger.info(
-                        "Client %s: Processed %d frames (%.2f fps)",
+                        "Client %s: Processed %d frames (%.2f fps, %d probes, %s, "
+                        "%d dropped before decoding)",
                         client_id,
                         processed_frames,
                         fps,
+                        probe_frames,
+                        "probing" if probing else "active",
+                        decode_gate.dropped if decode_gate is not None else 0,
                     )
 
             except asyncio.CancelledError:
@@ -277,6 +458,9 @@ async def process_video_frames(
 
     finally:
         logger.info("Frame processing ended for %s", client_id)
+        # Only release a lease this stream holds, not a concurrent stream's
+        if face_landmarker is not None:
+            face_landmarker_pool.release(client_id)
         if reader_task:
             reader_task.cancel()
             try:
@@ -1,5 +1,6 @@
 import base64
 import logging
+import uuid
 from dataclasses import dataclass
 
 import cv2
@@ -10,12 +11,15 @@ from app.models.video_upload import (
     VideoFrameResult,
     VideoMetadata,
 )
-from app.services.face_landmarker import FaceLandmarker, get_essential_landmarks
-from app.services.face_landmarks import ESSENTIAL_LANDMARKS
+from app.services.face_landmarker import get_essential_landmarks
+from app.services.face_landmarker_pool import FaceLandmarkerPool
+from app.services.face_landmarks import ESSENTIAL_LANDMARK_INDICES
 from app.services.metrics.frame_context import FrameContext
 from app.services.metrics.metric_manager import MetricManager
 from app.services.object_detector import ObjectDetector
+from app.services.session_object_detector import SessionObjectDetector
 from app.services.smoother import SequenceSmoother
+from app.services.utils.image_utils import FrameImage
 from app.services.video_aggregation import (
     BucketAccumulator,
     finalize_bucket,
@@ -59,7 +63,7 @@ def process_uploaded_video(
     target_fps: int,
     max_duration_sec: float,
     group_interval_sec: float,
-    face_landmarker: FaceLandmarker,
+    face_landmarker_pool: FaceLandmarkerPool,
     object_detector: ObjectDetector,
     include_frames: bool = False,
 ) -> VideoProcessingResult:
@@ -84,6 +88,7 @@ def process_uploaded_video(
     metric_manager = MetricManager()
     metric_manager.reset()
     smoother = SequenceSmoother(alpha=0.8, max_missing=5)
+    session_detector = SessionObjectDetector(object_detector)
 
     frames: list[VideoFrameResult] | None = [] if include_frames else None
     groups: list[VideoFrameGroup] = []
@@ -100,6 +105,14 @@ def process_uploaded_video(
             groups.append(finalize_bucket(current_bucket))
             current_bucket = None
 
+    # Each upload leases its own landmarker, like a live session
+    lease_id = f"upload-{uuid.uuid4()}"
+    try:
+        face_landmarker = face_landmarker_pool.acquire(lease_id)
+    except RuntimeError:
+        cap.release()
+        raise
+
     try:
 
         while True:
@@ -133,20 +146,27 @@ def process_uploaded_video(
                 scale = MAX_WIDTH / w
                 w, h = int(w * scale), int(h * scale)
                 frame = cv2.resize(frame, (w, h))
+            # Landmarker and detector share the views derived from the frame
+            frame = FrameImage(frame)
 
-            face_landmarks = face_landmarker.detect(frame)
-            has_face = bool(face_landmarks)
+            landmark_result = face_landmarker.detect(
+                frame, int(timestamp_sec * 1000)
+            )
+            face_landmarks = landmark_result.landmarks
+            has_face = len(face_landmarks) > 0
             essential_landmarks = (
-                get_essential_landmarks(face_landmarks, ESSENTIAL_LANDMARKS)
+                get_essential_landmarks(face_landmarks, ESSENTIAL_LANDMARK_INDICES)
                 if has_face
                 else None
             )
             smoothed_landmarks = smoother.update(essential_landmarks)
 
-            object_detections = object_detector.detect(frame, normalize=True)
+            object_detections = session_detector.detect(frame, face_landmarks)
 
             frame_context = FrameContext(
-                face_landmarks=face_landmarks, object_detections=object_detections
+                face_landmarks=face_landmarks,
+                face_transformation_matrix=landmark_result.transformation_matrix,
+                object_detections=object_detections,
             )
             metrics = metric_manager.update(frame_context)
             has_alert = any(
@@ -157,7 +177,7 @@ def process_uploaded_video(
             )
             thumbnail_base64 = (
                 encode_frame_thumbnail(frame)
-                if has_alert and smoothed_landmarks
+                if has_alert and smoothed_landmarks is not None
                 else None
             )
 
@@ -176,17 +196,8 @@ def process_uploaded_video(
             if current_bucket.resolution is None:
                 current_bucket.resolution = Resolution(width=w, height=h)
 
-            if has_face and smoothed_landmarks:
-                if (
-                    current_bucket.landmarks_sum is None
-                    or len(current_bucket.landmarks_sum) != len(smoothed_landmarks)
-                ):
-                    current_bucket.landmarks_sum = [0.0] * len(smoothed_landmarks)
-                    current_bucket.landmarks_count = 0
-                if len(smoothed_landmarks) == len(current_bucket.landmarks_sum):
-                    for index, value in enumerate(smoothed_landmarks):
-                        current_bucket.landmarks_sum[index] += float(value)
-                    current_bucket.landmarks_count += 1
+            if has_face and smoothed_landmarks is not None:
+                current_bucket.add_landmarks(smoothed_landmarks)
 
             if object_detections:
                 update_detections(current_bucket.detections, object_detections)
@@ -203,8 +214,12 @@ def process_uploaded_video(
                         timestamp=format_timestamp(timestamp_sec),
                         frame_number=frame_number,
                         resolution=Resolution(width=w, height=h),
-                        face_landmarks=smoothed_landmarks if has_face else None,
-                        object_detections=object_detections or None,
+                        face_landmarks=(
+                            smoothed_landmarks.tolist()
+                            if has_face and smoothed_landmarks is not None
+                            else None
+                        ),
+                        object_detections=object_detections.to_models() or None,
                         metrics=metrics,
                         thumbnail_base64=thumbnail_base64,
                     )
@@ -218,6 +233,7 @@ def process_uploaded_video(
 
     finally:
         cap.release()
+        face_landmarker_pool.release(lease_id)
 
     flush_bucket()
 
@@ -0,0 +1,323 @@
+"""
+Micro-benchmarks for the object detector hot path.
+Only used for development; run from the backend folder:
+
+    python scripts/benchmark_detector.py
+"""
+
+import argparse
+import sys
+import time
+import tracemalloc
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from typing import Callable
+
+import cv2
+import numpy as np
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+from app.services.object_detector import (  # noqa: E402
+    DEFAULT_INPUT_SIZES,
+    ESSENTIAL_CLASSES,
+    MODEL_PATH,
+    NUM_BOX_COORDS,
+    Detections,
+    YoloObjectDetector,
+)
+from app.services.utils.box_utils import box_iou, xywh_to_xyxy  # noqa: E402
+from app.services.utils.image_utils import (  # noqa: E402
+    LetterboxPreprocessor,
+    letterbox_geometry,
+)
+
+
+def timeit(fn: Callable[[], object], iterations: int) -> float:
+    """Return the mean wall time of fn in milliseconds."""
+    fn()  # warm-up
+    start = time.perf_counter()
+    for _ in range(iterations):
+        fn()
+    return (time.perf_counter() - start) * 1000 / iterations
+
+
+def allocated_bytes(fn: Callable[[], object]) -> int:
+    """Return the peak traced allocation of a single call of fn."""
+    fn()  # warm-up, so cached buffers are not counted
+    tracemalloc.start()
+    fn()
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return peak
+
+
+def legacy_preprocess(img: np.ndarray, input_size: int) -> np.ndarray:
+    """Letterbox and preprocess as done before the reusable buffer path."""
+    h, w = img.shape[:2]
+    _, (nw, nh), (pad_left, pad_top) = letterbox_geometry(w, h, input_size, input_size)
+    resized = cv2.resize(img, (nw, nh), interpolation=cv2.INTER_LINEAR)
+    padded = cv2.copyMakeBorder(
+        resized,
+        pad_top,
+        input_size - nh - pad_top,
+        pad_left,
+        input_size - nw - pad_left,
+        cv2.BORDER_CONSTANT,
+        value=(114, 114, 114),
+    )
+    tensor = padded[:, :, ::-1].transpose(2, 0, 1)
+    tensor = np.ascontiguousarray(tensor, dtype=np.float32) / 255.0
+    return tensor[None]
+
+
+def bench_preprocess(args: argparse.Namespace) -> None:
+    img = np.random.randint(0, 256, (args.height, args.width, 3), dtype=np.uint8)
+    preprocessor = LetterboxPreprocessor()
+    size = (args.input_size, args.input_size)
+
+    new_tensor, _ = preprocessor([img], size)
+    max_err = float(np.abs(new_tensor - legacy_preprocess(img, args.input_size)).max())
+
+    rows = [
+        ("legacy", lambda: legacy_preprocess(img, args.input_size)),
+        ("buffered", lambda: preprocessor([img], size)),
+    ]
+
+    print(
+        f"\nPreprocess {args.width}x{args.height} -> {args.input_size} "
+        f"(max abs diff {max_err:.2e})"
+    )
+    for name, fn in rows:
+        ms = timeit(fn, args.iterations)
+        kib = allocated_bytes(fn) / 1024
+        print(f"  {name:<12} {ms:8.3f} ms/frame {kib:10.1f} KiB allocated/frame")
+
+
+def synthetic_output(
+    num_anchors: int, num_classes: int, num_objects: int, input_size: int
+) -> np.ndarray:
+    """Build a raw YOLOv8 output with background noise and clustered phone boxes."""
+    rng = np.random.default_rng(0)
+    output = np.empty((1, NUM_BOX_COORDS + num_classes, num_anchors), dtype=np.float32)
+    output[0, :2] = rng.uniform(0, input_size, (2, num_anchors))
+    output[0, 2:4] = rng.uniform(8, input_size / 4, (2, num_anchors))
+    output[0, NUM_BOX_COORDS:] = rng.uniform(0, 0.05, (num_classes, num_anchors))
+
+    # A few overlapping anchors per object so NMS has work to do
+    phone_row = NUM_BOX_COORDS + ESSENTIAL_CLASSES[0]
+    for _ in range(num_objects):
+        anchors = rng.choice(num_anchors, 8, replace=False)
+        center = rng.uniform(100, input_size - 100, 2)
+        output[0, 0:2, anchors] = center + rng.normal(0, 3, (8, 2))
+        output[0, 2:4, anchors] = 60 + rng.normal(0, 3, (8, 2))
+        output[0, phone_row, anchors] = rng.uniform(0.5, 0.9, 8)
+
+    return output
+
+
+def legacy_nms(
+    boxes: np.ndarray, scores: np.ndarray, class_ids: np.ndarray, iou_thres: float
+) -> np.ndarray:
+    """Per-class cv2 NMS as done before box_utils.non_max_suppression."""
+    keep_idxs = []
+    for cls in np.unique(class_ids):
+        cls_indices = np.flatnonzero(class_ids == cls)
+        keep = cv2.dnn.NMSBoxes(
+            boxes[cls_indices].tolist(), scores[cls_indices].tolist(), 0.0, iou_thres
+        )
+        keep_idxs.extend(cls_indices[np.array(keep, dtype=np.intp).flatten()])
+    return np.array(keep_idxs, dtype=np.intp)
+
+
+def legacy_postprocess(
+    output: np.ndarray,
+    orig_shape: tuple[int, int],
+    ratio: float,
+    pad: tuple[int, int],
+    conf_thres: float,
+    iou_thres: float,
+    normalize: bool = False,
+) -> Detections:
+    """Decode every class row and run per-class cv2 NMS on the original image."""
+    output = np.squeeze(output).T
+    scores = output[:, NUM_BOX_COORDS:]
+    class_ids = scores.argmax(axis=1)
+    confidences = scores[np.arange(scores.shape[0]), class_ids]
+
+    mask = (confidences >= conf_thres) & np.isin(class_ids, ESSENTIAL_CLASSES)
+    if not mask.any():
+        return Detections.empty()
+    boxes = xywh_to_xyxy(output[mask, :NUM_BOX_COORDS])
+    confidences, class_ids = confidences[mask], class_ids[mask]
+
+    boxes = YoloObjectDetector._undo_letterbox(boxes, orig_shape, ratio, pad, normalize)
+    keep = legacy_nms(boxes, confidences, class_ids, iou_thres)
+    return Detections(boxes[keep], confidences[keep], class_ids[keep])
+
+
+def bench_postprocess(args: argparse.Namespace) -> None:
+    output = synthetic_output(8400, 80, args.objects, args.input_size)
+    orig_shape = (args.height, args.width)
+    ratio = min(args.input_size / args.width, args.input_size / args.height)
+    pad = (
+        (args.input_size - int(args.width * ratio)) // 2,
+        (args.input_size - int(args.height * ratio)) // 2,
+    )
+    params = (orig_shape, ratio, pad, 0.3, 0.5, True)
+
+    rows = [
+        ("legacy", lambda: legacy_postprocess(output, *params)),
+        ("full", lambda: YoloObjectDetector._postprocess(output, *params)),
+        ("essential", lambda: YoloObjectDetector._postprocess_essential(output, *params)),
+        (
+            "+ pydantic",
+            lambda: YoloObjectDetector._postprocess_essential(output, *params).to_models(),
+        ),
+    ]
+
+    print(f"\nPostprocess [1, 84, 8400] with {args.objects} phones")
+    for name, fn in rows:
+        ms = timeit(fn, args.iterations)
+        print(f"  {name:<12} {ms:8.3f} ms/frame {len(fn()):4d} detections")
+
+
+def load_frames(args: argparse.Namespace) -> list[np.ndarray]:
+    """Load benchmark frames resized to --width x --height, or random noise."""
+    paths = sorted(Path(args.images).glob("*.[jp][pn]g")) if args.images else []
+    frames = [cv2.imread(str(path)) for path in paths]
+    frames = [
+        cv2.resize(frame, (args.width, args.height))
+        for frame in frames
+        if frame is not None
+    ]
+    if frames:
+        return frames
+
+    rng = np.random.default_rng(0)
+    return [
+        rng.integers(0, 256, (args.height, args.width, 3), dtype=np.uint8)
+        for _ in range(8)
+    ]
+
+
+def agreement(
+    reference: list[Detections], detections: list[Detections]
+) -> tuple[float, float]:
+    """
+    Compare detections against the 640x640 reference run.
+
+    Returns:
+        Fraction of reference boxes matched at IoU >= 0.5, and the mean absolute
+        confidence difference of the matched boxes.
+    """
+    matched, total, conf_diff = 0, 0, 0.0
+    for ref, dets in zip(reference, detections):
+        total += len(ref)
+        if not ref or not dets:
+            continue
+        for box, conf in zip(ref.boxes, ref.confs):
+            ious = box_iou(box, dets.boxes)
+            best = int(ious.argmax())
+            if ious[best] >= 0.5:
+                matched += 1
+                conf_diff += abs(float(dets.confs[best] - conf))
+
+    recall = matched / total if total else 1.0
+    return recall, conf_diff / matched if matched else 0.0
+
+
+def bench_input_shapes(args: argparse.Namespace) -> None:
+    model_path = Path(args.model)
+    if not model_path.exists():
+        print(f"\nInput shapes: skipped, model not found at {model_path}")
+        return
+
+    frames = load_frames(args)
+    detector = YoloObjectDetector(model_path, num_sessions=1)
+    if not detector.supports_dynamic_input:
+        print("\nInput shapes: skipped, model has a fixed input shape")
+        detector.close()
+        return
+
+    def run(input_size: int, match_input: bool) -> list[Detections]:
+        detector.match_input = match_input
+        return [detector.detect(frame, input_size=input_size) for frame in frames]
+
+    reference = run(detector.input_size, match_input=False)
+    rows = [(size, False) for size in reversed(DEFAULT_INPUT_SIZES)]
+    rows.append((detector.input_size, True))
+
+    print(
+        f"\nInput shapes for {args.width}x{args.height} frames "
+        f"({len(frames)} frames, {sum(map(len, reference))} reference boxes)"
+    )
+    for size, match_input in rows:
+        detector.match_input = match_input
+        w, h = detector.input_shape((args.height, args.width), size)
+        ms = timeit(lambda: run(size, match_input), args.iterations // 10 or 1)
+        recall, conf_diff = agreement(reference, run(size, match_input))
+        name = "matched" if match_input else "square"
+        print(
+            f"  {name:<8} {w:4d}x{h:<4d} {ms / len(frames):8.3f} ms/frame "
+            f"{1000 * len(frames) / ms:7.1f} fps "
+            f"recall@0.5 {recall:6.1%} conf diff {conf_diff:.3f}"
+        )
+
+    detector.close()
+
+
+def bench_io_binding(args: argparse.Namespace) -> None:
+    model_path = Path(args.model)
+    if not model_path.exists():
+        print(f"\nIOBinding: skipped, model not found at {model_path}")
+        return
+
+    frames = load_frames(args)
+    runs = max(args.iterations, 4 * args.threads)
+
+    print(f"\nInference with {args.threads} threads, {runs} frames")
+    for io_binding in (False, True):
+        detector = YoloObjectDetector(
+            model_path, num_sessions=args.threads, io_binding=io_binding
+        )
+
+        def detect(i: int) -> float:
+            start = time.perf_counter()
+            detector.detect(frames[i % len(frames)])
+            return (time.perf_counter() - start) * 1000
+
+        with ThreadPoolExecutor(args.threads) as executor:
+            list(executor.map(detect, range(args.threads)))  # warm-up
+            latencies = np.array(list(executor.map(detect, range(runs))))
+
+        kib = allocated_bytes(lambda: detector.detect(frames[0])) / 1024
+        name = "iobinding" if io_binding else "run"
+        print(
+            f"  {name:<12} p50 {np.percentile(latencies, 50):8.3f} ms "
+            f"p99 {np.percentile(latencies, 99):8.3f} ms "
+            f"{kib:10.1f} KiB allocated/frame"
+        )
+        detector.close()
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--width", type=int, default=480)
+    parser.add_argument("--height", type=int, default=360)
+    parser.add_argument("--input-size", type=int, default=640)
+    parser.add_argument("--objects", type=int, default=2)
+    parser.add_argument("--iterations", type=int, default=200)
+    parser.add_argument("--model", default=str(MODEL_PATH))
+    parser.add_argument("--images", help="folder of frames for input shape runs")
+    parser.add_argument("--threads", type=int, default=2)
+    args = parser.parse_args()
+
+    bench_preprocess(args)
+    bench_postprocess(args)
+    bench_input_shapes(args)
+    bench_io_binding(args)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,176 @@
+"""
+Parity benchmark of the ONNX face mesh backend against MediaPipe.
+Only used for development; run from the backend folder after exporting the
+models with scripts/export_face_mesh_onnx.py:
+
+    python scripts/benchmark_face_mesh.py --images path/to/face/frames
+
+Reports single-stream latency, throughput with concurrent sessions (where the
+ONNX backend batches face crops across sessions), and the landmark error of
+the ONNX backend relative to MediaPipe, normalized by the inter-ocular distance.
+"""
+
+import argparse
+import sys
+import time
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from typing import Callable
+
+import numpy as np
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+from benchmark_detector import load_frames, timeit  # noqa: E402
+
+from app.services.face_landmarker import (  # noqa: E402
+    FaceLandmarker,
+    MediapipeFaceLandmarker,
+)
+from app.services.onnx_face_landmarker import (  # noqa: E402
+    LANDMARK_EYES,
+    OnnxFaceLandmarker,
+    OnnxFaceMeshModel,
+)
+
+# Frame spacing of the simulated streams
+FRAME_INTERVAL_MS = 66
+
+
+def run_stream(
+    landmarker: FaceLandmarker, frames: list[np.ndarray], iterations: int
+) -> None:
+    """Feed frames as one stream with increasing media timestamps."""
+    for i in range(iterations):
+        landmarker.detect(frames[i % len(frames)], i * FRAME_INTERVAL_MS)
+
+
+def bench_latency(
+    factories: dict[str, Callable[[], FaceLandmarker]],
+    frames: list[np.ndarray],
+    args: argparse.Namespace,
+) -> None:
+    print("Single stream latency")
+    for name, factory in factories.items():
+        landmarker = factory()
+        counter = iter(range(1_000_000_000))
+
+        def detect() -> None:
+            i = next(counter)
+            landmarker.detect(frames[i % len(frames)], i * FRAME_INTERVAL_MS)
+
+        print(f"  {name:<10} {timeit(detect, args.iterations):8.3f} ms/frame")
+        landmarker.close()
+
+
+def bench_throughput(
+    factories: dict[str, Callable[[], FaceLandmarker]],
+    frames: list[np.ndarray],
+    args: argparse.Namespace,
+) -> None:
+    print(f"Throughput with {args.sessions} concurrent sessions")
+    for name, factory in factories.items():
+        landmarkers = [factory() for _ in range(args.sessions)]
+        with ThreadPoolExecutor(max_workers=args.sessions) as pool:
+            # Warm-up
+            list(pool.map(lambda lm: run_stream(lm, frames, 2), landmarkers))
+            start = time.perf_counter()
+            list(
+                pool.map(
+                    lambda lm: run_stream(lm, frames, args.iterations), landmarkers
+                )
+            )
+            elapsed = time.perf_counter() - start
+
+        total = args.sessions * args.iterations
+        print(
+            f"  {name:<10} {total / elapsed:8.1f} frames/s "
+            f"({elapsed * 1000 / args.iterations:7.3f} ms per frame of all sessions)"
+        )
+        for landmarker in landmarkers:
+            landmarker.close()
+
+
+def bench_error(
+    reference: FaceLandmarker,
+    landmarker: FaceLandmarker,
+    frames: list[np.ndarray],
+    args: argparse.Namespace,
+) -> None:
+    """
+    Compare ONNX landmarks against MediaPipe's on every frame.
+    Unless --sequence is given, frames are unrelated stills and each one
+    starts a new stream, so both backends run their face detectors.
+    """
+    errors = []
+    both, reference_only, onnx_only = 0, 0, 0
+    for i, frame in enumerate(frames):
+        if not args.sequence:
+            reference.reset()
+            landmarker.reset()
+        expected = reference.detect(frame, i * FRAME_INTERVAL_MS).landmarks
+        actual = landmarker.detect(frame, i * FRAME_INTERVAL_MS).landmarks
+
+        if not len(expected) or not len(actual):
+            reference_only += int(bool(len(expected)))
+            onnx_only += int(bool(len(actual)))
+            continue
+
+        both += 1
+        scale = np.array(frame.shape[1::-1], dtype=np.float32)
+        expected, actual = expected * scale, actual * scale
+        inter_ocular = np.linalg.norm(
+            expected[LANDMARK_EYES[0]] - expected[LANDMARK_EYES[1]]
+        )
+        errors.append(
+            float(np.linalg.norm(expected - actual, axis=1).mean() / inter_ocular)
+        )
+
+    print(f"Landmark error over {len(frames)} frames (relative to MediaPipe)")
+    print(
+        f"  faces found by both {both}, MediaPipe only {reference_only}, "
+        f"ONNX only {onnx_only}"
+    )
+    if errors:
+        print(
+            f"  NME mean {np.mean(errors):.4f} p50 {np.percentile(errors, 50):.4f} "
+            f"p95 {np.percentile(errors, 95):.4f} (inter-ocular)"
+        )
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--width", type=int, default=480)
+    parser.add_argument("--height", type=int, default=360)
+    parser.add_argument("--iterations", type=int, default=200)
+    parser.add_argument("--images", help="folder of frames with faces")
+    parser.add_argument(
+        "--sequence", action="store_true", help="frames are consecutive video frames"
+    )
+    parser.add_argument("--sessions", type=int, default=4)
+    parser.add_argument("--batch-size", type=int, default=8)
+    parser.add_argument("--batch-window-ms", type=float, default=2.0)
+    args = parser.parse_args()
+
+    frames = load_frames(args)
+    model = OnnxFaceMeshModel(
+        max_batch_size=args.batch_size, max_wait_ms=args.batch_window_ms
+    )
+    factories: dict[str, Callable[[], FaceLandmarker]] = {
+        "mediapipe": MediapipeFaceLandmarker,
+        "onnx": lambda: OnnxFaceLandmarker(model),
+    }
+
+    bench_latency(factories, frames, args)
+    bench_throughput(factories, frames, args)
+    if args.images:
+        reference, landmarker = MediapipeFaceLandmarker(), OnnxFaceLandmarker(model)
+        bench_error(reference, landmarker, frames, args)
+        reference.close()
+
+    print(f"ONNX batching: {model.stats()['avg_batch_size']:.2f} crops per batch")
+    model.close()
+
+
+if __name__ == "__main__":
+    main()
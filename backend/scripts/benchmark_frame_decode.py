@@ -0,0 +1,103 @@
+"""
+Benchmark of the live path's frame conversion at different sender resolutions.
+Only used for development; run from the backend folder:
+
+    python scripts/benchmark_frame_decode.py
+
+Compares converting the received YUV frame to BGR at full resolution and then
+resizing it with OpenCV against converting and scaling to the processing size
+in one libswscale pass, as the live path does. Image error is the mean absolute
+difference from an area-averaged (alias-free) resize of the full frame.
+"""
+
+import argparse
+import sys
+from pathlib import Path
+
+import av
+import cv2
+import numpy as np
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+from benchmark_detector import timeit  # noqa: E402
+
+from app.services.utils.image_utils import FrameImage  # noqa: E402
+from app.services.video_processor import (  # noqa: E402
+    DECODE_INTERPOLATION,
+    processing_size,
+)
+
+RESOLUTIONS = {
+    "480p": (640, 480),
+    "720p": (1280, 720),
+    "1080p": (1920, 1080),
+}
+
+
+def received_frame(width: int, height: int) -> av.VideoFrame:
+    """A decoded WebRTC frame: YUV 4:2:0 with smooth content and some noise."""
+    xs = np.linspace(0, 255, width, dtype=np.float32)
+    ys = np.linspace(0, 255, height, dtype=np.float32)[:, None]
+    rng = np.random.default_rng(0)
+    bgr = np.stack([xs + 0 * ys, ys + 0 * xs, (xs + ys) / 2], axis=2)
+    bgr += rng.normal(0, 8, bgr.shape).astype(np.float32)
+    bgr = np.clip(bgr, 0, 255).astype(np.uint8)
+    return av.VideoFrame.from_ndarray(bgr, format="bgr24").reformat(format="yuv420p")
+
+
+def full_decode_then_resize(frame: av.VideoFrame) -> np.ndarray:
+    """The previous live path: full-resolution BGR, then cv2.resize."""
+    img = frame.to_ndarray(format="bgr24")
+    size = processing_size(frame.width, frame.height)
+    if size != (frame.width, frame.height):
+        img = cv2.resize(img, size)
+    return img
+
+
+def scaled_decode(frame: av.VideoFrame) -> np.ndarray:
+    """The live path: conversion and scaling in one libswscale pass."""
+    return FrameImage.from_video_frame(
+        frame,
+        *processing_size(frame.width, frame.height),
+        interpolation=DECODE_INTERPOLATION,
+    )
+
+
+def image_error(frame: av.VideoFrame, img: np.ndarray) -> float:
+    """Mean absolute difference from an area-averaged resize of the full frame."""
+    reference = cv2.resize(
+        frame.to_ndarray(format="bgr24"),
+        img.shape[1::-1],
+        interpolation=cv2.INTER_AREA,
+    )
+    return float(np.abs(img.astype(np.int16) - reference.astype(np.int16)).mean())
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--iterations", type=int, default=200)
+    parser.add_argument(
+        "--resolutions", nargs="+", default=list(RESOLUTIONS), choices=RESOLUTIONS
+    )
+    args = parser.parse_args()
+
+    print("Frame conversion to the processing size")
+    for name in args.resolutions:
+        frame = received_frame(*RESOLUTIONS[name])
+        before = timeit(lambda: full_decode_then_resize(frame), args.iterations)
+        after = timeit(lambda: scaled_decode(frame), args.iterations)
+
+        w, h = processing_size(frame.width, frame.height)
+        print(
+            f"  {name:<6} -> {w}x{h}: "
+            f"full + resize {before:7.3f} ms "
+            f"(error {image_error(frame, full_decode_then_resize(frame)):.2f}), "
+            f"scaled decode {after:7.3f} ms "
+            f"(error {image_error(frame, scaled_decode(frame)):.2f}), "
+            f"{before / after:4.1f}x"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,136 @@
+"""
+Export MediaPipe's face detection and face mesh models to ONNX.
+Only used for exporting the models; run from the backend folder:
+
+    python scripts/export_face_mesh_onnx.py
+
+The TFLite models are extracted from assets/models/face_landmarker.task and
+converted with tf2onnx (pip install tf2onnx). The mesh model's batch dimension
+is made symbolic, so the ONNX landmarker backend (LANDMARKER_BACKEND=onnx) can
+run the face crops of many sessions in one inference. When the batched graph
+does not reproduce single-crop results, the fixed-batch model is kept and the
+backend runs the crops of a batch one by one.
+"""
+
+import argparse
+import sys
+import tempfile
+import zipfile
+from pathlib import Path
+
+import numpy as np
+import onnx
+import onnxruntime as ort
+import tf2onnx
+from onnx import numpy_helper
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+from app.services.face_landmarker import MODEL_PATH  # noqa: E402
+from app.services.onnx_face_landmarker import (  # noqa: E402
+    FACE_DETECTOR_MODEL_PATH,
+    FACE_MESH_MODEL_PATH,
+    MESH_INPUT_SIZE,
+)
+
+DETECTOR_TFLITE = "face_detector.tflite"
+MESH_TFLITE = "face_landmarks_detector.tflite"
+
+# Largest difference between batched and single-crop landmarks, in crop pixels
+MAX_BATCH_ERROR = 1e-2
+
+
+def convert(tflite_path: Path, output_path: Path, opset: int) -> onnx.ModelProto:
+    """Convert a TFLite model to ONNX, keeping its NHWC input layout."""
+    model, _ = tf2onnx.convert.from_tflite(str(tflite_path), opset=opset)
+    onnx.checker.check_model(model)
+    onnx.save(model, str(output_path))
+    print(f"Exported {output_path.name}")
+    return model
+
+
+def make_batch_dynamic(model: onnx.ModelProto) -> onnx.ModelProto:
+    """
+    Give the graph a symbolic batch dimension.
+
+    Graph inputs and outputs get a named leading dimension and reshapes to a
+    constant shape with a leading 1 copy the batch from their input instead.
+    """
+    model = onnx.ModelProto.FromString(model.SerializeToString())
+    graph = model.graph
+
+    for value in [*graph.input, *graph.output]:
+        dims = value.type.tensor_type.shape.dim
+        if dims:
+            dims[0].dim_param = "N"
+    # Intermediate shapes were inferred for batch 1
+    del graph.value_info[:]
+
+    initializers = {init.name: init for init in graph.initializer}
+    for node in graph.node:
+        if node.op_type != "Reshape" or node.input[1] not in initializers:
+            continue
+        init = initializers[node.input[1]]
+        shape = numpy_helper.to_array(init).copy()
+        if len(shape) > 1 and shape[0] == 1 and 0 not in shape:
+            shape[0] = 0  # copy the input's leading (batch) dimension
+            init.CopyFrom(numpy_helper.from_array(shape, init.name))
+
+    onnx.checker.check_model(model)
+    return model
+
+
+def batch_error(model: onnx.ModelProto, batch_size: int = 4) -> float:
+    """Largest landmark difference between a batched run and single-crop runs."""
+    session = ort.InferenceSession(
+        model.SerializeToString(), providers=["CPUExecutionProvider"]
+    )
+    name = session.get_inputs()[0].name
+    rng = np.random.default_rng(0)
+    crops = rng.random((batch_size, MESH_INPUT_SIZE, MESH_INPUT_SIZE, 3)).astype(
+        np.float32
+    )
+
+    batched = session.run(None, {name: crops})[0].reshape(batch_size, -1)
+    single = np.concatenate(
+        [
+            session.run(None, {name: crops[i : i + 1]})[0].reshape(1, -1)
+            for i in range(batch_size)
+        ]
+    )
+    return float(np.abs(batched - single).max())
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--task", default=str(MODEL_PATH))
+    parser.add_argument("--opset", type=int, default=13)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        with zipfile.ZipFile(args.task) as bundle:
+            bundle.extract(DETECTOR_TFLITE, tmp)
+            bundle.extract(MESH_TFLITE, tmp)
+
+        convert(Path(tmp) / DETECTOR_TFLITE, FACE_DETECTOR_MODEL_PATH, args.opset)
+        mesh = convert(Path(tmp) / MESH_TFLITE, FACE_MESH_MODEL_PATH, args.opset)
+
+    try:
+        batched = make_batch_dynamic(mesh)
+        error = batch_error(batched)
+    except Exception as e:
+        print(f"Batched face mesh failed ({e}); keeping fixed batch size")
+        return
+
+    if error > MAX_BATCH_ERROR:
+        print(
+            f"Batched face mesh differs by {error:.4f} px; keeping fixed batch size"
+        )
+        return
+
+    onnx.save(batched, str(FACE_MESH_MODEL_PATH))
+    print(f"Face mesh batch dimension made dynamic (max difference {error:.2e} px)")
+
+
+if __name__ == "__main__":
+    main()
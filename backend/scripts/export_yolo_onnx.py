@@ -1,29 +1,279 @@
 """
-Export YOLOv8 model to ONNX format.
-Only used for exporting the model.
+Export YOLOv8 models to a catalogue of ONNX variants.
+Only used for exporting the models; run from the backend folder:
+
+    python scripts/export_yolo_onnx.py --sizes n s --input-sizes 320 480 640 \
+        --quantize none dynamic static --phone-only --images path/to/frames
+
+Each variant is measured (latency, and phone agreement with the largest
+full-precision model when --images is given) and recorded in
+assets/models/manifest.json, from which the backend picks a variant by name
+(DETECTOR_MODEL) or automatically within a latency budget.
 """
 
+import argparse
 import shutil
+import statistics
+import sys
+import time
 from pathlib import Path
+from typing import Iterator, Optional
 
+import numpy as np
+import onnx
+import onnxruntime as ort
+from onnx import helper, numpy_helper
+from onnxruntime.quantization import (
+    CalibrationDataReader,
+    QuantFormat,
+    QuantType,
+    quantize_dynamic,
+    quantize_static,
+)
+from onnxruntime.quantization.shape_inference import quant_pre_process
 from ultralytics import YOLO
 
-# Load YOLO pre-trained model
-model = YOLO("yolov8s.pt")
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
 
-# Export to ONNX
-exported_path_str = model.export(
-    format="onnx",
-    opset=12,
-    dynamic=False,  # fixed input shape
+from benchmark_detector import agreement, load_frames  # noqa: E402
+
+from app.services.model_catalog import (  # noqa: E402
+    MANIFEST_PATH,
+    MODELS_DIR,
+    RANKING_METRIC,
+    ModelVariant,
+    load_manifest,
+    save_manifest,
+)
+from app.services.object_detector import (  # noqa: E402
+    ESSENTIAL_CLASSES,
+    NUM_BOX_COORDS,
+    OUTPUT_CLASSES_METADATA_KEY,
+    YoloObjectDetector,
 )
+from app.services.utils.image_utils import LetterboxPreprocessor  # noqa: E402
+
+
+def export_base(size: str, input_size: int) -> Path:
+    """Export a full-precision YOLOv8 model and move it into MODELS_DIR."""
+    model = YOLO(f"yolov8{size}.pt")
+    exported_path = Path(
+        model.export(
+            format="onnx",
+            opset=13,  # per-channel INT8 QDQ needs DequantizeLinear axis
+            imgsz=input_size,
+            dynamic=True,  # dynamic batch and spatial axes: batching, frame-matched input
+        )
+    )
+
+    path = MODELS_DIR / f"yolov8{size}-{input_size}.onnx"
+    shutil.move(str(exported_path), path)
+    return path
+
+
+def prune_head(src: Path, dst: Path, classes: list[int]) -> Path:
+    """
+    Keep only the box rows and the score rows of `classes` in the model output.
+
+    The class ids are stored in the model metadata so the detector can map the
+    remaining score rows back to class ids.
+    """
+    model = onnx.load(str(src))
+    graph = model.graph
+    output = graph.output[0]
+
+    rows = list(range(NUM_BOX_COORDS)) + [NUM_BOX_COORDS + c for c in classes]
+    full_name = f"{output.name}_full"
+    for node in graph.node:
+        node.output[:] = [full_name if o == output.name else o for o in node.output]
+
+    graph.initializer.append(
+        numpy_helper.from_array(np.array(rows, dtype=np.int64), "pruned_rows")
+    )
+    graph.node.append(
+        helper.make_node(
+            "Gather", [full_name, "pruned_rows"], [output.name], axis=1
+        )
+    )
+    output.type.tensor_type.shape.dim[1].dim_value = len(rows)
+
+    helper.set_model_props(
+        model,
+        {
+            **{p.key: p.value for p in model.metadata_props},
+            OUTPUT_CLASSES_METADATA_KEY: ",".join(map(str, classes)),
+        },
+    )
+    onnx.checker.check_model(model)
+    onnx.save(model, str(dst))
+    return dst
+
+
+class FrameCalibrationReader(CalibrationDataReader):
+    """Feed letterboxed frames to static quantization calibration."""
+
+    def __init__(self, input_name: str, frames: list[np.ndarray], input_size: int):
+        self.input_name = input_name
+        self.frames = frames
+        self.input_size = input_size
+        self.preprocessor = LetterboxPreprocessor()
+        self._iter: Optional[Iterator[np.ndarray]] = None
+
+    def get_next(self) -> Optional[dict[str, np.ndarray]]:
+        if self._iter is None:
+            self._iter = iter(self.frames)
+        frame = next(self._iter, None)
+        if frame is None:
+            return None
+        tensor, _ = self.preprocessor([frame], (self.input_size, self.input_size))
+        return {self.input_name: tensor.copy()}
+
+
+def quantize(
+    src: Path,
+    dst: Path,
+    mode: str,
+    frames: list[np.ndarray],
+    input_size: int,
+) -> Optional[Path]:
+    """Quantize a model to INT8 with dynamic or static (calibrated) ranges."""
+    if mode == "dynamic":
+        quantize_dynamic(str(src), str(dst), weight_type=QuantType.QUInt8)
+        return dst
+
+    if not frames:
+        print(f"  skipping static quantization of {src.name}: no --images")
+        return None
+
+    # Fold and shape-infer the graph so more nodes get quantized
+    prepared = dst.with_name(f"{dst.stem}-prep.onnx")
+    quant_pre_process(str(src), str(prepared))
+
+    input_name = ort.InferenceSession(str(prepared)).get_inputs()[0].name
+    quantize_static(
+        str(prepared),
+        str(dst),
+        FrameCalibrationReader(input_name, frames, input_size),
+        quant_format=QuantFormat.QDQ,
+        activation_type=QuantType.QUInt8,
+        weight_type=QuantType.QInt8,
+        per_channel=True,
+    )
+    prepared.unlink()
+    return dst
+
+
+def measure_latency(path: Path, input_size: int, iterations: int) -> float:
+    """Return the median single-frame latency in milliseconds."""
+    session = ort.InferenceSession(str(path), providers=["CPUExecutionProvider"])
+    feed = {
+        session.get_inputs()[0].name: np.random.rand(
+            1, 3, input_size, input_size
+        ).astype(np.float32)
+    }
+    for _ in range(5):
+        session.run(None, feed)
+
+    times = []
+    for _ in range(iterations):
+        start = time.perf_counter()
+        session.run(None, feed)
+        times.append((time.perf_counter() - start) * 1000)
+    return statistics.median(times)
+
+
+def run_detector(path: Path, input_size: int, frames: list[np.ndarray]):
+    detector = YoloObjectDetector(path, input_size=input_size, num_sessions=1)
+    try:
+        return [detector.detect(frame) for frame in frames]
+    finally:
+        detector.close()
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--sizes", nargs="+", default=["n"], choices=["n", "s"])
+    parser.add_argument("--input-sizes", nargs="+", type=int, default=[640])
+    parser.add_argument(
+        "--quantize",
+        nargs="+",
+        default=["none"],
+        choices=["none", "dynamic", "static"],
+    )
+    parser.add_argument(
+        "--phone-only", action="store_true", help="also export pruned phone heads"
+    )
+    parser.add_argument("--images", help="frames for calibration and accuracy")
+    parser.add_argument("--width", type=int, default=480)
+    parser.add_argument("--height", type=int, default=360)
+    parser.add_argument("--iterations", type=int, default=50)
+    args = parser.parse_args()
+
+    MODELS_DIR.mkdir(parents=True, exist_ok=True)
+    frames = load_frames(args) if args.images else []
+    manifest = load_manifest()
+
+    # Largest model first: its detections are the accuracy reference
+    reference = None
+    for size in sorted(set(args.sizes), reverse=True):
+        for input_size in sorted(set(args.input_sizes), reverse=True):
+            base_path = export_base(size, input_size)
+            if reference is None:
+                reference = run_detector(base_path, input_size, frames)
+
+            heads = [("", base_path)]
+            if args.phone_only:
+                pruned = prune_head(
+                    base_path,
+                    base_path.with_name(f"{base_path.stem}-phone.onnx"),
+                    ESSENTIAL_CLASSES,
+                )
+                heads.append(("-phone", pruned))
+
+            for head_suffix, head_path in heads:
+                for mode in args.quantize:
+                    if mode == "none":
+                        path: Optional[Path] = head_path
+                    else:
+                        suffix = "int8d" if mode == "dynamic" else "int8s"
+                        path = quantize(
+                            head_path,
+                            head_path.with_name(f"{head_path.stem}-{suffix}.onnx"),
+                            mode,
+                            frames,
+                            input_size,
+                        )
+                    if path is None:
+                        continue
+
+                    variant = ModelVariant(
+                        name=path.stem,
+                        file=path.name,
+                        base_model=f"yolov8{size}",
+                        input_size=input_size,
+                        quantization=mode,
+                        phone_only=bool(head_suffix),
+                        latency_ms=measure_latency(path, input_size, args.iterations),
+                    )
+                    if frames and reference:
+                        recall, conf_diff = agreement(
+                            reference, run_detector(path, input_size, frames)
+                        )
+                        variant.accuracy = {
+                            RANKING_METRIC: recall,
+                            "phone_conf_diff": conf_diff,
+                        }
 
-exported_path = Path(exported_path_str)  # convert to Path object
+                    manifest.upsert(variant)
+                    print(
+                        f"  {variant.name:<28} {variant.latency_ms:8.2f} ms "
+                        f"{variant.accuracy or ''}"
+                    )
 
-# Move to desired folder
-output_folder = Path(__file__).resolve().parents[1] / "assets/models"
-output_folder.mkdir(parents=True, exist_ok=True)
+    manifest.variants.sort(key=lambda v: v.name)
+    save_manifest(manifest)
+    print(f"Manifest written to: {MANIFEST_PATH}")
 
-shutil.move(str(exported_path), output_folder / exported_path.name)
 
-print(f"ONNX model exported to: {output_folder / exported_path.name}")
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,29 @@
+from pathlib import Path
+
+import numpy as np
+import onnx
+import pytest
+from onnx import TensorProto, helper, numpy_helper
+
+# Weights large enough to be stored as external initializers
+MATMUL_SIZE = 32
+
+
+@pytest.fixture
+def matmul_model(tmp_path: Path) -> Path:
+    """A small ONNX model computing y = x @ W, with a dynamic batch dimension."""
+    weights = np.arange(MATMUL_SIZE * MATMUL_SIZE, dtype=np.float32).reshape(
+        MATMUL_SIZE, MATMUL_SIZE
+    ) / (MATMUL_SIZE * MATMUL_SIZE)
+    graph = helper.make_graph(
+        [helper.make_node("MatMul", ["x", "W"], ["y"])],
+        "matmul",
+        [helper.make_tensor_value_info("x", TensorProto.FLOAT, ["N", MATMUL_SIZE])],
+        [helper.make_tensor_value_info("y", TensorProto.FLOAT, ["N", MATMUL_SIZE])],
+        [numpy_helper.from_array(weights, "W")],
+    )
+    model = helper.make_model(graph, opset_imports=[helper.make_opsetid("", 13)])
+    model.ir_version = 8
+    path = tmp_path / "matmul.onnx"
+    onnx.save(model, str(path))
+    return path
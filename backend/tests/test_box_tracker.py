@@ -0,0 +1,132 @@
+import numpy as np
+import pytest
+
+from app.services.box_tracker import BoxTracker
+from app.services.object_detector import Detections
+
+PHONE = 67
+PERSON = 0
+
+
+def detections(*items: tuple[list[float], int], conf: float = 0.8) -> Detections:
+    if not items:
+        return Detections.empty()
+    return Detections(
+        np.array([box for box, _ in items], dtype=np.float32),
+        np.full(len(items), conf, dtype=np.float32),
+        np.array([class_id for _, class_id in items], dtype=np.intp),
+    )
+
+
+BOX = [0.2, 0.2, 0.4, 0.4]
+
+
+def shifted(box: list[float], dx: float) -> list[float]:
+    return [box[0] + dx, box[1], box[2] + dx, box[3]]
+
+
+def test_update_returns_detections_unchanged():
+    tracker = BoxTracker()
+    fresh = detections((BOX, PHONE))
+
+    assert tracker.update(fresh) is fresh
+
+
+def test_static_track_is_predicted_in_place():
+    tracker = BoxTracker()
+    tracker.update(detections((BOX, PHONE), conf=0.7))
+
+    predicted = tracker.predict()
+
+    np.testing.assert_allclose(predicted.boxes, [BOX])
+    np.testing.assert_allclose(predicted.confs, [0.7])
+    assert predicted.class_ids.tolist() == [PHONE]
+
+
+def test_predict_extrapolates_velocity_across_detector_cadence():
+    tracker = BoxTracker(velocity_alpha=1.0)
+    tracker.update(detections((BOX, PHONE)))
+    tracker.predict()
+    # Detector runs every second frame; the box moved 0.02 per frame
+    tracker.update(detections((shifted(BOX, 0.04), PHONE)))
+
+    np.testing.assert_allclose(
+        tracker.predict().boxes, [shifted(BOX, 0.06)], atol=1e-6
+    )
+
+
+def test_velocity_is_smoothed():
+    tracker = BoxTracker(velocity_alpha=0.5)
+    tracker.update(detections((BOX, PHONE)))
+    tracker.update(detections((shifted(BOX, 0.02), PHONE)))
+
+    np.testing.assert_allclose(
+        tracker.predict().boxes, [shifted(BOX, 0.03)], atol=1e-6
+    )
+
+
+def test_predicted_boxes_stay_in_the_frame():
+    tracker = BoxTracker(velocity_alpha=1.0)
+    edge = [0.8, 0.2, 0.95, 0.4]
+    tracker.update(detections((edge, PHONE)))
+    tracker.update(detections((shifted(edge, 0.04), PHONE)))
+
+    assert tracker.predict().boxes.max() <= 1.0
+
+
+def test_detections_only_match_tracks_of_their_class():
+    tracker = BoxTracker(max_misses=0)
+    tracker.update(detections((BOX, PHONE)))
+    tracker.update(detections((BOX, PERSON)))
+
+    assert tracker.predict().class_ids.tolist() == [PERSON]
+
+
+def test_unmatched_tracks_survive_max_misses_but_are_not_predicted():
+    tracker = BoxTracker(max_misses=1)
+    tracker.update(detections((BOX, PHONE)))
+
+    tracker.update(detections())
+    assert len(tracker._tracks) == 1
+    assert len(tracker.predict()) == 0
+
+    # Matched again within max_misses: the track is visible again
+    tracker.update(detections((BOX, PHONE)))
+    assert len(tracker.predict()) == 1
+
+    tracker.update(detections())
+    tracker.update(detections())
+    assert len(tracker._tracks) == 0
+
+
+def test_association_prefers_the_best_overlap():
+    tracker = BoxTracker(velocity_alpha=1.0)
+    left, right = [0.1, 0.1, 0.3, 0.3], [0.28, 0.1, 0.48, 0.3]
+    tracker.update(detections((left, PHONE), (right, PHONE)))
+    tracker.update(
+        detections((shifted(right, 0.01), PHONE), (shifted(left, 0.01), PHONE))
+    )
+
+    predicted = tracker.predict()
+    np.testing.assert_allclose(
+        sorted(predicted.boxes.tolist()),
+        [shifted(left, 0.02), shifted(right, 0.02)],
+        atol=1e-6,
+    )
+
+
+def test_reset_forgets_tracks():
+    tracker = BoxTracker()
+    tracker.update(detections((BOX, PHONE)))
+    tracker.reset()
+
+    assert len(tracker.predict()) == 0
+
+
+@pytest.mark.parametrize(
+    "kwargs",
+    [{"iou_threshold": 1.5}, {"max_misses": -1}, {"velocity_alpha": 0.0}],
+)
+def test_invalid_parameters(kwargs):
+    with pytest.raises(ValueError):
+        BoxTracker(**kwargs)
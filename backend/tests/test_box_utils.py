@@ -0,0 +1,135 @@
+import numpy as np
+
+from app.services.object_detector import ESSENTIAL_CLASSES, YoloObjectDetector
+from app.services.utils.box_utils import box_iou, non_max_suppression, xywh_to_xyxy
+
+PHONE = ESSENTIAL_CLASSES[0]
+
+
+def boxes(*rows) -> np.ndarray:
+    return np.array(rows, dtype=np.float32)
+
+
+def test_xywh_to_xyxy():
+    np.testing.assert_allclose(
+        xywh_to_xyxy(boxes([10, 20, 4, 6])), boxes([8, 17, 12, 23])
+    )
+
+
+def test_box_iou():
+    ious = box_iou(
+        boxes([0, 0, 10, 10])[0],
+        boxes([0, 0, 10, 10], [5, 0, 15, 10], [20, 20, 30, 30], [3, 3, 3, 3]),
+    )
+    np.testing.assert_allclose(ious, [1.0, 1 / 3, 0.0, 0.0])
+
+
+def test_nms_keeps_best_of_overlapping_boxes_by_score():
+    keep = non_max_suppression(
+        boxes([0, 0, 10, 10], [1, 1, 11, 11], [50, 50, 60, 60], [0, 0, 9, 10]),
+        np.array([0.6, 0.9, 0.7, 0.3], dtype=np.float32),
+        iou_threshold=0.5,
+    )
+    assert keep.tolist() == [1, 2]
+
+
+def test_nms_only_suppresses_within_a_class():
+    same = boxes([0, 0, 10, 10], [1, 1, 11, 11])
+    scores = np.array([0.9, 0.8], dtype=np.float32)
+
+    assert non_max_suppression(same, scores, 0.5).tolist() == [0]
+    assert non_max_suppression(same, scores, 0.5, np.array([1, 2])).tolist() == [0, 1]
+
+
+def test_nms_without_boxes():
+    keep = non_max_suppression(np.empty((0, 4)), np.empty(0), 0.5)
+    assert keep.dtype == np.intp and len(keep) == 0
+
+
+def test_undo_letterbox_maps_back_to_image_pixels():
+    # A 320x240 image letterboxed into 640x640: ratio 2, 80 px padding top and bottom
+    mapped = YoloObjectDetector._undo_letterbox(
+        boxes([40, 100, 200, 300], [-20, 60, 700, 900]),
+        (240, 320),
+        2.0,
+        (0, 80),
+        normalize=False,
+    )
+    np.testing.assert_allclose(mapped, boxes([20, 10, 100, 110], [0, 0, 320, 240]))
+
+
+def test_undo_letterbox_normalizes():
+    mapped = YoloObjectDetector._undo_letterbox(
+        boxes([40, 100, 200, 300]), (240, 320), 2.0, (0, 80), normalize=True
+    )
+    np.testing.assert_allclose(
+        mapped, boxes([20 / 320, 10 / 240, 100 / 320, 110 / 240])
+    )
+
+
+def yolo_output(anchors: list[tuple[list[float], dict[int, float]]]) -> np.ndarray:
+    """Raw (1, 84, N) YOLOv8 output from (cx, cy, w, h) boxes and class scores."""
+    output = np.zeros((1, 84, len(anchors)), dtype=np.float32)
+    for i, (box, scores) in enumerate(anchors):
+        output[0, :4, i] = box
+        for class_id, score in scores.items():
+            output[0, 4 + class_id, i] = score
+    return output
+
+
+def test_postprocess_essential_keeps_phones_above_threshold():
+    output = yolo_output(
+        [
+            ([100, 100, 40, 80], {PHONE: 0.9}),
+            ([102, 101, 40, 80], {PHONE: 0.8}),  # duplicate of the first
+            ([400, 300, 40, 80], {PHONE: 0.2}),  # below threshold
+            ([300, 300, 40, 80], {0: 0.95}),  # not an essential class
+            ([500, 200, 40, 80], {0: 0.95, PHONE: 0.5}),  # phone score still counts
+        ]
+    )
+
+    detections = YoloObjectDetector._postprocess_essential(
+        output, (640, 640), 1.0, (0, 0), conf_thres=0.3, iou_thres=0.5
+    )
+
+    assert detections.class_ids.tolist() == [PHONE, PHONE]
+    np.testing.assert_allclose(detections.confs, [0.9, 0.5])
+    np.testing.assert_allclose(
+        detections.boxes, boxes([80, 60, 120, 140], [480, 160, 520, 240])
+    )
+
+
+def test_postprocess_essential_maps_pruned_heads():
+    # A pruned head with score rows for classes 0 and PHONE only
+    output = np.zeros((1, 6, 1), dtype=np.float32)
+    output[0, :4, 0] = [100, 100, 40, 80]
+    output[0, 5, 0] = 0.9
+
+    detections = YoloObjectDetector._postprocess_essential(
+        output,
+        (640, 640),
+        1.0,
+        (0, 0),
+        conf_thres=0.3,
+        iou_thres=0.5,
+        output_classes=[0, PHONE],
+    )
+    assert detections.class_ids.tolist() == [PHONE]
+
+    without_phone = YoloObjectDetector._postprocess_essential(
+        output[:, :5], (640, 640), 1.0, (0, 0), 0.3, 0.5, output_classes=[0]
+    )
+    assert len(without_phone) == 0
+
+
+def test_postprocess_essential_undoes_letterbox():
+    # A 320x240 frame letterboxed into 640x640: ratio 2, 80 px padding top and bottom
+    output = yolo_output([([120, 240, 80, 80], {PHONE: 0.9})])
+
+    detections = YoloObjectDetector._postprocess_essential(
+        output, (240, 320), 2.0, (0, 80), conf_thres=0.3, iou_thres=0.5, normalize=True
+    )
+
+    np.testing.assert_allclose(
+        detections.boxes, boxes([40 / 320, 60 / 240, 80 / 320, 100 / 240])
+    )
@@ -0,0 +1,234 @@
+import asyncio
+import fractions
+import inspect
+import queue
+
+import av
+import numpy as np
+import pytest
+from aiortc import RTCPeerConnection, RTCRtpReceiver
+
+from app.services.decode_gate import (
+    DecodeGate,
+    Vp8ReferenceTracker,
+    install_decode_gate,
+    is_droppable_h264,
+)
+
+START = b"\x00\x00\x00\x01"
+
+
+def nal(header: int, payload: bytes = b"\x88\x84\x21") -> bytes:
+    return START + bytes([header]) + payload
+
+
+# NAL unit headers: nal_ref_idc in bits 5-6, nal_unit_type in bits 0-4
+NON_REF_SLICE = 0x01
+REF_SLICE = 0x41
+IDR_SLICE = 0x65
+SEI = 0x06
+SPS = 0x67
+PPS = 0x68
+AUD = 0x09
+
+
+@pytest.mark.parametrize(
+    "data",
+    [
+        nal(NON_REF_SLICE),
+        nal(AUD) + nal(NON_REF_SLICE),
+        nal(NON_REF_SLICE) + nal(NON_REF_SLICE),
+    ],
+)
+def test_h264_non_reference_slices_are_droppable(data):
+    assert is_droppable_h264(data)
+
+
+@pytest.mark.parametrize(
+    "data",
+    [
+        nal(REF_SLICE),
+        nal(IDR_SLICE),
+        nal(NON_REF_SLICE) + nal(REF_SLICE),
+        nal(SPS) + nal(PPS) + nal(NON_REF_SLICE),
+        nal(PPS) + nal(NON_REF_SLICE),
+        nal(SEI) + nal(NON_REF_SLICE),
+        nal(AUD),
+        b"",
+    ],
+)
+def test_h264_access_units_with_state_are_decoded(data):
+    assert not is_droppable_h264(data)
+
+
+CLOCK_RATE = 90000
+TICKS_PER_FRAME = CLOCK_RATE // 30
+
+# Two temporal layers: every second frame references nothing after it
+VP8_L1T2_OPTIONS = {
+    "deadline": "realtime",
+    "error-resilient": "default",
+    "ts-parameters": (
+        "ts_number_layers=2:ts_target_bitrate=250,500:ts_rate_decimator=2,1:"
+        "ts_periodicity=2:ts_layer_id=0,1:ts_layering_mode=2"
+    ),
+}
+
+
+def encode_vp8(options: dict[str, str], count: int = 12) -> list[bytes]:
+    encoder = av.CodecContext.create("libvpx", "w")
+    encoder.width, encoder.height = 64, 64
+    encoder.pix_fmt = "yuv420p"
+    encoder.time_base = fractions.Fraction(1, 30)
+    encoder.options = options
+
+    packets = []
+    for i in range(count):
+        img = np.zeros((64, 64, 3), dtype=np.uint8)
+        img[8 + i : 24 + i, 8 + 2 * i : 24 + 2 * i] = 255
+        frame = av.VideoFrame.from_ndarray(img, format="rgb24")
+        frame.pts = i
+        packets += encoder.encode(frame)
+    packets += encoder.encode(None)
+    return [bytes(packet) for packet in packets]
+
+
+def test_vp8_upper_temporal_layer_is_droppable():
+    tracker = Vp8ReferenceTracker()
+    flags = [tracker.is_droppable(data) for data in encode_vp8(VP8_L1T2_OPTIONS)]
+
+    assert flags == [i % 2 == 1 for i in range(len(flags))]
+
+
+def test_vp8_without_temporal_layers_is_decoded():
+    tracker = Vp8ReferenceTracker()
+    packets = encode_vp8({"deadline": "realtime"})
+
+    assert not any(tracker.is_droppable(data) for data in packets)
+
+
+def test_vp8_unparseable_frame_is_decoded():
+    tracker = Vp8ReferenceTracker()
+
+    assert not tracker.is_droppable(b"\x01")
+    assert not tracker.is_droppable(b"")
+
+
+NON_REF = nal(NON_REF_SLICE)
+REF = nal(REF_SLICE)
+
+
+def admit(gate: DecodeGate, data: bytes, frame: int, codec: str = "H264") -> bool:
+    return gate.admit(codec, CLOCK_RATE, data, frame * TICKS_PER_FRAME)
+
+
+def test_gate_drops_early_non_reference_frames():
+    gate = DecodeGate(interval_sec=1 / 15)
+
+    admitted = [admit(gate, NON_REF, i) for i in range(6)]
+
+    assert admitted == [True, False, True, False, True, False]
+    assert gate.stats() == {"frames": 6, "dropped": 3}
+
+
+def test_gate_always_decodes_reference_frames():
+    gate = DecodeGate(interval_sec=1 / 15)
+
+    assert all(admit(gate, REF, i) for i in range(6))
+    assert all(admit(gate, NON_REF, i, codec="VP9") for i in range(6, 12))
+    assert gate.dropped == 0
+
+
+def test_gate_admits_frames_within_tolerance():
+    gate = DecodeGate(interval_sec=0.1, tolerance_sec=0.01)
+
+    assert gate.admit("H264", CLOCK_RATE, NON_REF, 0)
+    assert not gate.admit("H264", CLOCK_RATE, NON_REF, int(0.08 * CLOCK_RATE))
+    assert gate.admit("H264", CLOCK_RATE, NON_REF, int(0.095 * CLOCK_RATE))
+
+
+def test_gate_follows_interval_changes_and_resets():
+    gate = DecodeGate(interval_sec=1 / 15)
+    admit(gate, NON_REF, 0)
+
+    gate.interval_sec = 0.5
+    assert not admit(gate, NON_REF, 2)
+    assert admit(gate, NON_REF, 15)
+
+    gate.reset()
+    assert admit(gate, NON_REF, 16)
+    # Timestamps that go backwards restart the schedule
+    assert admit(gate, NON_REF, 3)
+
+
+def test_gate_rejects_invalid_parameters():
+    with pytest.raises(ValueError):
+        DecodeGate(interval_sec=-1)
+    with pytest.raises(ValueError):
+        DecodeGate(interval_sec=0.1, tolerance_sec=-0.01)
+    gate = DecodeGate(interval_sec=0.1)
+    with pytest.raises(ValueError):
+        gate.interval_sec = -0.1
+
+
+class FakeCodec:
+    name = "H264"
+    clockRate = CLOCK_RATE
+
+
+class FakeFrame:
+    def __init__(self, data: bytes, timestamp: int):
+        self.data = data
+        self.timestamp = timestamp
+
+
+def test_aiortc_receiver_feeds_a_private_decoder_queue():
+    """
+    install_decode_gate depends on these aiortc internals. If this fails after
+    an aiortc upgrade, update the gate and the aiortc pin in pyproject.toml.
+    """
+    source = inspect.getsource(RTCRtpReceiver)
+    assert "self.__decoder_queue: queue.Queue = queue.Queue()" in source
+    assert "self.__decoder_queue.put((codec, encoded_frame))" in source
+
+    async def check() -> None:
+        pc = RTCPeerConnection()
+        try:
+            pc.addTransceiver("video", direction="recvonly")
+            (receiver,) = pc.getReceivers()
+            decoder_queue = getattr(receiver, "_RTCRtpReceiver__decoder_queue", None)
+            assert isinstance(decoder_queue, queue.Queue)
+        finally:
+            await pc.close()
+
+    asyncio.run(check())
+
+
+def test_install_decode_gate_filters_decoder_queue():
+    async def check() -> None:
+        pc = RTCPeerConnection()
+        try:
+            pc.addTransceiver("video", direction="recvonly")
+            (receiver,) = pc.getReceivers()
+            decoder_queue = receiver._RTCRtpReceiver__decoder_queue
+
+            gate = install_decode_gate(receiver, 1 / 15)
+            assert gate is not None
+            for i in range(4):
+                decoder_queue.put((FakeCodec, FakeFrame(NON_REF, i * TICKS_PER_FRAME)))
+            decoder_queue.put(None)
+
+            tasks = [decoder_queue.get_nowait() for _ in range(decoder_queue.qsize())]
+            assert [task[1].timestamp if task else None for task in tasks] == [
+                0,
+                2 * TICKS_PER_FRAME,
+                None,
+            ]
+        finally:
+            await pc.close()
+
+    asyncio.run(check())
+
+
+def test_install_decode_gate_without_decoder_queue():
+    assert install_decode_gate(object(), 1 / 15) is None
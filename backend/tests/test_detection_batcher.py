@@ -0,0 +1,205 @@
+import threading
+import time
+
+import numpy as np
+import pytest
+
+from app.services.detection_batcher import BatchingObjectDetector
+from app.services.object_detector import Detections
+
+
+class StubYoloDetector:
+    """Returns one detection per image whose confidence encodes the image id."""
+
+    def __init__(self, num_sessions: int = 1):
+        self.num_sessions = num_sessions
+        self.batches: list[tuple[int, tuple, int]] = []
+        self.release = threading.Event()
+        self.release.set()
+        self.running = threading.Event()
+        self.closed = False
+
+    def input_shape(self, img_shape, input_size=None):
+        return (input_size or 640, input_size or 640)
+
+    def detect_batch(self, imgs, normalize, conf_threshold, iou_threshold, input_size):
+        self.running.set()
+        self.release.wait(5)
+        self.batches.append(
+            (len(imgs), (normalize, conf_threshold, iou_threshold), input_size)
+        )
+        if conf_threshold < 0:
+            raise ValueError("conf_threshold must be between 0 and 1.")
+        return [
+            Detections(
+                np.zeros((1, 4), dtype=np.float32),
+                np.array([img[0, 0, 0]], dtype=np.float32),
+                np.zeros(1, dtype=np.intp),
+            )
+            for img in imgs
+        ]
+
+    def stats(self):
+        return {}
+
+    def close(self):
+        self.closed = True
+
+
+def image(value: int) -> np.ndarray:
+    return np.full((4, 4, 3), value, dtype=np.uint8)
+
+
+def test_results_go_back_to_their_callers():
+    batcher = BatchingObjectDetector(StubYoloDetector(), max_wait_ms=20)
+    try:
+        futures = [batcher._submit(image(i), (True, 0.3, 0.5, None)) for i in range(5)]
+        confs = [future.result(5).confs[0] for future in futures]
+    finally:
+        batcher.close()
+
+    assert confs == [0, 1, 2, 3, 4]
+
+
+def test_requests_are_grouped_by_parameters_and_input_shape():
+    detector = StubYoloDetector()
+    detector.release.clear()
+    batcher = BatchingObjectDetector(detector, max_wait_ms=20)
+    try:
+        # Hold the worker so the next requests land in one collected batch
+        blocker = batcher._submit(image(0), (True, 0.3, 0.5, None))
+        assert detector.running.wait(5)
+        futures = [
+            batcher._submit(image(1), (True, 0.3, 0.5, None)),
+            batcher._submit(image(2), (True, 0.3, 0.5, 320)),
+            batcher._submit(image(3), (True, 0.5, 0.5, None)),
+            batcher._submit(image(4), (True, 0.3, 0.5, None)),
+        ]
+        detector.release.set()
+        for future in [blocker, *futures]:
+            future.result(5)
+    finally:
+        batcher.close()
+
+    assert sorted(detector.batches[1:]) == [
+        (1, (True, 0.3, 0.5), 320),
+        (1, (True, 0.5, 0.5), None),
+        (2, (True, 0.3, 0.5), None),
+    ]
+    assert batcher.stats()["batches"] == 2
+
+
+def test_idle_workers_do_not_split_concurrent_frames():
+    detector = StubYoloDetector(num_sessions=4)
+    batcher = BatchingObjectDetector(detector, max_batch_size=8, max_wait_ms=50)
+    try:
+        futures = []
+        for i in range(4):
+            futures.append(batcher._submit(image(i), (True, 0.3, 0.5, None)))
+            time.sleep(0.005)
+        for future in futures:
+            future.result(5)
+    finally:
+        batcher.close()
+
+    assert [size for size, _, _ in detector.batches] == [4]
+
+
+def test_frames_queued_while_workers_are_busy_form_one_batch():
+    detector = StubYoloDetector(num_sessions=1)
+    detector.release.clear()
+    batcher = BatchingObjectDetector(detector, max_batch_size=8, max_wait_ms=0)
+    try:
+        first = batcher._submit(image(0), (True, 0.3, 0.5, None))
+        assert detector.running.wait(5)
+        queued = [batcher._submit(image(i), (True, 0.3, 0.5, None)) for i in range(6)]
+        detector.release.set()
+        for future in [first, *queued]:
+            future.result(5)
+    finally:
+        batcher.close()
+
+    assert [size for size, _, _ in detector.batches] == [1, 6]
+    assert batcher.avg_batch_size == 3.5
+
+
+def test_cancelled_requests_are_not_run_or_counted():
+    detector = StubYoloDetector()
+    detector.release.clear()
+    batcher = BatchingObjectDetector(detector, max_wait_ms=0)
+    try:
+        first = batcher._submit(image(0), (True, 0.3, 0.5, None))
+        assert detector.running.wait(5)
+        cancelled = batcher._submit(image(1), (True, 0.3, 0.5, None))
+        kept = batcher._submit(image(2), (True, 0.3, 0.5, None))
+        assert cancelled.cancel()
+        detector.release.set()
+        first.result(5)
+        kept.result(5)
+    finally:
+        batcher.close()
+
+    assert [size for size, _, _ in detector.batches] == [1, 1]
+    assert batcher.stats()["avg_batch_size"] == 1.0
+
+
+def test_inference_errors_reach_the_caller():
+    batcher = BatchingObjectDetector(StubYoloDetector())
+    try:
+        with pytest.raises(ValueError):
+            batcher.detect(image(0), conf_threshold=-1.0)
+    finally:
+        batcher.close()
+
+
+def test_close_stops_workers_and_rejects_new_requests():
+    detector = StubYoloDetector(num_sessions=2)
+    batcher = BatchingObjectDetector(detector)
+    batcher.close()
+    batcher.close()
+
+    assert detector.closed
+    assert not any(worker.is_alive() for worker in batcher._batcher._workers)
+    with pytest.raises(RuntimeError):
+        batcher.detect(image(0))
+
+
+def test_invalid_parameters():
+    with pytest.raises(ValueError):
+        BatchingObjectDetector(StubYoloDetector(), max_batch_size=0)
+    with pytest.raises(ValueError):
+        BatchingObjectDetector(StubYoloDetector(), max_wait_ms=-1)
+
+
+def test_input_shape_errors_reach_the_caller():
+    class BadShapeDetector(StubYoloDetector):
+        def input_shape(self, img_shape, input_size=None):
+            if input_size == 7:
+                raise ValueError("input_size must be a multiple of 32.")
+            return super().input_shape(img_shape, input_size)
+
+    batcher = BatchingObjectDetector(BadShapeDetector(), max_wait_ms=20)
+    try:
+        bad = batcher._submit(image(0), (True, 0.3, 0.5, 7))
+        good = batcher._submit(image(1), (True, 0.3, 0.5, None))
+        with pytest.raises(ValueError):
+            bad.result(5)
+        assert good.result(5).confs[0] == 1
+    finally:
+        batcher.close()
+
+
+def test_workers_survive_unexpected_batch_errors():
+    class BrokenResultsDetector(StubYoloDetector):
+        def detect_batch(self, imgs, *args, **kwargs):
+            results = super().detect_batch(imgs, *args, **kwargs)
+            # A batch result that is not a list escapes the per-group handling
+            return None if imgs[0][0, 0, 0] == 0 else results
+
+    batcher = BatchingObjectDetector(BrokenResultsDetector(), max_wait_ms=0)
+    try:
+        with pytest.raises(RuntimeError):
+            batcher._submit(image(0), (True, 0.3, 0.5, None)).result(5)
+        assert batcher.detect(image(2)).confs[0] == 2
+    finally:
+        batcher.close()
@@ -0,0 +1,70 @@
+from pathlib import Path
+
+import pytest
+
+from app.services import execution_providers
+from app.services.execution_providers import (
+    CPU_PROVIDER,
+    ProviderBenchmark,
+    select_provider,
+)
+
+OPENVINO = "OpenVINOExecutionProvider"
+XNNPACK = "XnnpackExecutionProvider"
+MODEL = Path("yolov8n.onnx")
+
+
+@pytest.fixture
+def installed(monkeypatch):
+    def install(providers, latencies):
+        monkeypatch.setattr(
+            execution_providers.ort, "get_available_providers", lambda: providers
+        )
+
+        def benchmark(model_path, provider, intra_op_num_threads, input_size):
+            latency = latencies[provider]
+            if latency is None:
+                return ProviderBenchmark(provider, error="failed")
+            return ProviderBenchmark(provider, latency_ms=latency)
+
+        monkeypatch.setattr(execution_providers, "benchmark_provider", benchmark)
+
+    return install
+
+
+def test_auto_picks_the_fastest_provider_that_ran(installed):
+    installed(
+        [CPU_PROVIDER, OPENVINO, XNNPACK],
+        {CPU_PROVIDER: 4.0, OPENVINO: None, XNNPACK: 3.0},
+    )
+
+    provider, results = select_provider(MODEL, "auto", 2, 640)
+
+    assert provider == XNNPACK
+    assert [r.provider for r in results] == [
+        CPU_PROVIDER,
+        "DnnlExecutionProvider",
+        OPENVINO,
+        XNNPACK,
+    ]
+    assert results[1].error == "not installed"
+
+
+def test_auto_falls_back_to_cpu_when_every_benchmark_fails(installed):
+    installed([CPU_PROVIDER, OPENVINO], {CPU_PROVIDER: None, OPENVINO: None})
+
+    provider, results = select_provider(MODEL, "auto", 2, 640)
+
+    assert provider == CPU_PROVIDER
+    assert all(r.latency_ms is None for r in results)
+
+
+def test_missing_provider_falls_back_to_cpu(installed):
+    installed([CPU_PROVIDER], {})
+
+    assert select_provider(MODEL, "openvino", 2, 640) == (CPU_PROVIDER, [])
+
+
+def test_unknown_provider():
+    with pytest.raises(ValueError):
+        select_provider(MODEL, "tpu", 2, 640)
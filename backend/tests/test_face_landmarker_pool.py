@@ -0,0 +1,130 @@
+import asyncio
+import threading
+import time
+
+import pytest
+
+from app.services.face_landmarker import FaceLandmarkResult
+from app.services.face_landmarker_pool import FaceLandmarkerPool, PoolExhaustedError
+
+
+class StubLandmarker:
+    def __init__(self):
+        self.resets = 0
+        self.closed = False
+
+    def detect(self, image, timestamp_ms=None):
+        return FaceLandmarkResult.empty()
+
+    def reset(self):
+        self.resets += 1
+
+    def close(self):
+        self.closed = True
+
+
+def make_pool(max_size: int = 2, prewarm: int = 1) -> FaceLandmarkerPool:
+    return FaceLandmarkerPool(
+        StubLandmarker, max_size=max_size, acquire_timeout_sec=0.05, prewarm=prewarm
+    )
+
+
+def test_sessions_get_distinct_instances_up_to_max_size():
+    pool = make_pool()
+
+    first = pool.acquire("a")
+    second = pool.acquire("b")
+
+    assert first is not second
+    assert pool.stats()["instances"] == 2
+    assert pool.stats()["saturation"] == 1.0
+
+
+def test_saturated_pool_raises_pool_exhausted():
+    pool = make_pool(max_size=1)
+    pool.acquire("a")
+
+    with pytest.raises(PoolExhaustedError):
+        pool.acquire("b")
+    assert pool.stats()["rejected"] == 1
+    assert pool.stats()["saturated_waits"] == 1
+
+
+def test_released_instance_is_reset_and_reused():
+    pool = make_pool(max_size=1)
+    landmarker = pool.acquire("a")
+    pool.release("a")
+
+    assert pool.acquire("b") is landmarker
+    assert landmarker.resets == 2
+
+
+def test_release_without_lease_is_a_no_op():
+    pool = make_pool()
+    pool.release("missing")
+    assert pool.stats()["leased"] == 0
+
+
+def test_closed_pool_is_not_exhausted():
+    pool = make_pool()
+    landmarker = pool.acquire("a")
+    pool.close()
+
+    assert landmarker.closed
+    with pytest.raises(RuntimeError) as exc_info:
+        pool.acquire("b")
+    assert not isinstance(exc_info.value, PoolExhaustedError)
+
+
+def test_invalid_parameters():
+    with pytest.raises(ValueError):
+        FaceLandmarkerPool(StubLandmarker, max_size=1, prewarm=2)
+    with pytest.raises(ValueError):
+        FaceLandmarkerPool(StubLandmarker, acquire_timeout_sec=-1)
+
+
+def test_duplicate_session_id_never_shares_an_instance():
+    pool = make_pool()
+    pool.acquire("a")
+
+    with pytest.raises(RuntimeError) as exc_info:
+        pool.acquire("a")
+    assert not isinstance(exc_info.value, PoolExhaustedError)
+    assert pool.stats()["leased"] == 1
+
+
+def test_duplicate_session_id_waits_for_release():
+    pool = FaceLandmarkerPool(StubLandmarker, max_size=2, acquire_timeout_sec=5.0)
+    first = pool.acquire("a")
+
+    timer = threading.Timer(0.05, pool.release, args=("a",))
+    timer.start()
+    second = pool.acquire("a")
+    timer.join()
+
+    assert second is first
+    assert pool.stats()["leased"] == 1
+    pool.release("a")
+    assert pool.stats()["idle"] == 1
+
+
+def test_cancelled_async_acquire_hands_back_a_late_lease():
+    pool = FaceLandmarkerPool(StubLandmarker, max_size=1, acquire_timeout_sec=5.0)
+    pool.acquire("a")
+
+    async def run() -> None:
+        task = asyncio.create_task(pool.acquire_async("b"))
+        await asyncio.sleep(0.01)
+        task.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await task
+        # The executor thread gets the instance only after the caller left
+        pool.release("a")
+        deadline = time.perf_counter() + 5
+        while pool.stats()["idle"] == 0 and time.perf_counter() < deadline:
+            await asyncio.sleep(0.01)
+
+    asyncio.run(run())
+
+    assert pool.stats()["leased"] == 0
+    assert pool.stats()["idle"] == 1
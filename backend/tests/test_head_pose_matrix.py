@@ -0,0 +1,67 @@
+import math
+
+import numpy as np
+import pytest
+
+from app.services.metrics.utils.head_pose_matrix import (
+    compute_head_pose_angles_matrix,
+)
+
+
+def _rx(deg):
+    c, s = math.cos(math.radians(deg)), math.sin(math.radians(deg))
+    return np.array([[1, 0, 0], [0, c, -s], [0, s, c]])
+
+
+def _ry(deg):
+    c, s = math.cos(math.radians(deg)), math.sin(math.radians(deg))
+    return np.array([[c, 0, s], [0, 1, 0], [-s, 0, c]])
+
+
+def _rz(deg):
+    c, s = math.cos(math.radians(deg)), math.sin(math.radians(deg))
+    return np.array([[c, -s, 0], [s, c, 0], [0, 0, 1]])
+
+
+def _transform(yaw, pitch, roll, scale=1.0, translation=(0.0, 0.0, 0.0)):
+    matrix = np.eye(4)
+    matrix[:3, :3] = scale * (_rz(roll) @ _ry(yaw) @ _rx(pitch))
+    matrix[:3, 3] = translation
+    return matrix
+
+
+def test_identity_is_frontal():
+    assert compute_head_pose_angles_matrix(np.eye(4)) == pytest.approx((0, 0, 0))
+
+
+@pytest.mark.parametrize(
+    "yaw, pitch, roll",
+    [(30, 0, 0), (0, -20, 0), (0, 0, 15), (-25, 10, -5), (40, 25, 20)],
+)
+def test_decomposes_rotation_in_2d_sign_convention(yaw, pitch, roll):
+    angles = compute_head_pose_angles_matrix(_transform(yaw, pitch, roll))
+
+    assert angles == pytest.approx((-yaw, -pitch, -roll))
+
+
+def test_ignores_scale_and_translation():
+    expected = compute_head_pose_angles_matrix(_transform(-25, 10, -5))
+
+    angles = compute_head_pose_angles_matrix(
+        _transform(-25, 10, -5, scale=3.5, translation=(1.0, -2.0, -40.0))
+    )
+
+    assert angles == pytest.approx(expected)
+
+
+def test_accepts_rotation_only_matrix():
+    matrix = _transform(12, -8, 4)
+
+    assert compute_head_pose_angles_matrix(matrix[:3, :3]) == pytest.approx(
+        compute_head_pose_angles_matrix(matrix)
+    )
+
+
+def test_matrix_without_rotation_is_rejected():
+    with pytest.raises(ValueError):
+        compute_head_pose_angles_matrix(np.zeros((4, 4)))
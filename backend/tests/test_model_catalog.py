@@ -0,0 +1,70 @@
+from pathlib import Path
+
+import pytest
+
+from app.services.model_catalog import (
+    MANIFEST_PATH,
+    ModelManifest,
+    ModelVariant,
+    resolve_model_variant,
+    save_manifest,
+)
+
+
+def variant(name: str, latency_ms, recall=None) -> ModelVariant:
+    return ModelVariant(
+        name=name,
+        file=f"{name}.onnx",
+        base_model="yolov8n",
+        latency_ms=latency_ms,
+        accuracy={} if recall is None else {"phone_recall": recall},
+    )
+
+
+@pytest.fixture
+def models_dir(tmp_path: Path) -> Path:
+    save_manifest(
+        ModelManifest(
+            variants=[
+                variant("fp32", 12.0, 0.92),
+                variant("int8", 6.0, 0.92),
+                variant("int8_320", 3.0, 0.85),
+                variant("unmeasured", None, 0.99),
+                variant("unranked", 1.0),
+            ]
+        ),
+        tmp_path / MANIFEST_PATH.name,
+    )
+    (tmp_path / "yolov8n.onnx").touch()
+    return tmp_path
+
+
+def test_auto_picks_most_accurate_then_fastest(models_dir):
+    selected, path = resolve_model_variant("auto", models_dir=models_dir)
+
+    assert selected.name == "int8"
+    assert path == models_dir / "int8.onnx"
+
+
+def test_auto_respects_the_latency_budget(models_dir):
+    selected, _ = resolve_model_variant("auto", 5.0, models_dir=models_dir)
+
+    assert selected.name == "int8_320"
+
+
+def test_auto_without_a_fitting_variant_uses_the_default(models_dir):
+    selected, path = resolve_model_variant("auto", 0.5, models_dir=models_dir)
+
+    assert selected.name == "yolov8n"
+    assert path == models_dir / "yolov8n.onnx"
+
+
+def test_named_variants_and_plain_model_files(models_dir):
+    assert (
+        resolve_model_variant("unmeasured", models_dir=models_dir)[0].latency_ms is None
+    )
+    assert resolve_model_variant("yolov8n", models_dir=models_dir)[0].file == (
+        "yolov8n.onnx"
+    )
+    with pytest.raises(ValueError):
+        resolve_model_variant("missing", models_dir=models_dir)
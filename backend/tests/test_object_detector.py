@@ -0,0 +1,127 @@
+import asyncio
+import threading
+from pathlib import Path
+
+import numpy as np
+import onnx
+import pytest
+from onnx import TensorProto, helper, numpy_helper
+
+from app.services import object_detector
+from app.services.object_detector import ESSENTIAL_CLASSES, YoloObjectDetector
+from app.services.utils.image_utils import LetterboxPreprocessor
+
+PHONE = ESSENTIAL_CLASSES[0]
+
+
+@pytest.fixture
+def yolo_model(tmp_path: Path) -> Path:
+    """
+    Stand-in YOLOv8 model: every anchor of the (N, 84, A) output predicts
+    the same phone box at the centre of a 640x640 input.
+    """
+    bias = np.zeros(84, dtype=np.float32)
+    bias[:4] = [320, 320, 40, 80]
+    bias[4 + PHONE] = 0.9
+    graph = helper.make_graph(
+        [
+            helper.make_node(
+                "Conv", ["images", "weights", "bias"], ["grid"], strides=[32, 32]
+            ),
+            helper.make_node("Reshape", ["grid", "rows"], ["output0"]),
+        ],
+        "yolo",
+        [
+            helper.make_tensor_value_info(
+                "images", TensorProto.FLOAT, ["N", 3, "H", "W"]
+            )
+        ],
+        [helper.make_tensor_value_info("output0", TensorProto.FLOAT, None)],
+        [
+            numpy_helper.from_array(np.zeros((84, 3, 1, 1), np.float32), "weights"),
+            numpy_helper.from_array(bias, "bias"),
+            numpy_helper.from_array(np.array([0, 84, -1], np.int64), "rows"),
+        ],
+    )
+    model = helper.make_model(graph, opset_imports=[helper.make_opsetid("", 13)])
+    model.ir_version = 8
+    path = tmp_path / "yolo.onnx"
+    onnx.save(model, str(path))
+    return path
+
+
+class RecordingPreprocessor(LetterboxPreprocessor):
+    threads: list[int] = []
+    gate = threading.Event()
+
+    def __call__(self, imgs, shape):
+        self.threads.append(threading.get_ident())
+        self.gate.wait(5)
+        return super().__call__(imgs, shape)
+
+
+@pytest.fixture
+def recording_preprocessor(monkeypatch):
+    RecordingPreprocessor.threads = []
+    RecordingPreprocessor.gate = threading.Event()
+    RecordingPreprocessor.gate.set()
+    monkeypatch.setattr(object_detector, "LetterboxPreprocessor", RecordingPreprocessor)
+    return RecordingPreprocessor
+
+
+def test_async_run_preprocesses_off_the_event_loop(yolo_model, recording_preprocessor):
+    detector = YoloObjectDetector(yolo_model, num_sessions=1, async_run=True)
+    frame = np.zeros((640, 640, 3), dtype=np.uint8)
+
+    async def run():
+        return threading.get_ident(), await detector.detect_async(frame)
+
+    try:
+        loop_thread, detections = asyncio.run(run())
+    finally:
+        detector.close()
+
+    assert recording_preprocessor.threads
+    assert loop_thread not in recording_preprocessor.threads
+    assert detections.class_ids.tolist() == [PHONE]
+    np.testing.assert_allclose(detections.boxes, [[0.46875, 0.4375, 0.53125, 0.5625]])
+
+
+def test_cancelled_async_run_returns_the_session(yolo_model, recording_preprocessor):
+    detector = YoloObjectDetector(yolo_model, num_sessions=1, async_run=True)
+    frame = np.zeros((640, 640, 3), dtype=np.uint8)
+
+    async def run():
+        recording_preprocessor.gate.clear()
+        task = asyncio.create_task(detector.detect_async(frame))
+        while not recording_preprocessor.threads:
+            await asyncio.sleep(0.001)
+        task.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await task
+
+        # The single session is back once the preprocessing thread finishes
+        recording_preprocessor.gate.set()
+        return await asyncio.wait_for(detector.detect_async(frame), timeout=5)
+
+    try:
+        assert len(asyncio.run(run())) == 1
+    finally:
+        detector.close()
+
+
+def test_full_postprocess_matches_the_essential_path():
+    output = np.zeros((1, 84, 4), dtype=np.float32)
+    # Two overlapping phones, one separate phone and a lone non-essential box
+    output[0, :4] = np.array(
+        [[100, 102, 300, 500], [100, 100, 300, 40], [40, 42, 40, 40], [40, 40, 40, 40]]
+    )
+    output[0, 4 + PHONE] = [0.9, 0.8, 0.7, 0.0]
+    output[0, 4 + 1, 3] = 0.95
+    params = ((640, 640), 1.0, (0, 0), 0.3, 0.5)
+
+    full = YoloObjectDetector._postprocess(output, *params)
+    essential = YoloObjectDetector._postprocess_essential(output, *params)
+
+    np.testing.assert_allclose(full.boxes, essential.boxes)
+    np.testing.assert_allclose(full.confs, [0.9, 0.7])
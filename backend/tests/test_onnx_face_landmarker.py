@@ -0,0 +1,172 @@
+from concurrent.futures import Future
+from pathlib import Path
+
+import numpy as np
+import onnx
+import pytest
+from onnx import TensorProto, helper, numpy_helper
+
+from app.services.onnx_face_landmarker import (
+    DETECTOR_INPUT_SIZE,
+    MESH_INPUT_SIZE,
+    NUM_MESH_LANDMARKS,
+    FaceRoi,
+    OnnxFaceLandmarker,
+    OnnxFaceMeshModel,
+    ssd_anchors,
+)
+
+
+def save_model(path: Path, nodes, inputs, outputs, initializers) -> Path:
+    graph = helper.make_graph(
+        nodes,
+        path.stem,
+        inputs,
+        outputs,
+        [numpy_helper.from_array(value, name) for value, name in initializers],
+    )
+    model = helper.make_model(graph, opset_imports=[helper.make_opsetid("", 13)])
+    model.ir_version = 8
+    onnx.save(model, str(path))
+    return path
+
+
+def brightness_nodes(input_name: str) -> list:
+    """Mean of the input per image, as an (N, 1) tensor named "mean"."""
+    return [
+        helper.make_node("ReduceMean", [input_name], ["reduced"], axes=[1, 2, 3]),
+        helper.make_node("Reshape", ["reduced", "column"], ["mean"]),
+    ]
+
+
+@pytest.fixture
+def face_mesh_model(tmp_path: Path):
+    """
+    Stand-in models: bright images contain a face, dark ones do not.
+    The detector finds a 40 px face at every anchor, the mesh returns
+    its presence score from the crop brightness.
+    """
+    num_anchors = len(ssd_anchors())
+    regressors = np.zeros((1, num_anchors, 16), dtype=np.float32)
+    regressors[..., 2:4] = 40.0
+    regressors[..., 4:8] = [-10.0, 0.0, 10.0, 0.0]
+    detector = save_model(
+        tmp_path / "detector.onnx",
+        [
+            *brightness_nodes("input"),
+            helper.make_node("Mul", ["mean", "zero"], ["zeros"]),
+            helper.make_node("Add", ["zeros", "boxes"], ["regressors"]),
+            helper.make_node("Mul", ["mean", "score_scale"], ["scores"]),
+        ],
+        [
+            helper.make_tensor_value_info(
+                "input",
+                TensorProto.FLOAT,
+                [1, DETECTOR_INPUT_SIZE, DETECTOR_INPUT_SIZE, 3],
+            )
+        ],
+        [
+            helper.make_tensor_value_info("regressors", TensorProto.FLOAT, None),
+            helper.make_tensor_value_info("scores", TensorProto.FLOAT, None),
+        ],
+        [
+            (np.array([1, 1, 1], dtype=np.int64), "column"),
+            (np.zeros((1, 1, 1), dtype=np.float32), "zero"),
+            (regressors, "boxes"),
+            (np.full((1, num_anchors, 1), 10.0, dtype=np.float32), "score_scale"),
+        ],
+    )
+    mesh = save_model(
+        tmp_path / "mesh.onnx",
+        [
+            *brightness_nodes("input"),
+            helper.make_node("Mul", ["mean", "ones"], ["landmarks"]),
+            helper.make_node("Mul", ["mean", "ten"], ["scaled"]),
+            helper.make_node("Add", ["scaled", "minus_five"], ["presence"]),
+        ],
+        [
+            helper.make_tensor_value_info(
+                "input", TensorProto.FLOAT, ["N", MESH_INPUT_SIZE, MESH_INPUT_SIZE, 3]
+            )
+        ],
+        [
+            helper.make_tensor_value_info("landmarks", TensorProto.FLOAT, ["N", None]),
+            helper.make_tensor_value_info("presence", TensorProto.FLOAT, ["N", 1]),
+        ],
+        [
+            (np.array([-1, 1], dtype=np.int64), "column"),
+            (np.ones((1, NUM_MESH_LANDMARKS * 3), dtype=np.float32), "ones"),
+            (np.array([[10.0]], dtype=np.float32), "ten"),
+            (np.array([[-5.0]], dtype=np.float32), "minus_five"),
+        ],
+    )
+    model = OnnxFaceMeshModel(detector, mesh, max_wait_ms=5.0)
+    yield model
+    model.close()
+
+
+BRIGHT = np.full((240, 320, 3), 255, dtype=np.uint8)
+DARK = np.zeros((240, 320, 3), dtype=np.uint8)
+
+
+def test_detects_landmarks_of_a_face(face_mesh_model):
+    landmarker = OnnxFaceLandmarker(face_mesh_model)
+
+    result = landmarker.detect(BRIGHT)
+
+    assert result.landmarks.shape == (NUM_MESH_LANDMARKS, 2)
+    assert face_mesh_model.stats()["face_detections"] == 1
+
+
+def test_no_face_gives_an_empty_result(face_mesh_model):
+    landmarker = OnnxFaceLandmarker(face_mesh_model)
+
+    assert len(landmarker.detect(DARK).landmarks) == 0
+
+
+def test_closed_model_rejects_crops(face_mesh_model):
+    face_mesh_model.close()
+
+    with pytest.raises(RuntimeError):
+        face_mesh_model.submit(np.zeros((MESH_INPUT_SIZE, MESH_INPUT_SIZE, 3)))
+
+
+class StuckMeshModel:
+    """A mesh model whose batches never complete."""
+
+    def __init__(self):
+        self.futures: list[Future] = []
+
+    def detect_face(self, img, min_confidence=0.5):
+        return FaceRoi(center=(160.0, 120.0), size=80.0, angle=0.0)
+
+    def submit(self, crop) -> Future:
+        future: Future = Future()
+        self.futures.append(future)
+        return future
+
+
+def test_mesh_timeout_gives_an_empty_result():
+    model = StuckMeshModel()
+    landmarker = OnnxFaceLandmarker(model, mesh_timeout_sec=0.01)
+
+    result = landmarker.detect(BRIGHT)
+
+    assert len(result.landmarks) == 0
+    assert [future.cancelled() for future in model.futures] == [True]
+
+
+def test_invalid_mesh_timeout():
+    with pytest.raises(ValueError):
+        OnnxFaceLandmarker(StuckMeshModel(), mesh_timeout_sec=0)
+
+
+def test_concurrent_crops_share_a_batch(face_mesh_model):
+    crop = np.full((MESH_INPUT_SIZE, MESH_INPUT_SIZE, 3), 255, dtype=np.uint8)
+    futures = [face_mesh_model.submit(crop) for _ in range(4)]
+
+    presence = [future.result(5)[1] for future in futures]
+
+    assert min(presence) > 0.9
+    assert face_mesh_model.stats()["batches"] == 1
+    assert face_mesh_model.avg_batch_size == 4.0
@@ -0,0 +1,59 @@
+import numpy as np
+import onnxruntime as ort
+
+from app.services.onnx_model_cache import OptimizedModelCache
+from app.services.onnx_session_pool import OnnxSessionPool
+
+
+def run(pool: OnnxSessionPool) -> np.ndarray:
+    x = np.ones((2, 32), dtype=np.float32)
+    with pool.acquire() as session:
+        return session.run(None, {"x": x})[0]
+
+
+def test_miss_then_hit_leaves_one_model_and_data_file(matmul_model, tmp_path):
+    cache_dir = tmp_path / "cache"
+
+    miss = OnnxSessionPool(matmul_model, cache_dir=cache_dir)
+    expected = run(miss)
+    miss.close()
+    hit = OnnxSessionPool(matmul_model, cache_dir=cache_dir)
+
+    assert miss.cache_status == "miss"
+    assert hit.cache_status == "hit"
+    np.testing.assert_allclose(run(hit), expected)
+    hit.close()
+
+    key = hit._cache_key
+    assert sorted(p.name for p in cache_dir.iterdir()) == [
+        f"{key}.data",
+        f"{key}.onnx",
+    ]
+
+
+def test_evict_removes_model_and_data_file(matmul_model, tmp_path):
+    cache_dir = tmp_path / "cache"
+    pool = OnnxSessionPool(matmul_model, cache_dir=cache_dir)
+    pool.close()
+
+    OptimizedModelCache(cache_dir).evict(pool._cache_key)
+
+    assert list(cache_dir.iterdir()) == []
+
+
+def test_discard_removes_staged_files(matmul_model, tmp_path):
+    cache = OptimizedModelCache(tmp_path / "cache")
+    key = cache.key(
+        matmul_model,
+        ["CPUExecutionProvider"],
+        ort.GraphOptimizationLevel.ORT_ENABLE_ALL,
+    )
+    sess_opts = ort.SessionOptions()
+    staging_dir = cache.prepare_save(sess_opts, key)
+    ort.InferenceSession(str(matmul_model), sess_options=sess_opts)
+
+    assert (staging_dir / f"{key}.data").exists()
+    cache.discard(staging_dir)
+
+    assert cache.lookup(key) is None
+    assert list(cache.cache_dir.iterdir()) == []
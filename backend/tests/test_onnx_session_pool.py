@@ -0,0 +1,144 @@
+import asyncio
+import threading
+import time
+
+import numpy as np
+import pytest
+
+from app.services.onnx_session_pool import OnnxSessionPool
+
+
+def test_sessions_are_borrowed_and_returned(matmul_model):
+    pool = OnnxSessionPool(matmul_model, size=2, thread_budget=2)
+    try:
+        with pool.acquire() as first, pool.acquire() as second:
+            assert first is not second
+            assert pool.stats()["busy_sessions"] == 2
+            y = first.run(None, {"x": np.ones((1, 32), dtype=np.float32)})[0]
+            assert y.shape == (1, 32)
+        stats = pool.stats()
+        assert (stats["busy_sessions"], stats["runs"]) == (0, 2)
+    finally:
+        pool.close()
+
+
+def test_acquire_waits_for_a_free_session(matmul_model):
+    pool = OnnxSessionPool(matmul_model, size=1)
+    acquired = threading.Event()
+
+    def borrow() -> None:
+        with pool.acquire():
+            acquired.set()
+            time.sleep(0.05)
+
+    thread = threading.Thread(target=borrow)
+    try:
+        thread.start()
+        acquired.wait(1)
+        start = time.perf_counter()
+        with pool.acquire():
+            waited = time.perf_counter() - start
+        thread.join()
+
+        assert waited >= 0.03
+        assert pool.stats()["max_wait_ms"] >= 30
+    finally:
+        pool.close()
+
+
+def test_acquire_async_resolves_waiters_in_order(matmul_model):
+    pool = OnnxSessionPool(matmul_model, size=1)
+
+    async def run() -> list[int]:
+        order = []
+        session = await pool.acquire_async()
+
+        async def waiter(i: int) -> None:
+            borrowed = await pool.acquire_async()
+            order.append(i)
+            pool.release(borrowed)
+
+        tasks = [asyncio.create_task(waiter(i)) for i in range(3)]
+        await asyncio.sleep(0.01)
+        pool.release(session)
+        await asyncio.gather(*tasks)
+        return order
+
+    try:
+        assert asyncio.run(run()) == [0, 1, 2]
+    finally:
+        pool.close()
+
+
+def test_cancelled_async_waiter_does_not_leak_the_session(matmul_model):
+    pool = OnnxSessionPool(matmul_model, size=1)
+
+    async def run() -> None:
+        session = await pool.acquire_async()
+        task = asyncio.create_task(pool.acquire_async())
+        await asyncio.sleep(0.01)
+        task.cancel()
+        pool.release(session)
+        with pytest.raises(asyncio.CancelledError):
+            await task
+        again = await asyncio.wait_for(pool.acquire_async(), timeout=1)
+        pool.release(again)
+
+    try:
+        asyncio.run(run())
+    finally:
+        pool.close()
+
+
+def test_close_reclaims_sessions_returned_before_the_timeout(matmul_model):
+    pool = OnnxSessionPool(matmul_model, size=1)
+    acquired = threading.Event()
+
+    def borrow() -> None:
+        with pool.acquire():
+            acquired.set()
+            time.sleep(0.05)
+
+    thread = threading.Thread(target=borrow)
+    thread.start()
+    acquired.wait(1)
+    start = time.perf_counter()
+    pool.close(timeout=2.0)
+    thread.join()
+
+    assert 0.02 <= time.perf_counter() - start < 1.0
+    assert pool.sessions == []
+
+
+def test_close_gives_up_on_sessions_that_are_never_returned(matmul_model):
+    pool = OnnxSessionPool(matmul_model, size=1)
+    leaked = pool._free.get()
+
+    start = time.perf_counter()
+    pool.close(timeout=0.05)
+
+    assert time.perf_counter() - start < 1.0
+    assert leaked is not None
+    with pytest.raises(RuntimeError):
+        with pool.acquire():
+            pass
+
+
+def test_closed_pool_fails_async_waiters(matmul_model):
+    pool = OnnxSessionPool(matmul_model, size=1)
+
+    async def run() -> None:
+        session = await pool.acquire_async()
+        task = asyncio.create_task(pool.acquire_async())
+        await asyncio.sleep(0.01)
+        threading.Thread(target=pool.close, kwargs={"timeout": 0.05}).start()
+        with pytest.raises(RuntimeError):
+            await asyncio.wait_for(task, timeout=1)
+        pool.release(session)
+
+    asyncio.run(run())
+
+
+def test_invalid_size(matmul_model):
+    with pytest.raises(ValueError):
+        OnnxSessionPool(matmul_model, size=0)
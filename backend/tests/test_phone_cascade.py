@@ -0,0 +1,94 @@
+import numpy as np
+import pytest
+
+from app.services.object_detector import Detections
+from app.services.phone_cascade import PhoneCascadeDetector
+
+PHONE = 67
+
+
+def detections(*class_ids: int) -> Detections:
+    n = len(class_ids)
+    return Detections(
+        np.tile(np.array([[0.1, 0.1, 0.3, 0.3]], dtype=np.float32), (n, 1)),
+        np.full(n, 0.9, dtype=np.float32),
+        np.array(class_ids, dtype=np.intp),
+    )
+
+
+class StubDetector:
+    def __init__(self, result: Detections):
+        self.result = result
+        self.calls = 0
+
+    def detect(self, img, **kwargs) -> Detections:
+        self.calls += 1
+        return self.result
+
+    async def detect_async(self, img, **kwargs) -> Detections:
+        return self.detect(img, **kwargs)
+
+    def stats(self):
+        return {}
+
+    def close(self):
+        pass
+
+
+IMG = np.zeros((32, 32, 3), dtype=np.uint8)
+
+
+def make_cascade(gate_sees: Detections, detector_sees: Detections):
+    detector, gate = StubDetector(detector_sees), StubDetector(gate_sees)
+    return PhoneCascadeDetector(detector, gate), detector, gate
+
+
+def test_closed_gate_skips_the_full_detector():
+    cascade, detector, gate = make_cascade(detections(), detections(PHONE))
+
+    assert len(cascade.detect(IMG)) == 0
+    assert (gate.calls, detector.calls) == (1, 0)
+    assert cascade.stats()["gate_miss_rate"] == 1.0
+
+
+def test_open_gate_runs_the_full_detector():
+    cascade, detector, gate = make_cascade(detections(PHONE), detections(PHONE))
+
+    assert len(cascade.detect(IMG)) == 1
+    assert (gate.calls, detector.calls) == (1, 1)
+    assert cascade.stats()["gate_hit_rate"] == 1.0
+
+
+def test_bypass_skips_the_gate_stage():
+    cascade, detector, gate = make_cascade(detections(), detections(PHONE))
+
+    assert len(cascade.detect(IMG, gate=False)) == 1
+    assert (gate.calls, detector.calls) == (0, 1)
+    stats = cascade.stats()
+    assert stats["gate_runs"] == 0
+    assert stats["gate_bypassed_runs"] == 1
+    assert stats["gate_missed_phone_rate"] == 0.0
+
+
+def test_sampled_bypass_counts_missed_phones():
+    cascade, detector, gate = make_cascade(detections(), detections(PHONE))
+
+    cascade.detect(IMG, gate=False, gate_sample=True)
+    cascade.detect(IMG, gate=False)
+
+    assert (gate.calls, detector.calls) == (1, 2)
+    assert cascade.stats()["gate_missed_phone_rate"] == 1.0
+
+
+def test_compute_saved_counts_every_call():
+    cascade, _, _ = make_cascade(detections(), detections(PHONE))
+    cascade.detect(IMG, gate=False)
+    for _ in range(3):
+        cascade.detect(IMG)
+
+    stats = cascade.stats()
+    assert stats["gate_runs"] == 3
+    expected = 4 * stats["avg_detector_ms"] - (
+        3 * stats["avg_gate_ms"] + stats["avg_detector_ms"]
+    )
+    assert stats["compute_saved_ms"] == pytest.approx(expected)
@@ -0,0 +1,130 @@
+import threading
+import time
+
+import pytest
+
+from app.services.request_batcher import BatchRequest, RequestBatcher
+
+
+class Doubler:
+    """Resolves each request with twice its item and records the batches."""
+
+    def __init__(self, delay: float = 0.0):
+        self.delay = delay
+        self.batches: list[list[int]] = []
+
+    def __call__(self, batch: list[BatchRequest[int]]) -> None:
+        self.batches.append([r.item for r in batch])
+        time.sleep(self.delay)
+        for request in batch:
+            request.future.set_result(request.item * 2)
+
+
+def make_batcher(run_batch, **kwargs) -> RequestBatcher[int]:
+    params = dict(max_batch_size=8, max_wait_ms=20, num_workers=1)
+    params.update(kwargs)
+    return RequestBatcher(run_batch, name="test", closed_message="closed", **params)
+
+
+def test_concurrent_requests_share_a_batch():
+    run_batch = Doubler()
+    batcher = make_batcher(run_batch, max_wait_ms=50)
+    try:
+        futures = [batcher.submit(i) for i in range(4)]
+
+        assert [future.result(5) for future in futures] == [0, 2, 4, 6]
+        assert run_batch.batches == [[0, 1, 2, 3]]
+        assert (batcher.batches, batcher.avg_batch_size) == (1, 4.0)
+    finally:
+        batcher.close()
+
+
+def test_batches_respect_max_batch_size():
+    run_batch = Doubler()
+    batcher = make_batcher(run_batch, max_batch_size=3, max_wait_ms=50)
+    try:
+        futures = [batcher.submit(i) for i in range(5)]
+        [future.result(5) for future in futures]
+
+        assert [len(batch) for batch in run_batch.batches] == [3, 2]
+    finally:
+        batcher.close()
+
+
+def test_requests_queued_while_workers_are_busy_form_one_batch():
+    run_batch = Doubler(delay=0.1)
+    batcher = make_batcher(run_batch, max_wait_ms=0)
+    try:
+        first = batcher.submit(0)
+        time.sleep(0.02)
+        rest = [batcher.submit(i) for i in range(1, 4)]
+        [future.result(5) for future in [first, *rest]]
+
+        assert run_batch.batches == [[0], [1, 2, 3]]
+    finally:
+        batcher.close()
+
+
+def test_cancelled_requests_are_skipped_and_not_counted():
+    release = threading.Event()
+    run_batch = Doubler()
+
+    def blocking(batch):
+        release.wait(5)
+        run_batch(batch)
+
+    batcher = make_batcher(blocking, max_wait_ms=0)
+    try:
+        busy = batcher.submit(0)
+        time.sleep(0.02)
+        cancelled = batcher.submit(1)
+        kept = batcher.submit(2)
+        assert cancelled.cancel()
+        release.set()
+
+        assert (busy.result(5), kept.result(5)) == (0, 4)
+        assert run_batch.batches == [[0], [2]]
+        assert (batcher.batches, batcher.requests) == (2, 2)
+    finally:
+        batcher.close()
+
+
+def test_failed_batches_reach_every_caller():
+    def failing(batch):
+        if batch[0].item == 0:
+            batch[0].future.set_exception(ValueError("bad item"))
+            raise KeyError("unexpected")
+        Doubler()(batch)
+
+    batcher = make_batcher(failing, max_wait_ms=50)
+    try:
+        first, second = batcher.submit(0), batcher.submit(1)
+
+        with pytest.raises(ValueError):
+            first.result(5)
+        with pytest.raises(RuntimeError):
+            second.result(5)
+        # The worker survives and keeps serving
+        assert batcher.submit(3).result(5) == 6
+    finally:
+        batcher.close()
+
+
+def test_close_stops_threads_and_rejects_new_requests():
+    batcher = make_batcher(Doubler(), num_workers=2)
+    batcher.close()
+    batcher.close()
+
+    assert batcher.closed
+    assert not any(worker.is_alive() for worker in batcher._workers)
+    with pytest.raises(RuntimeError, match="closed"):
+        batcher.submit(0)
+
+
+def test_invalid_parameters():
+    with pytest.raises(ValueError):
+        make_batcher(Doubler(), max_batch_size=0)
+    with pytest.raises(ValueError):
+        make_batcher(Doubler(), max_wait_ms=-1)
+    with pytest.raises(ValueError):
+        make_batcher(Doubler(), num_workers=0)
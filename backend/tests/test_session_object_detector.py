@@ -0,0 +1,33 @@
+import numpy as np
+
+from app.services.object_detector import Detections
+from app.services.session_object_detector import SessionObjectDetector
+
+
+def test_map_roi_detections_to_normalized_frame_coordinates():
+    crop_detections = Detections(
+        np.array([[0, 0, 50, 100], [10, 20, 30, 40]], dtype=np.float32),
+        np.array([0.9, 0.4], dtype=np.float32),
+        np.array([67, 67], dtype=np.intp),
+    )
+
+    mapped = SessionObjectDetector._map_roi_detections(
+        crop_detections, (480, 640), (100, 60)
+    )
+
+    np.testing.assert_allclose(
+        mapped.boxes,
+        [
+            [100 / 640, 60 / 480, 150 / 640, 160 / 480],
+            [110 / 640, 80 / 480, 130 / 640, 100 / 480],
+        ],
+    )
+    np.testing.assert_array_equal(mapped.confs, crop_detections.confs)
+    np.testing.assert_array_equal(mapped.class_ids, crop_detections.class_ids)
+
+
+def test_map_roi_detections_without_detections():
+    mapped = SessionObjectDetector._map_roi_detections(
+        Detections.empty(), (480, 640), (100, 60)
+    )
+    assert len(mapped) == 0 and mapped.boxes.shape == (0, 4)
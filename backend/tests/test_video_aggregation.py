@@ -0,0 +1,63 @@
+import numpy as np
+
+from app.services.object_detector import Detections
+from app.services.video_aggregation import (
+    BucketAccumulator,
+    finalize_bucket,
+    update_detections,
+)
+
+
+def make_bucket() -> BucketAccumulator:
+    return BucketAccumulator(bucket_index=0, start_sec=0.0, end_sec=5.0)
+
+
+def test_finalize_bucket_averages_landmarks():
+    bucket = make_bucket()
+    for landmarks in ([0.1, 0.2, 0.3, 0.4], [0.3, 0.4, 0.5, 0.6]):
+        bucket.frame_count += 1
+        bucket.add_landmarks(np.array(landmarks))
+
+    group = finalize_bucket(bucket)
+
+    assert group.frame_count == 2
+    assert np.allclose(group.aggregate.face_landmarks, [0.2, 0.3, 0.4, 0.5])
+
+
+def test_add_landmarks_restarts_on_length_change():
+    bucket = make_bucket()
+    bucket.add_landmarks(np.array([1.0, 1.0]))
+    bucket.add_landmarks(np.array([0.5, 0.5, 0.5, 0.5]))
+
+    assert bucket.landmarks_count == 1
+    assert finalize_bucket(bucket).aggregate.face_landmarks == [0.5, 0.5, 0.5, 0.5]
+
+
+def test_finalize_bucket_without_landmarks():
+    bucket = make_bucket()
+    bucket.frame_count = 3
+
+    aggregate = finalize_bucket(bucket).aggregate
+
+    assert aggregate.face_landmarks is None
+    assert aggregate.object_detections is None
+    assert aggregate.metrics is None
+
+
+def test_update_detections_keeps_best_confidence_per_box():
+    unique = {}
+    box = [0.1, 0.1, 0.5, 0.5]
+    for conf in (0.4, 0.9, 0.6):
+        update_detections(
+            unique,
+            Detections(
+                np.array([box], dtype=np.float32),
+                np.array([conf], dtype=np.float32),
+                np.array([67]),
+            ),
+        )
+
+    assert len(unique) == 1
+    ((conf, _, class_id),) = unique.values()
+    assert class_id == 67
+    assert conf == np.float32(0.9)
@@ -0,0 +1,52 @@
+import asyncio
+import threading
+
+import numpy as np
+
+from app.services.face_landmarker import FaceLandmarkResult
+from app.services.object_detector import Detections
+from app.services.smoother import SequenceSmoother
+from app.services.video_processor import process_video_frame
+
+
+class StubFaceLandmarker:
+    def detect(self, img, timestamp_ms=None):
+        return FaceLandmarkResult(landmarks=np.full((478, 2), 0.5, np.float32))
+
+
+class StubSessionDetector:
+    async def detect_async(self, img, face_landmarks=None):
+        return Detections.empty()
+
+
+class RecordingMetricManager:
+    def __init__(self):
+        self.threads: list[int] = []
+
+    def update(self, frame_context):
+        self.threads.append(threading.get_ident())
+        return {"face_missing": False}
+
+
+def test_metrics_are_computed_off_the_event_loop():
+    metric_manager = RecordingMetricManager()
+
+    async def run():
+        inference, landmarks = await process_video_frame(
+            "2026-01-01T00:00:00+00:00",
+            np.zeros((240, 320, 3), dtype=np.uint8),
+            0,
+            StubFaceLandmarker(),
+            StubSessionDetector(),
+            metric_manager,
+            SequenceSmoother(),
+        )
+        return threading.get_ident(), inference, landmarks
+
+    loop_thread, inference, landmarks = asyncio.run(run())
+
+    assert metric_manager.threads and loop_thread not in metric_manager.threads
+    assert inference.metrics == {"face_missing": False}
+    assert (inference.resolution.width, inference.resolution.height) == (320, 240)
+    assert inference.mode == "active" and inference.object_detections == []
+    assert landmarks.shape == (478, 2)
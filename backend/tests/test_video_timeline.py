@@ -0,0 +1,41 @@
+from app.services.face_landmarker import STREAM_GAP_MS, VideoTimeline
+
+
+def test_first_stream_keeps_media_timestamps():
+    timeline = VideoTimeline()
+
+    assert [timeline.to_timeline(ts) for ts in (500, 533, 566)] == [500, 533, 566]
+
+
+def test_new_stream_continues_after_previous_one():
+    timeline = VideoTimeline()
+    timeline.to_timeline(0)
+    timeline.to_timeline(5000)
+
+    timeline.start_stream()
+
+    assert [timeline.to_timeline(ts) for ts in (0, 40, 80)] == [
+        5000 + STREAM_GAP_MS,
+        5040 + STREAM_GAP_MS,
+        5080 + STREAM_GAP_MS,
+    ]
+
+
+def test_backwards_timestamp_is_rebased_within_stream():
+    timeline = VideoTimeline()
+    timeline.to_timeline(1000)
+    timeline.to_timeline(1040)
+
+    assert timeline.to_timeline(1040) == 1041
+    assert timeline.to_timeline(10) == 1042
+    # Later frames keep their spacing from the rebased one
+    assert timeline.to_timeline(50) == 1082
+
+
+def test_wall_clock_timestamps_increase():
+    timeline = VideoTimeline()
+
+    first = timeline.to_timeline()
+    second = timeline.to_timeline()
+
+    assert second > first